@@ -1,34 +1,115 @@
-from agents.travel_agent import destination_agent, itinerary_agent, activity_agent
+"""
+Builds the basic travel agent graph and exposes it as a reusable module.
+
+Import `get_travel_graph()` for the cached compiled graph, or use
+`run_batch()` / `stream_batch()` to classify many `user_input` values at
+once (e.g. as a cheap pre-classifier in front of the full planner).
+Running this file directly keeps the original demo behaviour: it saves
+the graph visualization and invokes the graph with a sample input.
+"""
+
+import json
+import logging
+import sys
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List
+
 from langgraph.graph import StateGraph
-from IPython.display import Image, display
+from agents.travel_agent import destination_agent, itinerary_agent, activity_agent
 from agents.types import TravelState
 
-# Build the travel agent graph
-builder = StateGraph(TravelState)
-
-builder.add_node("destination_agent", destination_agent)
-builder.add_node("itinerary_agent", itinerary_agent)
-builder.add_node("activity_agent", activity_agent)
-
-builder.set_entry_point("destination_agent")
-builder.add_edge("destination_agent", "itinerary_agent")
-builder.add_edge("itinerary_agent", "activity_agent")
-builder.set_finish_point("activity_agent")
-
-# Compile the graph
-travel_graph = builder.compile()
-print("Travel agent graph built successfully.")
-
-# Save the graph visualization as an image file
-graph_image = travel_graph.get_graph().draw_mermaid_png()
-with open("travel_graph.png", "wb") as f:
-    f.write(graph_image)
-print("Graph visualization saved as 'travel_graph.png'")
-
-initial_state: TravelState = {
-    "user_input": "I want a beach vacation with lots of fun activities."
-}
-final_state = travel_graph.invoke(initial_state)
-print("\nFinal Travel State:")
-for key, value in final_state.items():
-    print(f"{key}: {value}")
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+# Number of inputs handed to the compiled graph's batch() at a time
+DEFAULT_CHUNK_SIZE = 500
+
+
+def build_travel_graph():
+    """Build and compile a new travel agent graph."""
+    builder = StateGraph(TravelState)
+
+    builder.add_node("destination_agent", destination_agent)
+    builder.add_node("itinerary_agent", itinerary_agent)
+    builder.add_node("activity_agent", activity_agent)
+
+    builder.set_entry_point("destination_agent")
+    builder.add_edge("destination_agent", "itinerary_agent")
+    builder.add_edge("itinerary_agent", "activity_agent")
+    builder.set_finish_point("activity_agent")
+
+    travel_graph = builder.compile()
+    logger.info("Travel agent graph built successfully.")
+    return travel_graph
+
+
+@lru_cache(maxsize=1)
+def get_travel_graph():
+    """Return the compiled travel agent graph, building it on first use."""
+    return build_travel_graph()
+
+
+def save_graph_image(path: str = "travel_graph.png") -> None:
+    """Save the graph visualization as a PNG file."""
+    graph_image = get_travel_graph().get_graph().draw_mermaid_png()
+    with open(path, "wb") as f:
+        f.write(graph_image)
+    logger.info("Graph visualization saved as '%s'", path)
+
+
+def stream_batch(user_inputs: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[TravelState]:
+    """
+    Run the graph over any number of inputs, yielding final states in order.
+
+    Inputs are consumed lazily in chunks, so arbitrarily large lists,
+    generators or files can be processed in constant memory.
+    """
+    travel_graph = get_travel_graph()
+    inputs = iter(user_inputs)
+    while True:
+        chunk = [{"user_input": text} for text in islice(inputs, chunk_size)]
+        if not chunk:
+            return
+        yield from travel_graph.batch(chunk)
+
+
+def run_batch(user_inputs: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[TravelState]:
+    """Run the graph over a collection of inputs and return all final states."""
+    return list(stream_batch(user_inputs, chunk_size))
+
+
+def iter_user_inputs(path: str) -> Iterator[str]:
+    """
+    Read `user_input` values from a file, one per line.
+
+    `.jsonl` files are read as JSON objects with a `user_input` field;
+    any other file is read as plain text. Blank lines are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                yield json.loads(line)["user_input"]
+            else:
+                yield line
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Batch mode: classify every input in the file, one JSON result per line
+        for final_state in stream_batch(iter_user_inputs(sys.argv[1])):
+            print(json.dumps(final_state, ensure_ascii=False))
+    else:
+        # Demo mode: show node logs like the original script
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        save_graph_image("travel_graph.png")
+
+        initial_state: TravelState = {
+            "user_input": "I want a beach vacation with lots of fun activities."
+        }
+        final_state = get_travel_graph().invoke(initial_state)
+        print("\nFinal Travel State:")
+        for key, value in final_state.items():
+            print(f"{key}: {value}")
@@ -0,0 +1,146 @@
+"""
+Destination/activity catalog with a multi-pattern keyword matcher.
+
+The catalog is loaded from JSON (``data/destinations.json``, a small seed
+catalog, by default; larger catalogs load from the file named by
+``TRAVEL_CATALOG_PATH``). All keywords are compiled
+into one Aho-Corasick automaton, so classifying an input is a single pass
+over the text whose cost does not grow with the size of the catalog.
+"""
+
+import json
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "destinations.json")
+
+# Word endings a keyword may carry and still match ("beaches", "snowy", "skiing")
+ALLOWED_SUFFIXES = frozenset({"", "s", "es", "y", "ing", "ed", "er", "ers"})
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over lowercase keywords."""
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = keywords
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start_index, keyword_index) for every keyword occurrence in text."""
+        state = 0
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield position - len(keywords[index]) + 1, index
+
+
+class DestinationCatalog:
+    """
+    Destinations with weighted keywords and suggested activities.
+
+    Keywords match whole words, allowing common endings, so "beach"
+    matches "beaches" and "trek" matches "trekking", but "ski" does not
+    match "skin" or "risky". Each hit adds the
+    keyword's weight to its destination; the highest score wins and ties
+    go to the destination listed first in the catalog.
+    """
+
+    def __init__(self, destinations: List[dict], default_destination: str, default_activities: List[str]):
+        self.destinations = destinations
+        self.default_destination = default_destination
+        self.default_activities = default_activities
+        self._by_name = {entry["name"]: entry for entry in destinations}
+
+        # keyword -> [(destination index, weight), ...]
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for dest_index, entry in enumerate(destinations):
+            for keyword, weight in entry.get("keywords", {}).items():
+                postings.setdefault(keyword.lower(), []).append((dest_index, float(weight)))
+        self._postings = list(postings.values())
+        self._matcher = AhoCorasick(list(postings))
+
+    @classmethod
+    def load(cls, path: str) -> "DestinationCatalog":
+        """Load a catalog from a JSON file."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["destinations"], data["default_destination"], data.get("default_activities", []))
+
+    @staticmethod
+    def _is_word_match(text: str, start: int, keyword: str) -> bool:
+        """Check a keyword occurrence starts a word and ends it (plus an allowed suffix)."""
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        end = start + len(keyword)
+        word_end = end
+        while word_end < len(text) and text[word_end].isalnum():
+            word_end += 1
+        suffix = text[end:word_end]
+        # Doubled final consonant: "trekking", "snorkelling"
+        if suffix[:1] == keyword[-1:] and suffix[1:] in ALLOWED_SUFFIXES:
+            return True
+        return suffix in ALLOWED_SUFFIXES
+
+    def score(self, text: str) -> Dict[int, float]:
+        """Weighted keyword hits per destination index for the given text."""
+        text = text.lower()
+        scores: Dict[int, float] = {}
+        for start, keyword_index in self._matcher.iter_matches(text):
+            if not self._is_word_match(text, start, self._matcher.keywords[keyword_index]):
+                continue
+            for dest_index, weight in self._postings[keyword_index]:
+                scores[dest_index] = scores.get(dest_index, 0.0) + weight
+        return scores
+
+    def classify(self, text: str) -> str:
+        """Return the best-matching destination name, or the default."""
+        scores = self.score(text)
+        if not scores:
+            return self.default_destination
+        best = min(scores, key=lambda dest_index: (-scores[dest_index], dest_index))
+        return self.destinations[best]["name"]
+
+    def activities_for(self, destination: str) -> List[str]:
+        """Suggested activities for a destination (default list if unknown)."""
+        entry = self._by_name.get(destination)
+        if entry and entry.get("activities"):
+            return entry["activities"]
+        return self.default_activities
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> DestinationCatalog:
+    """Load the catalog named by TRAVEL_CATALOG_PATH (or the bundled one) once."""
+    return DestinationCatalog.load(os.environ.get("TRAVEL_CATALOG_PATH", DEFAULT_CATALOG_PATH))
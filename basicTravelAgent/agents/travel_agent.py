@@ -1,40 +1,37 @@
+import logging
 from agents.types import TravelState
+from agents.catalog import get_catalog
+
+logger = logging.getLogger(__name__)
 
 def destination_agent(state: TravelState) -> TravelState:
     """ LangGraph node for destination agent """
-    print("🔧 destination_agent running…")
-    q = state.get("user_input", "").lower()
+    logger.info("🔧 destination_agent running…")
+    q = state.get("user_input", "")
 
-    if "beach" in q:
-        dest = "Bali"
-    elif "snow" in q or "mountain" in q:
-        dest = "Manali"
-    else:
-        dest = "Kyoto"  # sensible default
+    # One pass over the input against every catalog keyword; the catalog's
+    # default destination is used when nothing matches
+    dest = get_catalog().classify(q)
 
-    print(f"🌍 Suggested destination: {dest}")
-    return {**state, "destination": dest}
+    logger.info("🌍 Suggested destination: %s", dest)
+    return {"destination": dest}
 
 def itinerary_agent(state: TravelState) -> TravelState:
     """ LangGraph node for itinerary agent """
-    print("🔧 itinerary_agent running…")
+    logger.info("🔧 itinerary_agent running…")
     dest = state["destination"]
     plan = (
         f"Day 1: Arrive in {dest}\n"
         f"Day 2: Explore iconic spots in {dest}\n"
         f"Day 3: Relax + sample local cuisine"
     )
-    print(f"🧳 Draft itinerary:\n{plan}")
-    return {**state, "itinerary": plan}
+    logger.info("🧳 Draft itinerary:\n%s", plan)
+    return {"itinerary": plan}
 
 def activity_agent(state: TravelState) -> TravelState:
     """ LangGraph node for activity agent """
-    print("🔧 activity_agent running…")
+    logger.info("🔧 activity_agent running…")
     dest = state["destination"]
-    act = (
-        "Snorkelling • Beach yoga"
-        if dest == "Bali"
-        else "Skiing • Mountain trek"
-    )
-    print(f"🎯 Suggested activities: {act}")
-    return {**state, "activities": act}
\ No newline at end of file
+    act = " • ".join(get_catalog().activities_for(dest))
+    logger.info("🎯 Suggested activities: %s", act)
+    return {"activities": act}
\ No newline at end of file
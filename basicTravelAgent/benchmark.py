@@ -0,0 +1,70 @@
+"""
+Throughput benchmark for the basic travel agent graph.
+
+Generates synthetic `user_input` values and measures how many inputs per
+second `stream_batch` classifies, then measures destination matching cost
+against synthetic catalogs of growing size.
+
+Usage (from the project root, with PYTHONPATH set as in run_basic_travel_agent.sh):
+    python basicTravelAgent/benchmark.py [count] [chunk_size]
+"""
+
+import sys
+import time
+from itertools import cycle, islice
+
+from agent_builder import DEFAULT_CHUNK_SIZE, get_travel_graph, stream_batch
+from agents.catalog import DestinationCatalog
+
+CATALOG_SIZES = [100, 1_000, 10_000]
+KEYWORDS_PER_DESTINATION = 8
+
+SAMPLE_INPUTS = [
+    "I want a beach vacation with lots of fun activities.",
+    "Looking for a snowy mountain getaway this winter.",
+    "Somewhere calm with temples and good food.",
+    "A week of surfing and sunshine by the beach.",
+]
+
+
+def run_benchmark(count: int, chunk_size: int) -> float:
+    """Classify `count` synthetic inputs and return inputs per second."""
+    get_travel_graph()  # build outside the timed section
+
+    start = time.perf_counter()
+    processed = sum(1 for _ in stream_batch(islice(cycle(SAMPLE_INPUTS), count), chunk_size))
+    elapsed = time.perf_counter() - start
+    return processed / elapsed
+
+
+def synthetic_catalog(size: int) -> DestinationCatalog:
+    """Build a catalog of `size` destinations with unique keywords each."""
+    destinations = [
+        {
+            "name": f"Destination {i}",
+            "keywords": {f"kw{i}x{j}": 1 + j % 3 for j in range(KEYWORDS_PER_DESTINATION)},
+            "activities": [f"Activity {i}"],
+        }
+        for i in range(size)
+    ]
+    return DestinationCatalog(destinations, "Destination 0", ["City walk"])
+
+
+def run_catalog_benchmark(count: int) -> None:
+    """Print per-input classification cost for each catalog size."""
+    for size in CATALOG_SIZES:
+        catalog = synthetic_catalog(size)
+        inputs = [f"{text} kw{i % size}x1" for i, text in zip(range(count), cycle(SAMPLE_INPUTS))]
+        start = time.perf_counter()
+        for text in inputs:
+            catalog.classify(text)
+        elapsed = time.perf_counter() - start
+        print(f"Catalog of {size:>6} destinations: {elapsed / count * 1e6:6.1f} µs per input")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_SIZE
+    throughput = run_benchmark(count, chunk_size)
+    print(f"Processed {count} inputs (chunk size {chunk_size}): {throughput:,.0f} inputs/sec")
+    run_catalog_benchmark(count)
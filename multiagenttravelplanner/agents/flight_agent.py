@@ -6,42 +6,55 @@ comparing options, and providing flight booking advice.
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import ToolMessage
-from tools.flight_search import search_flights
+from datetime import timedelta
+from config.settings import is_direct_render_enabled, get_today
+from tools.flight_search import search_flights, search_flights_with_records
+from tools.result_query import create_flight_query_tool
 from src.state import TravelPlannerState
+from src.renderer import needs_llm_synthesis, render_flight_results
+from src.agent_loop import run_agent_loop
+from src.blob_store import intern_messages, rehydrate_messages
 
-def create_flight_agent(llm: ChatOpenAI):
+def create_flight_agent(llm: ChatOpenAI, query_tool=None):
     """
     Create the flight search agent.
     
     Args:
         llm: The language model to use for this agent
+        query_tool: Optional query_results tool over the last search
         
     Returns:
         The configured flight agent chain
     """
     
+    # Relative dates are resolved against the configured "today"
+    today = get_today()
+    
     # Define the agent's prompt
     flight_prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a flight booking expert. ONLY respond to flight-related queries.
 
-CURRENT DATE: February 2, 2026
+CURRENT DATE: {today}
 
 IMPORTANT RULES:
 - If asked about non-flight topics, politely decline and redirect to flight booking
 - Always use the search_flights tool to find current flight information
-- When users mention dates like "Feb 15" without a year, use 2026
-- Dates must be in YYYY-MM-DD format (e.g., 2026-02-15)
+- When users mention dates like "Feb 15" without a year, use the next such date on or after the current date
+- Dates must be in YYYY-MM-DD format (e.g., {example_date})
+- If a search is rejected for invalid arguments, fix the listed arguments (or ask the user) instead of retrying unchanged
 - You CAN search for flights and analyze the results for:
   * Direct flights vs connecting flights
   * Different airlines and flight classes
   * Various price ranges and timing options
   * Flight duration and layover information
 - When users ask for specific preferences (direct flights, specific class, etc.), search first then filter/analyze the results
+- Pass stated constraints to search_flights (max_price, max_stops=0 for direct, max_duration_minutes, departure hours) and set priority to 'cheapest' or 'fastest' when asked; every result is ranked locally and only the best options are returned
+- For follow-ups that refine the previous results ("only direct flights", "cheapest", "morning departures"), use query_results instead of searching again. Search again only if the route, dates or passengers change
 - Present results clearly organized by outbound and return flights
 
 Available tools:
 - search_flights: Search for comprehensive flight data that includes all airlines, classes, and connection types
+- query_results: Filter/sort the flights from the previous search (no new search)
 
 Process:
 1. ALWAYS search for flights first using the tool
@@ -59,54 +72,65 @@ Airport code mapping (common ones):
 - Tokyo: NRT/HND
 - Singapore: SIN"""),
         MessagesPlaceholder(variable_name="messages"),
-    ])
+    ]).partial(today=f"{today:%B} {today.day}, {today.year}", example_date=(today + timedelta(days=14)).isoformat())
     
     # Bind the tool to the LLM
-    llm_with_tools = llm.bind_tools([search_flights])
+    tools = [search_flights] + ([query_tool] if query_tool else [])
+    llm_with_tools = llm.bind_tools(tools)
     
     # Create the agent chain
     flight_agent = flight_prompt | llm_with_tools
     
     return flight_agent
 
-def flight_agent_node(state: TravelPlannerState, llm: ChatOpenAI):
+def flight_agent_node(state: TravelPlannerState, llm: ChatOpenAI, summarizer: ChatOpenAI = None):
     """
     Node function for the flight agent.
     
     Args:
         state: Current state with messages
         llm: The language model instance
+        summarizer: Optional model that writes the final answer if the
+                    agent reaches its step limit
         
     Returns:
-        Updated state with new messages
+        Updated state with new messages and the latest search results
     """
-    flight_agent = create_flight_agent(llm)
-    messages = state["messages"]
+    # Latest search results, so follow-ups can be refined without searching again
+    last_search = dict(state.get("last_search") or {})
+    query_tool = create_flight_query_tool(lambda: last_search.get("flights"))
+    flight_agent = create_flight_agent(llm, query_tool)
+    # Interned tool results are inlined again only for the prompt
+    messages = rehydrate_messages(state["messages"])
     
-    # Invoke the agent
-    response = flight_agent.invoke({"messages": messages})
+    def render_final(tool_calls, tool_messages):
+        # Plain searches are rendered locally - no second LLM round trip
+        if not is_direct_render_enabled() or needs_llm_synthesis(
+            state.get("user_query") or messages[-1].content
+        ):
+            return None
+        call_args = {call['id']: call['args'] for call in tool_calls}
+        rendered = [
+            render_flight_results(msg.content, call_args[msg.tool_call_id])
+            for msg in tool_messages
+        ]
+        return "\n\n".join(rendered) if all(rendered) else None
     
-    # Handle tool calls
-    if hasattr(response, 'tool_calls') and response.tool_calls:
-        tool_messages = []
-        
-        for tool_call in response.tool_calls:
-            if tool_call['name'] == 'search_flights':
-                try:
-                    # Execute the flight search
-                    tool_result = search_flights(**tool_call['args'])
-                except Exception as e:
-                    tool_result = f"Flight search failed: {str(e)}"
-                
-                tool_messages.append(ToolMessage(
-                    content=tool_result,
-                    tool_call_id=tool_call['id']
-                ))
-        
-        # Get final response after tool execution
-        if tool_messages:
-            all_messages = messages + [response] + tool_messages
-            final_response = flight_agent.invoke({"messages": all_messages})
-            return {"messages": [response] + tool_messages + [final_response]}
+    def run_search(args):
+        content, records = search_flights_with_records(**args)
+        if records:
+            last_search["flights"] = {"args": args, "records": records}
+        return content
+    
+    # Run the agent until it answers, searching as many times as it needs
+    new_messages = run_agent_loop(
+        flight_agent,
+        messages,
+        tools={'search_flights': run_search, 'query_results': query_tool.invoke},
+        render_final=render_final,
+        render_partial=lambda call, msg: render_flight_results(msg.content, call['args']),
+        summarizer=summarizer
+    )
     
-    return {"messages": [response]}
+    # Large tool results are stored once in the blob store, not in every checkpoint
+    return {"messages": intern_messages(new_messages), "last_search": last_search}
@@ -6,35 +6,50 @@ and providing hotel booking advice.
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import ToolMessage
-from tools.hotel_search import search_hotels
+from config.settings import is_direct_render_enabled, get_today
+from tools.hotel_search import search_hotels, search_hotels_with_records
+from tools.result_query import create_hotel_query_tool
 from src.state import TravelPlannerState
+from src.renderer import needs_llm_synthesis, render_hotel_results
+from src.agent_loop import run_agent_loop
+from src.blob_store import intern_messages, rehydrate_messages
 
-def create_hotel_agent(llm: ChatOpenAI):
+def create_hotel_agent(llm: ChatOpenAI, query_tool=None):
     """
     Create the hotel search agent.
     
     Args:
         llm: The language model to use for this agent
+        query_tool: Optional query_results tool over the last search
         
     Returns:
         The configured hotel agent chain
     """
     
+    # Relative dates are resolved against the configured "today"
+    today = get_today()
+    
     # Define the agent's prompt
     hotel_prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a hotel booking expert. ONLY respond to hotel and accommodation-related queries.
+
+CURRENT DATE: {today}
+
 IMPORTANT RULES:
 - If asked about non-hotel topics, politely decline and redirect to hotel booking
 - Always use the search_hotels tool to find current hotel information
 - Provide detailed hotel options with prices, ratings, amenities, and location details
 - Include practical booking advice and tips
+- If a search is rejected for invalid arguments, fix the listed arguments (or ask the user) instead of retrying unchanged
 - You CAN search and analyze results for different criteria like star ratings, price ranges, amenities
+- Pass stated constraints to search_hotels (hotel_class, max_price, min_rating, amenity) and set priority to 'cheapest' or 'top_rated' when asked; every result is ranked locally and only the best options are returned
 Available tools:
 - search_hotels: Search for hotels using Google Hotels engine
+- query_results: Filter/sort the hotels from the previous search (no new search)
+- For follow-ups that refine the previous results ("cheapest 4-star", "with a pool", "under $200"), use query_results instead of searching again. Search again only if the location, dates or guests change
 When searching hotels, extract or ask for:
 - Location/destination
-- Check-in and check-out dates (YYYY-MM-DD format)
+- Check-in and check-out dates (YYYY-MM-DD format; dates without a year mean the next such date)
 - Number of guests (adults, children)
 - Number of rooms
 - Hotel preferences (star rating, amenities, etc.)
@@ -45,54 +60,65 @@ Present results with:
 - Location and nearby attractions
 - Booking recommendations"""),
         MessagesPlaceholder(variable_name="messages"),
-    ])
+    ]).partial(today=f"{today:%B} {today.day}, {today.year}")
     
     # Bind the tool to the LLM
-    llm_with_tools = llm.bind_tools([search_hotels])
+    tools = [search_hotels] + ([query_tool] if query_tool else [])
+    llm_with_tools = llm.bind_tools(tools)
     
     # Create the agent chain
     hotel_agent = hotel_prompt | llm_with_tools
     
     return hotel_agent
 
-def hotel_agent_node(state: TravelPlannerState, llm: ChatOpenAI):
+def hotel_agent_node(state: TravelPlannerState, llm: ChatOpenAI, summarizer: ChatOpenAI = None):
     """
     Node function for the hotel agent.
     
     Args:
         state: Current state with messages
         llm: The language model instance
+        summarizer: Optional model that writes the final answer if the
+                    agent reaches its step limit
         
     Returns:
-        Updated state with new messages
+        Updated state with new messages and the latest search results
     """
-    hotel_agent = create_hotel_agent(llm)
-    messages = state["messages"]
+    # Latest search results, so follow-ups can be refined without searching again
+    last_search = dict(state.get("last_search") or {})
+    query_tool = create_hotel_query_tool(lambda: last_search.get("hotels"))
+    hotel_agent = create_hotel_agent(llm, query_tool)
+    # Interned tool results are inlined again only for the prompt
+    messages = rehydrate_messages(state["messages"])
     
-    # Invoke the agent
-    response = hotel_agent.invoke({"messages": messages})
+    def render_final(tool_calls, tool_messages):
+        # Plain searches are rendered locally - no second LLM round trip
+        if not is_direct_render_enabled() or needs_llm_synthesis(
+            state.get("user_query") or messages[-1].content
+        ):
+            return None
+        call_args = {call['id']: call['args'] for call in tool_calls}
+        rendered = [
+            render_hotel_results(msg.content, call_args[msg.tool_call_id])
+            for msg in tool_messages
+        ]
+        return "\n\n".join(rendered) if all(rendered) else None
     
-    # Handle tool calls
-    if hasattr(response, 'tool_calls') and response.tool_calls:
-        tool_messages = []
-        
-        for tool_call in response.tool_calls:
-            if tool_call['name'] == 'search_hotels':
-                try:
-                    # Execute the hotel search
-                    tool_result = search_hotels(**tool_call['args'])
-                except Exception as e:
-                    tool_result = f"Hotel search failed: {str(e)}"
-                
-                tool_messages.append(ToolMessage(
-                    content=tool_result,
-                    tool_call_id=tool_call['id']
-                ))
-        
-        # Get final response after tool execution
-        if tool_messages:
-            all_messages = messages + [response] + tool_messages
-            final_response = hotel_agent.invoke({"messages": all_messages})
-            return {"messages": [response] + tool_messages + [final_response]}
+    def run_search(args):
+        content, records = search_hotels_with_records(**args)
+        if records:
+            last_search["hotels"] = {"args": args, "records": records}
+        return content
+    
+    # Run the agent until it answers, searching as many times as it needs
+    new_messages = run_agent_loop(
+        hotel_agent,
+        messages,
+        tools={'search_hotels': run_search, 'query_results': query_tool.invoke},
+        render_final=render_final,
+        render_partial=lambda call, msg: render_hotel_results(msg.content, call['args']),
+        summarizer=summarizer
+    )
     
-    return {"messages": [response]}
\ No newline at end of file
+    # Large tool results are stored once in the blob store, not in every checkpoint
+    return {"messages": intern_messages(new_messages), "last_search": last_search}
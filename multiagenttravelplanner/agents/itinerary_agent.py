@@ -3,12 +3,15 @@ Itinerary Agent - Plans travel itineraries and provides travel advice.
 This agent specializes in creating detailed travel itineraries,
 suggesting destinations, and answering general travel questions.
 """
-import json
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import ToolMessage
-from tools.itinerary_search import create_itinerary_tool
+from config.settings import get_multi_city_settings
+from tools.itinerary_search import create_itinerary_tool, create_search_executors
 from src.state import TravelPlannerState
+from src.agent_loop import run_agent_loop
+from src.blob_store import intern_messages, rehydrate_messages
+from agents.itinerary_segments import plan_multi_city
 def create_itinerary_agent(llm: ChatOpenAI):
     """
     Create the itinerary planning agent.
@@ -54,54 +57,41 @@ Format your itineraries with:
     
     return itinerary_agent, tool
 
-def itinerary_agent_node(state: TravelPlannerState, llm: ChatOpenAI):
+def itinerary_agent_node(state: TravelPlannerState, llm: ChatOpenAI, summarizer: ChatOpenAI = None):
     """
     Node function for the itinerary agent.
     
     This function is called by LangGraph when routing to the itinerary agent.
-    It processes messages, handles tool calls, and returns updated state.
+    It runs the ReAct loop (think → search → observe) until the agent
+    produces a final itinerary, within the configured step and time limits.
+    A trip through several cities is planned one city at a time, with the
+    cities researched concurrently (see agents/itinerary_segments.py).
     
     Args:
         state: Current state with messages and other info
         llm: The language model instance
+        summarizer: Optional model that writes the final answer if the
+                    agent reaches its step limit
         
     Returns:
         Updated state with new messages
     """
+    # Multi-city trips are planned one segment per city, concurrently
+    multi_city = get_multi_city_settings()
+    if multi_city['enabled']:
+        answer = plan_multi_city(state["messages"], llm, summarizer or llm, multi_city['max_segments'])
+        if answer is not None:
+            return {"messages": [AIMessage(content=answer)]}
+    
     # Get the agent and tool
     itinerary_agent, tool = create_itinerary_agent(llm)
     
-    messages = state["messages"]
+    # Interned tool results are inlined again only for the prompt
+    messages = rehydrate_messages(state["messages"])
     
-    # Invoke the agent with current messages
-    response = itinerary_agent.invoke({"messages": messages})
+    tools = create_search_executors(tool)
     
-    # Check if the agent wants to use tools
-    if hasattr(response, 'tool_calls') and response.tool_calls:
-        tool_messages = []
-        
-        # Execute each tool call
-        for tool_call in response.tool_calls:
-            # Accept multiple tool name variations
-            if tool_call['name'] in ['tavily_search_results_json', 'TavilySearch', 'tavily_search']:
-                try:
-                    # Execute the search
-                    tool_result = tool.invoke(tool_call['args']['query'])
-                    tool_result = json.dumps(tool_result, indent=2)
-                except Exception as e:
-                    tool_result = f"Search failed: {str(e)}"
-                
-                # Create a tool message with the result
-                tool_messages.append(ToolMessage(
-                    content=tool_result,
-                    tool_call_id=tool_call['id']
-                ))
-        
-        # If we have tool results, invoke the agent again with them
-        if tool_messages:
-            all_messages = messages + [response] + tool_messages
-            final_response = itinerary_agent.invoke({"messages": all_messages})
-            return {"messages": [response] + tool_messages + [final_response]}
+    new_messages = run_agent_loop(itinerary_agent, messages, tools=tools, summarizer=summarizer)
     
-    # No tool calls, just return the response
-    return {"messages": [response]}
\ No newline at end of file
+    # Large tool results are stored once in the blob store, not in every checkpoint
+    return {"messages": intern_messages(new_messages)}
@@ -0,0 +1,342 @@
+"""
+Map-reduce planning for multi-city itineraries.
+A trip through several cities is split into per-city segments, and each
+segment is researched and drafted concurrently by its own agent loop with
+its own Tavily searches and a prompt covering only that city. The
+transfers between cities are drafted alongside them. The segments and
+transfers are then assembled in route order, so wall-clock time follows
+the longest segment instead of the length of the whole trip.
+"""
+
+import re
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from config.settings import get_agent_deadline_seconds
+from tools.itinerary_search import create_itinerary_tool, create_search_executors
+from tools.validation import CITY_AIRPORTS
+from tools.upstream import call_timeout, call_with_timeout
+from src.agent_loop import run_agent_loop
+
+# Threads drafting segments (each segment's LLM and search calls run on
+# the upstream pool, so these threads mostly wait)
+MAX_SEGMENT_THREADS = 32
+
+# Longest stay planned for one city, in days
+MAX_SEGMENT_DAYS = 30
+
+# Earlier conversation turns shown to the split and segment prompts, and
+# the most characters kept of each
+MAX_HISTORY_MESSAGES = 6
+HISTORY_MESSAGE_CHARS = 2000
+
+# Common stops of multi-city trips besides the airport cities of
+# tools.validation.CITY_AIRPORTS. Requests naming fewer than two known
+# cities are planned in one pass without a split call. Names that are
+# also common words (Nice, Split) are left out.
+TRIP_CITIES = (
+    'kyoto', 'osaka', 'hiroshima', 'nara', 'sapporo', 'seoul', 'busan', 'beijing', 'shanghai', 'xian',
+    'taipei', 'hanoi', 'ho chi minh city', 'hoi an', 'chiang mai', 'phuket', 'bali', 'kuala lumpur',
+    'jaipur', 'agra', 'goa', 'kathmandu', 'florence', 'venice', 'milan', 'naples', 'amalfi', 'lisbon',
+    'porto', 'seville', 'granada', 'valencia', 'berlin', 'munich', 'prague', 'vienna', 'budapest',
+    'salzburg', 'zurich', 'geneva', 'lucerne', 'lyon', 'brussels', 'bruges', 'copenhagen',
+    'stockholm', 'oslo', 'helsinki', 'reykjavik', 'dublin', 'edinburgh', 'athens', 'santorini', 'mykonos',
+    'dubrovnik', 'krakow', 'warsaw', 'marrakech', 'fes', 'cairo', 'cape town', 'nairobi',
+    'vancouver', 'montreal', 'quebec city', 'las vegas', 'new orleans', 'mexico city', 'cancun', 'havana',
+    'lima', 'cusco', 'buenos aires', 'rio de janeiro', 'santiago', 'melbourne', 'auckland', 'queenstown',
+)
+
+# Known city names → the place they stand for (aliases such as 'nyc' and
+# 'new york' count as one place)
+_PLACES = {**{city: city for city in TRIP_CITIES}, **CITY_AIRPORTS}
+_PLACE_NAMES = re.compile(
+    r'\b(' + '|'.join(re.escape(name) for name in sorted(_PLACES, key=len, reverse=True)) + r')\b', re.IGNORECASE
+)
+
+# One line of the split reply: "Kyoto: 4" (also "2. Kyoto: 4 days")
+_SEGMENT_LINE = re.compile(r'^\s*(?:\d+\s*[.)]\s*)?\**([^:\n*]+?)\**\s*:\s*(\d+)', re.MULTILINE)
+
+# Section headings of the transfers reply
+_TRANSFER_HEADING = re.compile(r'^\s*#*\s*\**(OVERVIEW|TRANSFER\s+(\d+))\**\s*:?\s*$', re.MULTILINE | re.IGNORECASE)
+
+SPLIT_PROMPT = """You split travel itinerary requests into per-city segments.
+If the request plans a trip through two or more cities, respond with one line per city, in travel order, formatted as <city>: <number of days>, and nothing else.
+Split the trip's total length between the cities sensibly when the user did not say how long to stay in each; assume 2 days per city when no length is given.
+If the request is about a single destination, changes a plan from earlier in the conversation, is not a trip plan, or you are unsure, respond with NONE.
+Examples:
+"Plan 12 days across Tokyo, Kyoto and Osaka" →
+Tokyo: 5
+Kyoto: 4
+Osaka: 3
+"A week in Rome and Florence" →
+Rome: 4
+Florence: 3
+"Plan 5 days in Paris and tell me about the food" → NONE"""
+
+SEGMENT_PROMPT = """You are an expert travel itinerary planner drafting ONE part of a multi-city trip. ONLY plan this part.
+Trip request: {request}
+Full route: {route}
+Your part: {city}, days {first_day}-{last_day} of the trip.
+{arrival}
+{departure}
+Rules:
+- Cover only {city} and only days {first_day} to {last_day}; the other cities and the journeys between cities are planned separately
+- Search for current information about attractions, opening hours, prices and local transport in {city}
+- Give a day-by-day plan numbered Day {first_day} to Day {last_day}, with specific times and locations, transport within the city, estimated costs and practical tips
+- Be concise: no introduction or conclusion for the whole trip"""
+
+TRANSFER_PROMPT = """You are an expert travel planner finishing a multi-city itinerary whose city segments are planned separately.
+Write an overview of the trip and the journey between each pair of consecutive cities, using exactly these headings and nothing else:
+OVERVIEW
+<2-4 sentences: the route, its pacing and trip-wide tips such as rail or transport passes>
+TRANSFER 1
+<how to travel from the first city to the second: recommended mode, typical duration, approximate cost, booking tips, where to leave luggage>
+TRANSFER 2
+<and so on, one per move>"""
+
+_executor = ThreadPoolExecutor(max_workers=MAX_SEGMENT_THREADS, thread_name_prefix="itinerary-segment")
+
+
+def looks_multi_city(query: str) -> bool:
+    """Whether a request names at least two known cities (checked before the split call)."""
+    return len({_PLACES[name.lower()] for name in _PLACE_NAMES.findall(query)}) >= 2
+
+
+def conversation_history(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """
+    Earlier user and assistant turns, for the split and segment prompts.
+
+    Tool calls and results are left out and long turns are clipped, so an
+    earlier itinerary stays visible without its research.
+
+    Args:
+        messages: The conversation, ending with the current request
+
+    Returns:
+        Up to MAX_HISTORY_MESSAGES turns before the current request
+    """
+    turns = [
+        message for message in messages[:-1]
+        if isinstance(message.content, str)
+        and (isinstance(message, HumanMessage) or (isinstance(message, AIMessage) and not message.tool_calls))
+    ][-MAX_HISTORY_MESSAGES:]
+    return [
+        type(message)(content=message.content[:HISTORY_MESSAGE_CHARS]
+                      + ("\n... (truncated)" if len(message.content) > HISTORY_MESSAGE_CHARS else ""))
+        for message in turns
+    ]
+
+
+def parse_segments(text: str, max_segments: int) -> Optional[List[dict]]:
+    """
+    Read the segments of a split reply.
+
+    Args:
+        text: The model's reply
+        max_segments: Most segments allowed
+
+    Returns:
+        Segments in route order, each {'city', 'days', 'first_day', 'last_day'},
+        or None unless there are between 2 and max_segments of them
+    """
+    segments = []
+    first_day = 1
+    # Some replies put every city on one line: "Tokyo: 5 / Kyoto: 4"
+    for city, days in _SEGMENT_LINE.findall(re.sub(r'\s[/;|]\s', '\n', text)):
+        city, days = city.strip(), min(MAX_SEGMENT_DAYS, int(days))
+        if not city or days < 1:
+            return None
+        segments.append({'city': city, 'days': days, 'first_day': first_day, 'last_day': first_day + days - 1})
+        first_day += days
+    if not 2 <= len(segments) <= max_segments:
+        return None
+    return segments
+
+
+def split_trip(llm: BaseChatModel, request: str, history: List[BaseMessage],
+               max_segments: int) -> Optional[List[dict]]:
+    """
+    Split a trip request into per-city segments.
+
+    Args:
+        llm: Model used for the split (a small one is enough)
+        request: The user's request
+        history: Earlier turns (see conversation_history), so a change to an
+                 earlier plan is recognized and left to the one-pass agent
+        max_segments: Most segments allowed
+
+    Returns:
+        Segments (see parse_segments), or None if the request is not a
+        multi-city trip or could not be split
+    """
+    try:
+        reply = call_with_timeout(
+            "Trip split LLM call", call_timeout(), llm.invoke,
+            [SystemMessage(content=SPLIT_PROMPT)] + history + [HumanMessage(content=request)]
+        )
+    except Exception as e:
+        print(f"⚠️  Could not split the trip ({e}), planning it in one pass")
+        return None
+    return parse_segments(str(reply.content), max_segments)
+
+
+def format_route(segments: List[dict]) -> str:
+    """Route summary, e.g. 'Tokyo (days 1-5) → Kyoto (days 6-9)'."""
+    return " → ".join(f"{s['city']} (days {s['first_day']}-{s['last_day']})" for s in segments)
+
+
+def draft_segment(llm: BaseChatModel, request: str, history: List[BaseMessage],
+                  segments: List[dict], index: int) -> str:
+    """
+    Research and draft the day-by-day plan of one segment.
+
+    Args:
+        llm: The itinerary model
+        request: The user's request
+        history: Earlier turns (preferences stated before the request)
+        segments: All segments of the trip
+        index: Position of the segment to draft
+
+    Returns:
+        The segment's plan (a partial answer if the agent loop stopped early)
+    """
+    segment = segments[index]
+    previous = segments[index - 1]['city'] if index > 0 else None
+    following = segments[index + 1]['city'] if index + 1 < len(segments) else None
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SEGMENT_PROMPT),
+        MessagesPlaceholder(variable_name="messages"),
+    ]).partial(
+        request=request,
+        route=format_route(segments),
+        city=segment['city'],
+        first_day=str(segment['first_day']),
+        last_day=str(segment['last_day']),
+        arrival=f"Day {segment['first_day']} starts with the journey from {previous}." if previous else "",
+        departure=f"The trip continues to {following} on the morning of day {segment['last_day'] + 1}." if following else "",
+    )
+    tool = create_itinerary_tool()
+    agent = prompt | llm.bind_tools([tool])
+    brief = HumanMessage(content=f"Plan {segment['city']}, days {segment['first_day']}-{segment['last_day']}.")
+    new_messages = run_agent_loop(agent, history + [brief], tools=create_search_executors(tool))
+    return str(new_messages[-1].content)
+
+
+def parse_transfers(text: str, count: int) -> Tuple[str, List[Optional[str]]]:
+    """
+    Read the overview and transfers of a transfers reply.
+
+    Args:
+        text: The model's reply
+        count: Number of transfers expected
+
+    Returns:
+        (overview, transfers) with one entry per transfer (None where the
+        reply has none); the whole reply is the overview if it has no headings
+    """
+    headings = list(_TRANSFER_HEADING.finditer(text))
+    if not headings:
+        return text.strip(), [None] * count
+    overview = ""
+    transfers: List[Optional[str]] = [None] * count
+    for heading, following in zip(headings, headings[1:] + [None]):
+        body = text[heading.end():following.start() if following else len(text)].strip()
+        if heading.group(2) is None:
+            overview = body
+        elif 1 <= int(heading.group(2)) <= count and body:
+            transfers[int(heading.group(2)) - 1] = body
+    return overview, transfers
+
+
+def draft_transfers(llm: BaseChatModel, request: str, segments: List[dict]) -> Tuple[str, List[Optional[str]]]:
+    """
+    Draft the trip overview and the transfers between consecutive cities.
+
+    Args:
+        llm: The itinerary model
+        request: The user's request
+        segments: All segments of the trip
+
+    Returns:
+        (overview, transfers), see parse_transfers; empty if the call failed
+    """
+    moves = "\n".join(
+        f"TRANSFER {i}: {a['city']} → {b['city']} (day {b['first_day']})"
+        for i, (a, b) in enumerate(zip(segments, segments[1:]), 1)
+    )
+    try:
+        reply = call_with_timeout(
+            "Transfer LLM call", call_timeout(get_agent_deadline_seconds()), llm.invoke,
+            [SystemMessage(content=TRANSFER_PROMPT),
+             HumanMessage(content=f"Trip request: {request}\nRoute: {format_route(segments)}\n{moves}")]
+        )
+    except Exception as e:
+        print(f"⚠️  Could not plan the transfers: {e}")
+        return "", [None] * (len(segments) - 1)
+    return parse_transfers(str(reply.content), len(segments) - 1)
+
+
+def assemble_itinerary(segments: List[dict], drafts: List[str], overview: str,
+                       transfers: List[Optional[str]]) -> str:
+    """
+    Join the segment drafts and transfers into one itinerary, in route order.
+
+    Returns:
+        The final itinerary text
+    """
+    sections = [f"🗺️ **{format_route(segments)}**"]
+    if overview:
+        sections.append(overview)
+    for index, (segment, draft) in enumerate(zip(segments, drafts)):
+        sections.append(f"## {segment['city']} (days {segment['first_day']}-{segment['last_day']})\n\n{draft.strip()}")
+        if index < len(transfers):
+            following = segments[index + 1]
+            transfer = transfers[index] or "Check rail, bus and flight options for this leg before booking."
+            sections.append(f"### 🚆 {segment['city']} → {following['city']} (day {following['first_day']})\n\n{transfer}")
+    return "\n\n".join(sections)
+
+
+def _submit(fn, *args):
+    # Every task needs its own copy of the context (request deadline)
+    return _executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def plan_multi_city(messages: List[BaseMessage], llm: BaseChatModel, splitter: BaseChatModel,
+                    max_segments: int) -> Optional[str]:
+    """
+    Plan a multi-city trip segment by segment.
+
+    Args:
+        messages: The conversation, ending with the user's request
+        llm: The itinerary model (drafts segments and transfers)
+        splitter: Model that splits the trip into segments (e.g. the summarizer)
+        max_segments: Most segments allowed
+
+    Returns:
+        The assembled itinerary, or None if the request is not a multi-city
+        trip (the caller then plans it in one pass)
+    """
+    request = str(messages[-1].content)
+    if not looks_multi_city(request):
+        return None
+    history = conversation_history(messages)
+    segments = split_trip(splitter, request, history, max_segments)
+    if segments is None:
+        return None
+    print(f"🗺️  Multi-city trip: planning {len(segments)} segments concurrently ({format_route(segments)})")
+
+    transfers_future = _submit(draft_transfers, llm, request, segments)
+    draft_futures = [_submit(draft_segment, llm, request, history, segments, index)
+                     for index in range(len(segments))]
+    drafts = []
+    for segment, future in zip(segments, draft_futures):
+        try:
+            drafts.append(future.result())
+        except Exception as e:
+            print(f"⚠️  Segment {segment['city']} failed: {e}")
+            drafts.append(f"⚠️ I could not plan this part of the trip ({e}).")
+    overview, transfers = transfers_future.result()
+    return assemble_itinerary(segments, drafts, overview, transfers)
@@ -0,0 +1 @@
+"""Benchmarks for the multi-agent travel planner (run with python -m benchmarks.<name>)."""
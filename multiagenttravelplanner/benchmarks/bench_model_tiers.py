@@ -0,0 +1,107 @@
+"""
+Benchmark: latency effect of per-role model tiers.
+Runs the full graph with the fake LLM stand-in, once with every role on
+the flagship model and once with the tiers from config/settings.py, and
+reports per-node and end-to-end latency.
+
+Usage (from the project root):
+    python -m benchmarks.bench_model_tiers [--runs 5] [--scale 0.2]
+"""
+
+import os
+import time
+import argparse
+import statistics
+from collections import defaultdict
+from contextlib import contextmanager
+from langchain_core.messages import HumanMessage
+from config.settings import MODEL_ROLES
+from src.graph_builder import build_travel_planner_graph
+from src.models import create_role_llms
+from src.deadline import with_deadline
+from benchmarks.fake_llm import fake_llm_factory
+
+# Queries covering each route; the fake model answers without tool calls
+QUERIES = [
+    "Find flights from New York to London on 2026-03-01",
+    "Find hotels in Paris for March 1-5",
+    "Plan a 5-day trip to Italy",
+]
+
+# Scenario name -> environment overrides applied while building the graph
+SCENARIOS = {
+    'flagship': {f'{role.upper()}_MODEL': 'gpt-4o' for role in MODEL_ROLES},
+    'tiered': {},
+}
+
+
+@contextmanager
+def env_overrides(overrides: dict):
+    """Temporarily set environment variables."""
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_scenario(name: str, overrides: dict, runs: int, scale: float) -> dict:
+    """
+    Run every query `runs` times and collect per-node latencies.
+
+    Returns:
+        Mapping of node name (and 'total') to a list of latencies in seconds
+    """
+    with env_overrides(overrides):
+        print(f"\n--- Scenario: {name} ---")
+        travel_planner = build_travel_planner_graph(create_role_llms(fake_llm_factory(scale)))
+
+    timings = defaultdict(list)
+    for run in range(runs):
+        for i, query in enumerate(QUERIES):
+            config = with_deadline({"configurable": {"thread_id": f"{name}-{run}-{i}"}})
+            start = last = time.perf_counter()
+            for update in travel_planner.stream(
+                {"messages": [HumanMessage(content=query)]}, config, stream_mode="updates"
+            ):
+                now = time.perf_counter()
+                for node in update:
+                    timings[node].append(now - last)
+                last = now
+            timings['total'].append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=3, help='Repetitions of the query set')
+    parser.add_argument('--scale', type=float, default=0.2,
+                        help='Multiplier on simulated model latency (1.0 = realistic)')
+    args = parser.parse_args()
+
+    # Tools are built but never called by the fake model; they only need a key to construct
+    os.environ.setdefault('TAVILY_API_KEY', 'benchmark-placeholder')
+
+    results = {
+        name: run_scenario(name, overrides, args.runs, args.scale)
+        for name, overrides in SCENARIOS.items()
+    }
+
+    nodes = sorted({node for timings in results.values() for node in timings} - {'total'}) + ['total']
+    print(f"\nMean latency in ms (latency scale {args.scale}):")
+    print(f"{'node':<18}" + "".join(f"{name:>12}" for name in results))
+    for node in nodes:
+        row = "".join(
+            f"{statistics.mean(results[name][node]) * 1000:>12.1f}" if results[name].get(node) else f"{'-':>12}"
+            for name in results
+        )
+        print(f"{node:<18}{row}")
+
+
+if __name__ == "__main__":
+    main()
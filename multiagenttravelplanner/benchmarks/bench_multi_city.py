@@ -0,0 +1,92 @@
+"""
+Benchmark: single-pass vs map-reduce planning of multi-city itineraries.
+Runs multi-city trip requests through the full graph with a fake model
+whose itinerary length (and so its simulated latency) grows with the
+number of days it is asked to plan, once with ITINERARY_MULTI_CITY off
+and once with it on, and reports the wall-clock time per request.
+
+Usage (from the project root):
+    python -m benchmarks.bench_multi_city [--scale 0.1]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from contextlib import redirect_stdout
+from typing import List
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from src.graph_builder import build_travel_planner_graph
+from src.models import create_role_llms
+from src.deadline import with_deadline
+from benchmarks.fake_llm import FakeChatModel
+
+# Trip requests and the split the fake model answers with
+TRIPS = {
+    "Plan 12 days across Tokyo, Kyoto and Osaka": [("Tokyo", 5), ("Kyoto", 4), ("Osaka", 3)],
+    "Plan a 10 day trip to Rome, Florence and Venice": [("Rome", 4), ("Florence", 3), ("Venice", 3)],
+    "Two weeks in Lisbon, Porto, Seville and Madrid": [("Lisbon", 4), ("Porto", 3), ("Seville", 3), ("Madrid", 4)],
+}
+
+# Simulated itinerary length per planned day, in tokens
+TOKENS_PER_DAY = 120
+
+
+class TripFakeModel(FakeChatModel):
+    """Fake model answering split, segment, transfer and itinerary prompts."""
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), '')
+        query = str(messages[-1].content)
+        if 'split travel itinerary requests' in system:
+            return "\n".join(f"{city}: {days}" for city, days in TRIPS.get(query, [])) or "NONE"
+        if 'ONE part of a multi-city trip' in system:
+            first, last = map(int, re.search(r'days (\d+)-(\d+) of the trip', system).groups())
+            days = last - first + 1
+        elif 'finishing a multi-city itinerary' in system:
+            moves = len(re.findall(r'^TRANSFER \d+:', query, re.MULTILINE))
+            return "OVERVIEW\nA well-paced route.\n" + "".join(
+                f"TRANSFER {n}\nTake the express train (about 2 hours).\n" for n in range(1, moves + 1)
+            )
+        elif 'routing expert' in system:
+            return super()._reply(messages)
+        else:
+            days = sum(days for _, days in TRIPS.get(query, [])) or 3
+        return ' '.join(['Visit the old town and a local market.'] * (days * TOKENS_PER_DAY // 8))
+
+
+def run(multi_city: bool, scale: float) -> List[float]:
+    """Plan every trip once; return the seconds each request took."""
+    os.environ['ITINERARY_MULTI_CITY'] = 'true' if multi_city else 'false'
+    llms = create_role_llms(lambda config: TripFakeModel(
+        model_name=config['model'], max_tokens=config['max_tokens'], latency_scale=scale
+    ))
+    travel_planner = build_travel_planner_graph(llms)
+    timings = []
+    for i, query in enumerate(TRIPS):
+        config = with_deadline({"configurable": {"thread_id": f"bench-{multi_city}-{i}"}})
+        started = time.perf_counter()
+        travel_planner.invoke({"messages": [HumanMessage(content=query)]}, config)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', type=float, default=0.1, help='Multiplier on simulated model latency')
+    args = parser.parse_args()
+
+    os.environ.setdefault('TAVILY_API_KEY', 'benchmark-placeholder')
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        single = run(False, args.scale)
+        segmented = run(True, args.scale)
+
+    print(f"\nMulti-city itinerary benchmark (latency scale {args.scale}):")
+    print(f"{'trip':<52}{'single s':>10}{'segments s':>12}")
+    for query, single_seconds, segmented_seconds in zip(TRIPS, single, segmented):
+        print(f"{query:<52}{single_seconds:>10.2f}{segmented_seconds:>12.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Benchmark: search throughput against the local synthetic inventory.
+Drives search_flights/search_hotels from many threads, first through the
+tools alone and then through the full graph (router, agent loop, tool,
+rendering) with a fake model that calls the search tool once per turn,
+and reports throughput and latency percentiles.
+
+Usage (from the project root):
+    python -m benchmarks.bench_search_backend [--threads 16] [--searches 5000] [--turns 2000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from config.settings import get_search_backend_settings, get_today
+from tools.inventory import AIRPORTS, HOTEL_CITIES, Inventory, generate_inventory, install_inventory
+from tools.flight_search import search_flights_with_records
+from tools.hotel_search import search_hotels_with_records
+from src.graph_builder import build_travel_planner_graph
+from src.models import create_role_llms
+from src.deadline import with_deadline
+from benchmarks.fake_llm import FakeChatModel, fake_llm_factory
+
+# Tool arguments for each benchmark query, looked up by the fake model
+SEARCH_ARGS: Dict[str, dict] = {}
+
+
+class SearchingFakeModel(FakeChatModel):
+    """Fake model that answers a new user message with one search tool call."""
+
+    tool_names: List[str] = []
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={'tool_names': [getattr(tool, 'name', None) for tool in tools]})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        last = messages[-1]
+        tool = next((name for name in ('search_flights', 'search_hotels') if name in self.tool_names), None)
+        if tool and isinstance(last, HumanMessage) and last.content in SEARCH_ARGS:
+            message = AIMessage(content='', tool_calls=[{
+                'name': tool, 'args': SEARCH_ARGS[last.content], 'id': f"call_{random.getrandbits(32):08x}"
+            }])
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def random_flight_args(rng: random.Random) -> dict:
+    origin, destination = rng.sample(sorted(AIRPORTS), 2)
+    outbound = get_today() + timedelta(days=rng.randint(1, 120))
+    return {'departure_airport': origin, 'arrival_airport': destination, 'outbound_date': outbound.isoformat(),
+            'priority': rng.choice(('balanced', 'cheapest', 'fastest'))}
+
+
+def random_hotel_args(rng: random.Random) -> dict:
+    check_in = get_today() + timedelta(days=rng.randint(1, 120))
+    return {'location': rng.choice(sorted(set(HOTEL_CITIES.values()))).title(),
+            'check_in_date': check_in.isoformat(),
+            'check_out_date': (check_in + timedelta(days=rng.randint(1, 7))).isoformat(),
+            'priority': rng.choice(('balanced', 'cheapest', 'top_rated'))}
+
+
+def run_parallel(task, count: int, threads: int) -> dict:
+    """Run task(i) count times on a thread pool; return throughput and latency percentiles."""
+    def timed(i):
+        started = time.perf_counter()
+        task(i)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(timed, range(count)))
+    elapsed = time.perf_counter() - started
+    return {
+        'per_second': count / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=16, help='Concurrent callers')
+    parser.add_argument('--searches', type=int, default=5000, help='Searches through the tools alone')
+    parser.add_argument('--turns', type=int, default=2000, help='Turns through the full graph')
+    args = parser.parse_args()
+
+    os.environ.setdefault('TAVILY_API_KEY', 'benchmark-placeholder')
+    settings = get_search_backend_settings()
+    if not os.path.exists(settings['path']):
+        generate_inventory(settings['path'], get_today(), settings['days'], settings['hotels_per_city'], settings['seed'])
+    install_inventory(Inventory(settings['path']))
+
+    rng = random.Random(1)
+    flight_args = [random_flight_args(rng) for _ in range(args.searches // 2)]
+    hotel_args = [random_hotel_args(rng) for _ in range(args.searches - len(flight_args))]
+
+    def search(i):
+        if i < len(flight_args):
+            search_flights_with_records(**flight_args[i])
+        else:
+            search_hotels_with_records(**hotel_args[i - len(flight_args)])
+
+    # Per-search debug logging would dominate; the numbers are printed afterwards
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        tools_result = run_parallel(search, args.searches, args.threads)
+
+        llms = create_role_llms(fake_llm_factory(0.0))
+        searching = SearchingFakeModel(latency_scale=0.0)
+        llms.update({'flight': searching, 'hotel': searching})
+        travel_planner = build_travel_planner_graph(llms)
+        queries = []
+        for i in range(args.turns):
+            if i % 2:
+                search_args = random_hotel_args(rng)
+                query = f"Find hotels in {search_args['location']} from {search_args['check_in_date']} (#{i})"
+            else:
+                search_args = random_flight_args(rng)
+                query = (f"Find flights {search_args['departure_airport']} to {search_args['arrival_airport']} "
+                         f"on {search_args['outbound_date']} (#{i})")
+            SEARCH_ARGS[query] = search_args
+            queries.append(query)
+
+        def turn(i):
+            config = with_deadline({"configurable": {"thread_id": f"bench-{i}"}})
+            travel_planner.invoke({"messages": [HumanMessage(content=queries[i])]}, config)
+
+        graph_result = run_parallel(turn, args.turns, args.threads)
+
+    print(f"\nSearch backend benchmark ({args.threads} threads, inventory {settings['path']}):")
+    print(f"{'path':<14}{'per second':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, result in (('tools', tools_result), ('full graph', graph_result)):
+        print(f"{name:<14}{result['per_second']:>12.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Fake LLM stand-in for benchmarks.
+FakeChatModel behaves like a ChatOpenAI client without calling the API:
+it answers router prompts with a one-word route, answers agent prompts
+with a canned reply, and sleeps for a latency modelled on the configured
+model tier so that benchmarks show the effect of model choices.
+"""
+
+import time
+from typing import List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Illustrative latency profiles per model:
+# (time to first token in s, seconds per output token, seconds per 1k input tokens)
+MODEL_LATENCY_PROFILES = {
+    'gpt-4o':       (0.45, 0.012, 0.040),
+    'gpt-4o-mini':  (0.25, 0.006, 0.020),
+    'gpt-4.1':      (0.50, 0.013, 0.040),
+    'gpt-4.1-mini': (0.30, 0.007, 0.020),
+    'gpt-4.1-nano': (0.18, 0.004, 0.010),
+}
+DEFAULT_LATENCY_PROFILE = MODEL_LATENCY_PROFILES['gpt-4o']
+
+# Keywords used to fake the router's classification
+ROUTE_KEYWORDS = {
+    'FLIGHT': ('flight', 'fly', 'airline', 'ticket', 'airport'),
+    'HOTEL': ('hotel', 'stay', 'room', 'accommodation', 'resort', 'lodging'),
+}
+
+# Canned agent answer length in tokens (roughly one token per word here)
+AGENT_REPLY_TOKENS = 300
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model stand-in with tier-dependent simulated latency.
+
+    Attributes:
+        model_name: Model the latency profile is taken from
+        max_tokens: Cap on simulated output tokens (None for no cap)
+        latency_scale: Multiplier on simulated latency (0 disables sleeping)
+    """
+
+    model_name: str = 'gpt-4o'
+    max_tokens: Optional[int] = None
+    latency_scale: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return 'fake-chat'
+
+    def bind_tools(self, tools, **kwargs):
+        """Accept tools like ChatOpenAI; the fake model never calls them."""
+        return self
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        """Build the canned reply for a prompt."""
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), '')
+        query = str(messages[-1].content).lower()
+        if 'routing expert' in system:
+            for route, keywords in ROUTE_KEYWORDS.items():
+                if any(keyword in query for keyword in keywords):
+                    return route
+            return 'ITINERARY'
+        return ' '.join(['Here is a suggested travel option.'] * (AGENT_REPLY_TOKENS // 6))
+
+    def simulated_latency(self, messages: List[BaseMessage], reply: str) -> float:
+        """
+        Latency the configured model tier would need for this call.
+
+        Args:
+            messages: Prompt messages
+            reply: Generated reply text
+
+        Returns:
+            Simulated latency in seconds (before latency_scale)
+        """
+        first_token, per_output_token, per_1k_input = MODEL_LATENCY_PROFILES.get(
+            self.model_name, DEFAULT_LATENCY_PROFILE
+        )
+        input_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        output_tokens = estimate_tokens(reply)
+        if self.max_tokens:
+            output_tokens = min(output_tokens, self.max_tokens)
+        return first_token + output_tokens * per_output_token + input_tokens / 1000 * per_1k_input
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        reply = self._reply(messages)
+        if self.latency_scale > 0:
+            time.sleep(self.simulated_latency(messages, reply) * self.latency_scale)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+
+def fake_llm_factory(latency_scale: float = 1.0):
+    """
+    Build a factory for src.models.create_role_llms that returns fake models.
+
+    Args:
+        latency_scale: Multiplier on simulated latency
+
+    Returns:
+        Callable taking a role's model configuration
+    """
+    def factory(model_config: dict) -> FakeChatModel:
+        return FakeChatModel(
+            model_name=model_config['model'],
+            max_tokens=model_config['max_tokens'],
+            latency_scale=latency_scale
+        )
+    return factory
@@ -1,4 +1,48 @@
 """Configuration package for the multi-agent travel planner."""
 
-from .settings import load_config, get_api_key
-__all__ = ['load_config', 'get_api_key']
+from .settings import (
+    load_config,
+    get_api_key,
+    is_direct_render_enabled,
+    get_today,
+    get_agent_max_steps,
+    get_agent_deadline_seconds,
+    get_request_budget_seconds,
+    get_tool_timeout_seconds,
+    get_search_top_k,
+    get_worker_max_sessions,
+    get_model_config,
+    MODEL_ROLES,
+    get_cassette_settings,
+    get_blob_store_settings,
+    get_search_cache_settings,
+    get_profile_settings,
+    get_admission_settings,
+    get_router_batch_settings,
+    get_search_backend_settings,
+    get_hedging_settings,
+    get_multi_city_settings,
+)
+__all__ = [
+    'load_config',
+    'get_api_key',
+    'is_direct_render_enabled',
+    'get_today',
+    'get_agent_max_steps',
+    'get_agent_deadline_seconds',
+    'get_request_budget_seconds',
+    'get_tool_timeout_seconds',
+    'get_search_top_k',
+    'get_worker_max_sessions',
+    'get_model_config',
+    'MODEL_ROLES',
+    'get_cassette_settings',
+    'get_blob_store_settings',
+    'get_search_cache_settings',
+    'get_profile_settings',
+    'get_admission_settings',
+    'get_router_batch_settings',
+    'get_search_backend_settings',
+    'get_hedging_settings',
+    'get_multi_city_settings',
+]
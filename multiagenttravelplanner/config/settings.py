@@ -5,6 +5,7 @@ available to the rest of the application.
 """
 
 import os
+from datetime import date
 from dotenv import load_dotenv
 
 def load_config():
@@ -35,6 +36,15 @@ def load_config():
             f"TAVILY_API_KEY={'set' if os.environ.get('TAVILY_API_KEY') else 'not set'}, " +
             f"SERPAPI_API_KEY={'set' if os.environ.get('SERPAPI_API_KEY') else 'not set'}")
     
+    if 'SERPAPI_API_KEY' in missing_keys and os.environ.get('SEARCH_BACKEND', '').strip().lower() == 'inventory':
+        # Flight and hotel searches are answered locally
+        missing_keys.remove('SERPAPI_API_KEY')
+    
+    if missing_keys and os.environ.get('CASSETTE_MODE', '').strip().lower() == 'replay':
+        # Replayed traffic never reaches the real services
+        print(f"⚠️  Missing API keys ignored in cassette replay mode: {', '.join(missing_keys)}")
+        return True
+    
     if missing_keys:
         raise ValueError(f"Missing required API keys: {', '.join(missing_keys)}\n"
                          f"Please ensure they are set in the .env file.")
@@ -57,4 +67,392 @@ def get_api_key(key_name: str) -> str:
     value = os.environ.get(key_name)
     if not value:
         raise KeyError(f"API key '{key_name}' not found in environment variables.")
-    return value
\ No newline at end of file
+    return value
+
+def is_direct_render_enabled() -> bool:
+    """
+    Check whether plain search results should be rendered locally.
+
+    When enabled (the default), flight and hotel searches that need no
+    judgment are formatted with a template instead of a second LLM call.
+    Set DIRECT_RENDER=false in the .env file to always use the LLM.
+
+    Returns:
+        bool: True if direct rendering is enabled
+    """
+    return os.environ.get('DIRECT_RENDER', 'true').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def _env_number(name: str, default, cast):
+    """Read a numeric setting from the environment, falling back to default."""
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        print(f"⚠️  Invalid value for {name}: '{value}', using default {default}")
+        return default
+
+
+def get_today() -> date:
+    """
+    The date relative travel dates are resolved against.
+
+    Configured with TRAVEL_PLANNER_TODAY (YYYY-MM-DD, default: the system
+    date). Pinning it keeps prompts and tool arguments reproducible, e.g.
+    when replaying recorded traffic.
+
+    Returns:
+        date: Today's date for the planner
+    """
+    value = os.environ.get('TRAVEL_PLANNER_TODAY', '').strip()
+    if value:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            print(f"⚠️  Invalid value for TRAVEL_PLANNER_TODAY: '{value}', using the system date")
+    return date.today()
+
+
+def get_agent_max_steps() -> int:
+    """
+    Maximum number of model calls an agent may make in one turn.
+
+    Configured with AGENT_MAX_STEPS (default: 5).
+
+    Returns:
+        int: The step cap, at least 1
+    """
+    return max(1, _env_number('AGENT_MAX_STEPS', 5, int))
+
+
+def get_agent_deadline_seconds() -> float:
+    """
+    Wall-clock budget for one agent turn, in seconds.
+
+    Configured with AGENT_DEADLINE_SECONDS (default: 60). When the budget
+    runs out the agent returns the best partial answer it has.
+
+    Returns:
+        float: The deadline in seconds
+    """
+    return max(1.0, _env_number('AGENT_DEADLINE_SECONDS', 60.0, float))
+
+
+def get_request_budget_seconds() -> float:
+    """
+    End-to-end latency budget for one request, in seconds.
+
+    Configured with REQUEST_BUDGET_SECONDS (default: 90). The deadline is
+    attached when the graph is invoked and every router, agent, LLM and
+    tool call receives only the budget that remains.
+
+    Returns:
+        float: The request budget in seconds
+    """
+    return max(1.0, _env_number('REQUEST_BUDGET_SECONDS', 90.0, float))
+
+
+def get_tool_timeout_seconds() -> float:
+    """
+    Maximum time a single tool call (SerpAPI, Tavily) may take, in seconds.
+
+    Configured with TOOL_TIMEOUT_SECONDS (default: 20). A tool call never
+    gets more than the remaining request budget either.
+
+    Returns:
+        float: The per-call timeout in seconds
+    """
+    return max(0.1, _env_number('TOOL_TIMEOUT_SECONDS', 20.0, float))
+
+
+def get_search_top_k() -> int:
+    """
+    Number of ranked flight/hotel options a search returns to the model.
+
+    Configured with SEARCH_TOP_K (default: 5). Every option SerpAPI returns
+    is ranked locally; only the best k are sent to the model.
+
+    Returns:
+        int: The number of options to return
+    """
+    return max(1, _env_number('SEARCH_TOP_K', 5, int))
+
+
+def get_worker_max_sessions() -> int:
+    """
+    Conversations a worker process keeps in memory.
+
+    Configured with WORKER_MAX_SESSIONS (default: 10000, 0 for no limit).
+    Beyond this the least recently used conversation is dropped, releasing
+    its checkpoints and the interned tool results they reference.
+
+    Returns:
+        int: The session limit, or 0 for none
+    """
+    return max(0, _env_number('WORKER_MAX_SESSIONS', 10000, int))
+
+
+# Roles that get their own model client, wired to graph nodes by
+# src.graph_builder.build_travel_planner_graph
+MODEL_ROLES = ('router', 'flight', 'hotel', 'itinerary', 'summarizer')
+
+# Default model tier per role. The router only emits one word, so it uses
+# a small, fast model; the tool-calling agents keep the flagship model.
+DEFAULT_MODEL_CONFIG = {
+    'router':     {'model': 'gpt-4o-mini', 'temperature': 0.0, 'max_tokens': 5,    'timeout': 10.0},
+    'flight':     {'model': 'gpt-4o',      'temperature': 0.2, 'max_tokens': 2000, 'timeout': 60.0},
+    'hotel':      {'model': 'gpt-4o',      'temperature': 0.2, 'max_tokens': 2000, 'timeout': 60.0},
+    'itinerary':  {'model': 'gpt-4o',      'temperature': 0.2, 'max_tokens': 3000, 'timeout': 60.0},
+    'summarizer': {'model': 'gpt-4o-mini', 'temperature': 0.2, 'max_tokens': 1500, 'timeout': 30.0},
+}
+
+
+def get_model_config(role: str) -> dict:
+    """
+    Get the model configuration for one role.
+
+    Each value can be overridden in the .env file with <ROLE>_<SETTING>,
+    for example ROUTER_MODEL=gpt-4o, FLIGHT_TEMPERATURE=0,
+    ITINERARY_MAX_TOKENS=4000 or SUMMARIZER_TIMEOUT=20.
+
+    Args:
+        role (str): One of MODEL_ROLES
+
+    Returns:
+        dict: model, temperature, max_tokens and timeout for the role
+    Raises:
+        KeyError: If the role is unknown
+    """
+    if role not in DEFAULT_MODEL_CONFIG:
+        raise KeyError(f"Unknown model role '{role}'. Expected one of: {', '.join(MODEL_ROLES)}")
+
+    defaults = DEFAULT_MODEL_CONFIG[role]
+    prefix = role.upper()
+    return {
+        'model': os.environ.get(f'{prefix}_MODEL', defaults['model']),
+        'temperature': _env_number(f'{prefix}_TEMPERATURE', defaults['temperature'], float),
+        'max_tokens': _env_number(f'{prefix}_MAX_TOKENS', defaults['max_tokens'], int),
+        'timeout': _env_number(f'{prefix}_TIMEOUT', defaults['timeout'], float),
+    }
+
+
+
+def get_cassette_settings() -> dict:
+    """
+    Settings for the record/replay cassette layer (src/cassette.py).
+
+    - CASSETTE_MODE: off (default), record, replay or auto
+      (auto replays recorded calls and records the rest)
+    - CASSETTE_PATH: gzip JSONL file (default: cassettes/traffic.jsonl.gz); each
+      process records to <name>.<pid>.jsonl.gz next to it
+    - CASSETTE_LATENCY: none (default, replay at full speed), recorded
+      (inject the recorded latency) or a fixed number of seconds per call
+    - CASSETTE_SPEEDUP: divisor for recorded latency (default: 1)
+
+    Returns:
+        dict: mode, path, latency and speedup
+    """
+    mode = os.environ.get('CASSETTE_MODE', 'off').strip().lower() or 'off'
+    latency = os.environ.get('CASSETTE_LATENCY', 'none').strip().lower()
+    if latency not in ('none', 'recorded'):
+        latency = _env_number('CASSETTE_LATENCY', None, float)
+    elif latency == 'none':
+        latency = None
+    return {
+        'mode': mode,
+        'path': os.environ.get('CASSETTE_PATH', os.path.join('cassettes', 'traffic.jsonl.gz')),
+        'latency': latency,
+        'speedup': _env_number('CASSETTE_SPEEDUP', 1.0, float),
+    }
+
+
+def get_blob_store_settings() -> dict:
+    """
+    Settings for interning large tool results (src/blob_store.py).
+
+    - BLOB_STORE: memory (default), disk, or off (keep payloads inline)
+    - BLOB_STORE_PATH: directory for the disk store (default: .blobs; pool
+      workers use a worker-<id> subdirectory each)
+    - BLOB_MIN_BYTES: smallest tool result worth interning (default: 1024)
+
+    Returns:
+        dict: backend, path and min_bytes
+    """
+    return {
+        'backend': os.environ.get('BLOB_STORE', 'memory').strip().lower() or 'memory',
+        'path': os.environ.get('BLOB_STORE_PATH', '.blobs'),
+        'min_bytes': max(0, _env_number('BLOB_MIN_BYTES', 1024, int)),
+    }
+
+
+def get_search_cache_settings() -> dict:
+    """
+    Settings for the SerpAPI/Tavily search cache and its background warmer
+    (src/search_cache.py, src/cache_warmer.py).
+
+    - SEARCH_CACHE_TTL_SECONDS: flight/hotel result lifetime (default: 900, 0 disables the cache)
+    - SEARCH_CACHE_TAVILY_TTL_SECONDS: Tavily result lifetime (default: 3600)
+    - SEARCH_CACHE_MAX_ENTRIES: cached responses kept (default: 2048)
+    - CACHE_WARMER: true to refresh popular searches in the background (default: false)
+    - CACHE_WARMER_INTERVAL_SECONDS: time between warming passes (default: 60)
+    - CACHE_WARMER_TOP_N: most frequent searches considered per pass (default: 200)
+    - CACHE_WARMER_WINDOW_SECONDS: how far back usage is counted (default: 3600)
+    - CACHE_WARMER_REFRESH_AHEAD_SECONDS: refresh entries this close to expiry (default: 180)
+    - CACHE_WARMER_QUOTA_PER_HOUR: upstream requests the warmers of all processes
+      may spend together (default: 100, split between server-mode workers)
+
+    Returns:
+        dict: ttl, tavily_ttl, max_entries, warmer, interval, top_n, window,
+              refresh_ahead and quota_per_hour
+    """
+    return {
+        'ttl': max(0.0, _env_number('SEARCH_CACHE_TTL_SECONDS', 900.0, float)),
+        'tavily_ttl': max(0.0, _env_number('SEARCH_CACHE_TAVILY_TTL_SECONDS', 3600.0, float)),
+        'max_entries': max(1, _env_number('SEARCH_CACHE_MAX_ENTRIES', 2048, int)),
+        'warmer': os.environ.get('CACHE_WARMER', 'false').strip().lower() in ('1', 'true', 'yes', 'on'),
+        'interval': max(1.0, _env_number('CACHE_WARMER_INTERVAL_SECONDS', 60.0, float)),
+        'top_n': max(1, _env_number('CACHE_WARMER_TOP_N', 200, int)),
+        'window': max(60.0, _env_number('CACHE_WARMER_WINDOW_SECONDS', 3600.0, float)),
+        'refresh_ahead': max(0.0, _env_number('CACHE_WARMER_REFRESH_AHEAD_SECONDS', 180.0, float)),
+        'quota_per_hour': max(0, _env_number('CACHE_WARMER_QUOTA_PER_HOUR', 100, int)),
+    }
+
+
+def get_profile_settings() -> dict:
+    """
+    Settings for the on-demand sampling profiler (src/profiler.py).
+
+    Read on every turn, so profiling can be switched on in a running
+    process by creating the trigger file.
+
+    - PROFILE: true to profile every turn (default: false)
+    - PROFILE_SAMPLE_RATE: fraction of turns to profile (default: 0)
+    - PROFILE_TRIGGER_FILE: while this file exists, turns are profiled; if it
+      contains a number, that is used as the sample rate (default: profiles/ENABLE)
+    - PROFILE_DIR: where collapsed-stack files are written (default: profiles)
+    - PROFILE_INTERVAL_MS: sampling interval in milliseconds (default: 5)
+
+    Returns:
+        dict: enabled, sample_rate, trigger_file, dir and interval
+    """
+    profile_dir = os.environ.get('PROFILE_DIR', 'profiles')
+    return {
+        'enabled': os.environ.get('PROFILE', 'false').strip().lower() in ('1', 'true', 'yes', 'on'),
+        'sample_rate': min(1.0, max(0.0, _env_number('PROFILE_SAMPLE_RATE', 0.0, float))),
+        'trigger_file': os.environ.get('PROFILE_TRIGGER_FILE', os.path.join(profile_dir, 'ENABLE')),
+        'dir': profile_dir,
+        'interval': max(0.5, _env_number('PROFILE_INTERVAL_MS', 5.0, float)) / 1000.0,
+    }
+
+
+def get_admission_settings() -> dict:
+    """
+    Settings for admission control in front of the worker pool (src/admission.py).
+
+    - ADMISSION_CONTROL: false to send every request straight to the workers (default: true)
+    - ADMISSION_MAX_CONCURRENT: requests running at once (default: 0, one per worker)
+    - ADMISSION_MAX_QUEUE: requests allowed to wait; more are rejected at once (default: 64)
+    - ADMISSION_TENANT_LIMIT: requests running at once per tenant (default: 0, no cap)
+    - ADMISSION_QUEUE_TIMEOUT_SECONDS: longest a request may wait for admission (default: 30)
+
+    Returns:
+        dict: enabled, max_concurrent, max_queue, tenant_limit and queue_timeout
+    """
+    return {
+        'enabled': os.environ.get('ADMISSION_CONTROL', 'true').strip().lower() not in ('0', 'false', 'no', 'off'),
+        'max_concurrent': max(0, _env_number('ADMISSION_MAX_CONCURRENT', 0, int)),
+        'max_queue': max(0, _env_number('ADMISSION_MAX_QUEUE', 64, int)),
+        'tenant_limit': max(0, _env_number('ADMISSION_TENANT_LIMIT', 0, int)),
+        'queue_timeout': max(0.1, _env_number('ADMISSION_QUEUE_TIMEOUT_SECONDS', 30.0, float)),
+    }
+
+
+def get_router_batch_settings() -> dict:
+    """
+    Settings for micro-batched routing (src/router_batcher.py), used in server mode.
+
+    - ROUTER_BATCH_WINDOW_MS: how long to collect queries before classifying
+      them in one call (default: 10, 0 routes every query on its own)
+    - ROUTER_BATCH_MAX: most queries classified in one call (default: 32)
+
+    Returns:
+        dict: window (seconds) and max_batch
+    """
+    return {
+        'window': max(0.0, _env_number('ROUTER_BATCH_WINDOW_MS', 10.0, float)) / 1000.0,
+        'max_batch': max(1, _env_number('ROUTER_BATCH_MAX', 32, int)),
+    }
+
+
+def get_search_backend_settings() -> dict:
+    """
+    Settings for the flight/hotel search backend (tools/inventory.py).
+
+    - SEARCH_BACKEND: 'serpapi' (default) or 'inventory' for the local
+      synthetic inventory used in load tests
+    - INVENTORY_PATH: SQLite file, generated on first use (default: inventory.sqlite3)
+    - INVENTORY_DAYS: days of schedule and rates generated from today (default: 90)
+    - INVENTORY_HOTELS_PER_CITY: hotels generated per city (default: 40)
+    - INVENTORY_SEED: random seed, so every generated inventory matches (default: 7)
+
+    Returns:
+        dict: backend, path, days, hotels_per_city and seed
+    """
+    backend = os.environ.get('SEARCH_BACKEND', 'serpapi').strip().lower()
+    if backend not in ('serpapi', 'inventory'):
+        print(f"⚠️  Unknown SEARCH_BACKEND '{backend}', using serpapi")
+        backend = 'serpapi'
+    return {
+        'backend': backend,
+        'path': os.environ.get('INVENTORY_PATH', 'inventory.sqlite3'),
+        'days': max(1, _env_number('INVENTORY_DAYS', 90, int)),
+        'hotels_per_city': max(1, _env_number('INVENTORY_HOTELS_PER_CITY', 40, int)),
+        'seed': _env_number('INVENTORY_SEED', 7, int),
+    }
+
+
+def get_hedging_settings() -> dict:
+    """
+    Settings for hedged LLM requests (src/hedging.py).
+
+    - LLM_HEDGING: true to hedge slow model calls (default: false)
+    - LLM_HEDGE_ROLES: comma-separated roles to hedge (default: router,flight,hotel,itinerary)
+    - LLM_HEDGE_QUANTILE: latency quantile used as the hedge threshold (default: 0.95)
+    - LLM_HEDGE_BUDGET_PERCENT: most calls that may be hedged, in percent (default: 5)
+    - LLM_HEDGE_MIN_SAMPLES: calls observed per role before hedging starts (default: 20)
+    - LLM_HEDGE_MIN_DELAY_MS: never hedge sooner than this (default: 100)
+    - LLM_HEDGE_WINDOW: recent calls the quantile is computed over (default: 200)
+
+    Returns:
+        dict: enabled, roles, quantile, budget_fraction, min_samples, min_delay (seconds) and window
+    """
+    roles = os.environ.get('LLM_HEDGE_ROLES', 'router,flight,hotel,itinerary')
+    return {
+        'enabled': os.environ.get('LLM_HEDGING', 'false').strip().lower() in ('1', 'true', 'yes', 'on'),
+        'roles': [role.strip().lower() for role in roles.split(',') if role.strip()],
+        'quantile': min(0.999, max(0.5, _env_number('LLM_HEDGE_QUANTILE', 0.95, float))),
+        'budget_fraction': min(1.0, max(0.0, _env_number('LLM_HEDGE_BUDGET_PERCENT', 5.0, float) / 100.0)),
+        'min_samples': max(1, _env_number('LLM_HEDGE_MIN_SAMPLES', 20, int)),
+        'min_delay': max(0.0, _env_number('LLM_HEDGE_MIN_DELAY_MS', 100.0, float)) / 1000.0,
+        'window': max(10, _env_number('LLM_HEDGE_WINDOW', 200, int)),
+    }
+
+
+def get_multi_city_settings() -> dict:
+    """
+    Settings for map-reduce planning of multi-city itineraries (agents/itinerary_segments.py).
+
+    - ITINERARY_MULTI_CITY: true to plan each city of a multi-city trip
+      concurrently and merge the segments (default: true)
+    - ITINERARY_MAX_SEGMENTS: most cities planned as separate segments; longer
+      trips are planned in one pass (default: 6)
+
+    Returns:
+        dict: enabled and max_segments
+    """
+    return {
+        'enabled': os.environ.get('ITINERARY_MULTI_CITY', 'true').strip().lower() in ('1', 'true', 'yes', 'on'),
+        'max_segments': max(2, _env_number('ITINERARY_MAX_SEGMENTS', 6, int)),
+    }
@@ -6,19 +6,26 @@ for the travel planning system.
 """
 import sys
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
 # Import our modules
 from config.settings import load_config
 from src.graph_builder import build_travel_planner_graph, save_graph_visualization
+from src.deadline import with_deadline
+from src.models import create_role_llms
+from src.cassette import Cassette, install_cassette, wrap_llms
+from src.hedging import Hedger, wrap_hedged
+from tools.inventory import Inventory, install_inventory
+from src.search_cache import SearchCache, install_search_cache
+from src.cache_warmer import CacheWarmer
 
 def initialize_system():
     """
     Initialize the travel planner system.
     
-    This loads configuration, creates the LLM, and builds the graph.
+    This loads configuration, creates one LLM client per role, and
+    builds the graph.
     
     Returns:
-        tuple: (travel_planner_graph, llm)
+        tuple: (travel_planner_graph, llms)
     """
     print("=" * 60)
     print("🚀 Initializing Multi-Agent Travel Planner")
@@ -34,20 +41,40 @@ def initialize_system():
         print("2. Added all required API keys (see .env.example)")
         sys.exit(1)
     
-    # Initialize the language model
-    print("\n🤖 Initializing GPT-4o...")
-    llm = ChatOpenAI(
-        model="gpt-4o",
-        temperature=0.2
-    )
+    # Answer flight/hotel searches from the local inventory if SEARCH_BACKEND=inventory
+    inventory = Inventory.from_settings()
+    if inventory:
+        install_inventory(inventory)
+    
+    # Record or replay upstream traffic if CASSETTE_MODE is set
+    cassette = Cassette.from_settings()
+    if cassette:
+        install_cassette(cassette)
+    
+    # Serve repeated searches from the cache and keep popular ones warm
+    search_cache = SearchCache.from_settings()
+    if search_cache:
+        install_search_cache(search_cache)
+        warmer = CacheWarmer.from_settings(search_cache)
+        if warmer:
+            warmer.start()
+    
+    # Initialize the language models (one tier per role, see config/settings.py)
+    print("\n🤖 Initializing language models...")
+    llms = create_role_llms()
+    hedger = Hedger.from_settings()
+    if hedger:
+        llms = wrap_hedged(hedger, llms)
+    if cassette:
+        llms = wrap_llms(cassette, llms)
     
     # Build the multi-agent graph
-    travel_planner = build_travel_planner_graph(llm)
+    travel_planner = build_travel_planner_graph(llms)
     
     # Save graph visualization
     save_graph_visualization(travel_planner, "multi_travel_agent_graph.png")
     
-    return travel_planner, llm
+    return travel_planner, llms
 
 def run_single_query(travel_planner, query, thread_id="default"):
     """
@@ -68,8 +95,8 @@ def run_single_query(travel_planner, query, thread_id="default"):
         "next_agent": ""
     }
     
-    # Configuration for checkpointing (memory)
-    config = {"configurable": {"thread_id": thread_id}}
+    # Configuration for checkpointing (memory) with this request's deadline
+    config = with_deadline({"configurable": {"thread_id": thread_id}})
     
     # Run the system
     result = travel_planner.invoke(initial_state, config)
@@ -120,7 +147,7 @@ def run_interactive_chat(travel_planner):
             # Invoke the graph with the new message
             result = travel_planner.invoke(
                 {"messages": [HumanMessage(content=user_input)]},
-                config
+                with_deadline(config)
             )
             
             # Display the response
@@ -136,7 +163,7 @@ def main():
     Main function - entry point of the application.
     """
     # Initialize the system
-    travel_planner, llm = initialize_system()
+    travel_planner, llms = initialize_system()
     
     # Check if user provided a query as command line argument
     if len(sys.argv) > 1:
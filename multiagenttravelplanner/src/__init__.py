@@ -1,12 +1,56 @@
 """Source package initialization."""
 from .state import TravelPlannerState
+from .renderer import needs_llm_synthesis, render_flight_results, render_hotel_results
+from .agent_loop import run_agent_loop
+from .blob_store import BlobStore, get_blob_store, intern_messages, rehydrate_messages
+from .profiler import ProfiledGraph, profile_turn
+from .deadline import with_deadline, deadline_scope, deadline_node
+from .models import create_llm, create_role_llms
+from .hedging import Hedger, HedgedChatModel, wrap_hedged
+from .cassette import Cassette, CassetteChatModel, install_cassette, wrap_llms
+from .search_cache import SearchCache, install_search_cache
+from .cache_warmer import CacheWarmer
 from .router import create_router, router_node, route_to_agent
+from .router_batcher import RouterBatcher
+from .admission import AdmissionController, AdmissionRejected
+from .worker_pool import HashRing, WorkerDied, WorkerPool
 from .graph_builder import build_travel_planner_graph, save_graph_visualization
 __all__ = [
     'TravelPlannerState',
     'create_router',
     'router_node',
     'route_to_agent',
+    'RouterBatcher',
+    'needs_llm_synthesis',
+    'render_flight_results',
+    'render_hotel_results',
+    'run_agent_loop',
+    'BlobStore',
+    'get_blob_store',
+    'intern_messages',
+    'rehydrate_messages',
+    'ProfiledGraph',
+    'profile_turn',
+    'with_deadline',
+    'deadline_scope',
+    'deadline_node',
+    'create_llm',
+    'create_role_llms',
+    'Hedger',
+    'HedgedChatModel',
+    'wrap_hedged',
+    'Cassette',
+    'CassetteChatModel',
+    'install_cassette',
+    'wrap_llms',
+    'SearchCache',
+    'install_search_cache',
+    'CacheWarmer',
+    'AdmissionController',
+    'AdmissionRejected',
+    'HashRing',
+    'WorkerDied',
+    'WorkerPool',
     'build_travel_planner_graph',
     'save_graph_visualization'
 ]
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+Admission control and load shedding for concurrent planner requests.
+Requests wait in a bounded priority queue in front of graph invocation.
+At most max_concurrent run at once (and at most tenant_limit per tenant);
+turns of conversations already in progress are admitted before new
+sessions. A request that cannot start before its queue deadline, or that
+arrives while the queue is full, is rejected at once with a retry hint
+instead of being run after its caller has given up, so the requests that
+are admitted still finish within their budget when upstreams slow down.
+"""
+
+import math
+import time
+import bisect
+import itertools
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+from config.settings import get_admission_settings, get_request_budget_seconds
+
+# Queue priorities (lower is admitted first)
+CONTINUING_SESSION = 0
+NEW_SESSION = 1
+
+# Sessions remembered as continuing (least recently used beyond this are dropped)
+MAX_TRACKED_SESSIONS = 10000
+
+# Bounds of the retry hint, in seconds
+MIN_RETRY_AFTER = 1.0
+MAX_RETRY_AFTER = 60.0
+
+# Smoothing factor for the running average of request service time
+SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionRejected(RuntimeError):
+    """
+    Raised (through the request's future) when a request is shed.
+
+    Attributes:
+        reason: 'queue full', 'queue timeout' or 'displaced'
+        retry_after: Suggested seconds to wait before retrying
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Planner overloaded ({reason}), retry after {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """A queued request."""
+
+    __slots__ = ('tenant', 'thread_id', 'start', 'budget', 'future', 'enqueued_at', 'deadline', 'priority')
+
+    def __init__(self, tenant: str, thread_id: str, start: Callable[[float], Future],
+                 budget: float, deadline: float, priority: int):
+        self.tenant = tenant
+        self.thread_id = thread_id
+        self.start = start
+        self.budget = budget
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        self.priority = priority
+
+
+class AdmissionController:
+    """
+    Bounded, prioritized admission queue with per-tenant concurrency caps.
+
+    Attributes:
+        max_concurrent: Requests running at once
+        max_queue: Requests allowed to wait; beyond this new ones are rejected
+        tenant_limit: Requests running at once per tenant (0 for no cap)
+        queue_timeout: Longest a request may wait before it is rejected
+                       (never longer than its own latency budget)
+
+    Example:
+        >>> admission = AdmissionController(max_concurrent=4)
+        >>> future = admission.submit("acme", "session-1", lambda budget: pool_submit(..., budget))
+        >>> future.result()   # raises AdmissionRejected if the request was shed
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int = 64, tenant_limit: int = 0,
+                 queue_timeout: float = 30.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.tenant_limit = tenant_limit
+        self.queue_timeout = queue_timeout
+        # Sorted by (priority, arrival); entries are (priority, seq, waiter)
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._tenant_running = defaultdict(int)
+        self._sessions: 'OrderedDict[str, None]' = OrderedDict()
+        self._service_time: Optional[float] = None
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+        self.stats = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls, default_concurrency: int) -> Optional['AdmissionController']:
+        """
+        Create the controller configured by ADMISSION_* settings, or None if disabled.
+
+        Args:
+            default_concurrency: max_concurrent when ADMISSION_MAX_CONCURRENT is 0
+                                 (e.g. the number of workers)
+        """
+        settings = get_admission_settings()
+        if not settings['enabled']:
+            return None
+        return cls(
+            settings['max_concurrent'] or max(1, default_concurrency),
+            settings['max_queue'], settings['tenant_limit'], settings['queue_timeout']
+        )
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for admission."""
+        with self._cond:
+            return len(self._queue)
+
+    @property
+    def running(self) -> int:
+        """Requests admitted and not yet finished."""
+        with self._cond:
+            return self._running
+
+    def submit(self, tenant: str, thread_id: str, start: Callable[[float], Future],
+               budget_seconds: Optional[float] = None) -> Future:
+        """
+        Queue a request and start it once admitted.
+
+        Args:
+            tenant: Tenant the request counts against for tenant_limit
+            thread_id: Conversation id (known ids are admitted first)
+            start: Called with the remaining latency budget in seconds once
+                   the request is admitted; returns a Future of the result
+            budget_seconds: Request latency budget (default: REQUEST_BUDGET_SECONDS);
+                            time spent queued is deducted from it
+
+        Returns:
+            Future resolving to the started request's result, or failing with
+            AdmissionRejected if the request was shed
+        """
+        budget = budget_seconds if budget_seconds is not None else get_request_budget_seconds()
+        with self._cond:
+            priority = CONTINUING_SESSION if thread_id in self._sessions else NEW_SESSION
+            waiter = _Waiter(tenant, thread_id, start, budget,
+                             time.monotonic() + min(self.queue_timeout, budget), priority)
+            shed = []
+            if len(self._queue) >= self.max_queue:
+                victim = self._queue[-1][2] if self._queue else None
+                if victim is None or victim.priority <= priority:
+                    self.stats['rejected_full'] += 1
+                    waiter.future.set_exception(AdmissionRejected('queue full', self._retry_after()))
+                    return waiter.future
+                # A continuing session takes the place of the newest new session
+                self._queue.pop()
+                self.stats['displaced'] += 1
+                shed.append((victim, 'displaced'))
+            bisect.insort(self._queue, (priority, next(self._seq), waiter))
+            self.stats['queued'] += 1
+            admitted = self._admit()
+            self._ensure_reaper()
+            self._cond.notify_all()
+            retry_after = self._retry_after()
+        self._reject(shed, retry_after)
+        for admitted_waiter in admitted:
+            self._launch(admitted_waiter)
+        return waiter.future
+
+    def _retry_after(self) -> float:
+        """Estimate when capacity frees up, from the backlog and average service time."""
+        service_time = self._service_time or 1.0
+        backlog = len(self._queue) + self._running
+        estimate = math.ceil(service_time * backlog / max(1, self.max_concurrent))
+        return min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, estimate))
+
+    def _admit(self) -> List[_Waiter]:
+        """Take the queued requests that can start now, in priority order (lock held)."""
+        admitted = []
+        index = 0
+        while index < len(self._queue) and self._running < self.max_concurrent:
+            waiter = self._queue[index][2]
+            if self.tenant_limit and self._tenant_running[waiter.tenant] >= self.tenant_limit:
+                index += 1
+                continue
+            del self._queue[index]
+            self._running += 1
+            self._tenant_running[waiter.tenant] += 1
+            admitted.append(waiter)
+        return admitted
+
+    def _take_expired(self) -> List[_Waiter]:
+        """Remove queued requests past their queue deadline (lock held)."""
+        now = time.monotonic()
+        expired = [entry[2] for entry in self._queue if entry[2].deadline <= now]
+        if expired:
+            self._queue = [entry for entry in self._queue if entry[2].deadline > now]
+            self.stats['rejected_timeout'] += len(expired)
+        return expired
+
+    def _reject(self, shed: List[tuple], retry_after: float):
+        for waiter, reason in shed:
+            waiter.future.set_exception(AdmissionRejected(reason, retry_after))
+
+    def _launch(self, waiter: _Waiter):
+        """Start an admitted request with what is left of its budget."""
+        waited = time.monotonic() - waiter.enqueued_at
+        self.stats['admitted'] += 1
+        self.stats['queue_seconds'] += waited
+        started_at = time.monotonic()
+        try:
+            inner = waiter.start(max(0.0, waiter.budget - waited))
+        except Exception as e:
+            self._finish(waiter, started_at, None)
+            waiter.future.set_exception(e)
+            return
+        inner.add_done_callback(lambda done: self._finish(waiter, started_at, done))
+
+    def _finish(self, waiter: _Waiter, started_at: float, done: Optional[Future]):
+        """Free the request's slot, pass its outcome on and admit whoever is next."""
+        with self._cond:
+            self._running -= 1
+            self._tenant_running[waiter.tenant] -= 1
+            if not self._tenant_running[waiter.tenant]:
+                del self._tenant_running[waiter.tenant]
+            elapsed = time.monotonic() - started_at
+            self._service_time = elapsed if self._service_time is None else (
+                SERVICE_TIME_ALPHA * elapsed + (1 - SERVICE_TIME_ALPHA) * self._service_time
+            )
+            if done is not None and done.exception() is None:
+                self.stats['completed'] += 1
+                self._sessions[waiter.thread_id] = None
+                self._sessions.move_to_end(waiter.thread_id)
+                if len(self._sessions) > MAX_TRACKED_SESSIONS:
+                    self._sessions.popitem(last=False)
+            else:
+                self.stats['failed'] += 1
+            admitted = self._admit()
+        if done is not None:
+            if done.exception() is None:
+                waiter.future.set_result(done.result())
+            else:
+                waiter.future.set_exception(done.exception())
+        for admitted_waiter in admitted:
+            self._launch(admitted_waiter)
+
+    def _ensure_reaper(self):
+        """Start the thread that rejects requests whose queue deadline passes (lock held)."""
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap, name="admission-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                wait = min(entry[2].deadline for entry in self._queue) - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                expired = self._take_expired()
+                retry_after = self._retry_after()
+            self._reject([(waiter, 'queue timeout') for waiter in expired], retry_after)
@@ -0,0 +1,182 @@
+"""
+Agent loop executor shared by the flight, hotel and itinerary agents.
+This module runs the model → tools → model cycle until the model stops
+calling tools, bounded by a step cap and a wall-clock deadline. When a
+bound is hit, the best partial answer gathered so far is returned so
+that latency stays predictable.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, ToolMessage
+from config.settings import get_agent_max_steps, get_agent_deadline_seconds
+from tools.upstream import call_with_timeout, remaining_seconds, UpstreamTimeout
+
+# A tool executor takes the tool-call arguments and returns the tool output
+ToolExecutor = Callable[[dict], str]
+
+# Renders a finished round of tool calls into a final answer, or None
+FinalRenderer = Callable[[List[dict], List[ToolMessage]], Optional[str]]
+
+# Renders a single tool result for a partial answer, or None
+PartialRenderer = Callable[[dict, ToolMessage], Optional[str]]
+
+# Maximum characters of a raw tool result shown in a partial answer
+PARTIAL_RESULT_CHARS = 1500
+
+# Instructions for the summarizer model when the step cap is reached
+SUMMARIZER_PROMPT = """You are a travel assistant finishing an answer for the user.
+The research below was stopped after the maximum number of steps.
+Write the best possible final answer from the tool results already gathered.
+Do not ask to search again; briefly mention anything you could not find."""
+
+
+def execute_tool_calls(tool_calls: List[dict], tools: Dict[str, ToolExecutor]) -> List[ToolMessage]:
+    """
+    Execute every tool call requested by the model.
+
+    Every call gets a ToolMessage - including unknown tools and failures -
+    because the chat API rejects histories with unanswered tool calls.
+
+    Args:
+        tool_calls: Tool calls from the model's AIMessage
+        tools: Mapping of tool name to executor
+
+    Returns:
+        One ToolMessage per tool call, in order
+    """
+    tool_messages = []
+    for tool_call in tool_calls:
+        executor = tools.get(tool_call['name'])
+        if executor is None:
+            content = f"Unknown tool '{tool_call['name']}'. Available tools: {', '.join(sorted(tools))}"
+        else:
+            try:
+                content = executor(tool_call['args'])
+            except Exception as e:
+                content = f"Tool '{tool_call['name']}' failed: {str(e)}"
+
+        tool_messages.append(ToolMessage(
+            content=content,
+            tool_call_id=tool_call['id']
+        ))
+    return tool_messages
+
+
+def build_partial_answer(new_messages: List[BaseMessage], reason: str,
+                         render_partial: Optional[PartialRenderer] = None) -> str:
+    """
+    Build the best available answer from an unfinished loop.
+
+    Args:
+        new_messages: Messages produced by the loop so far
+        reason: Why the loop stopped early (shown to the user)
+        render_partial: Optional renderer for individual tool results
+
+    Returns:
+        Answer text combining any model commentary and gathered results
+    """
+    calls = {}
+    sections = []
+    for message in new_messages:
+        if isinstance(message, AIMessage):
+            for tool_call in message.tool_calls or []:
+                calls[tool_call['id']] = tool_call
+            if isinstance(message.content, str) and message.content.strip():
+                sections.append(message.content.strip())
+        elif isinstance(message, ToolMessage):
+            rendered = None
+            if render_partial and message.tool_call_id in calls:
+                rendered = render_partial(calls[message.tool_call_id], message)
+            if rendered is None:
+                content = str(message.content)
+                if len(content) > PARTIAL_RESULT_CHARS:
+                    content = content[:PARTIAL_RESULT_CHARS] + "\n... (truncated)"
+                rendered = content
+            sections.append(rendered)
+
+    header = f"⏱️ {reason}"
+    if not sections:
+        return f"{header} I could not gather any results yet - please try again."
+    return "\n\n".join([f"{header} Here is what I found so far:"] + sections)
+
+
+def run_agent_loop(agent, messages: List[BaseMessage], tools: Dict[str, ToolExecutor],
+                   max_steps: Optional[int] = None,
+                   deadline_seconds: Optional[float] = None,
+                   render_final: Optional[FinalRenderer] = None,
+                   render_partial: Optional[PartialRenderer] = None,
+                   summarizer=None) -> List[BaseMessage]:
+    """
+    Run an agent until it answers without tool calls or a bound is hit.
+
+    Args:
+        agent: Prompt | llm_with_tools chain taking {"messages": [...]}
+        messages: Conversation history to start from
+        tools: Mapping of tool name to executor
+        max_steps: Maximum number of model calls (default from settings)
+        deadline_seconds: Wall-clock budget for the loop (default from settings),
+                          capped by the remaining request budget
+        render_final: Optional local renderer that can answer straight from
+                      a round of tool results, ending the loop early
+        render_partial: Optional renderer for tool results in partial answers
+        summarizer: Optional chat model that writes the final answer from the
+                    gathered tool results when the step cap is reached
+
+    Returns:
+        New messages to append to the conversation; the last one is always
+        an AIMessage without pending tool calls
+    """
+    max_steps = max_steps or get_agent_max_steps()
+    deadline_seconds = deadline_seconds or get_agent_deadline_seconds()
+
+    # The loop gets its own budget, but never more than the request has left
+    request_remaining = remaining_seconds()
+    if request_remaining is not None:
+        deadline_seconds = min(deadline_seconds, request_remaining)
+    deadline = time.monotonic() + deadline_seconds
+    reason = f"I hit the {max(deadline_seconds, 0):.1f}s time limit for this request."
+
+    new_messages: List[BaseMessage] = []
+    for _ in range(max_steps):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        try:
+            response = call_with_timeout(
+                "Agent LLM call", remaining, agent.invoke, {"messages": messages + new_messages}
+            )
+        except UpstreamTimeout:
+            break
+        new_messages.append(response)
+
+        # No tool calls - the model has produced its final answer
+        if not getattr(response, 'tool_calls', None):
+            return new_messages
+
+        tool_messages = execute_tool_calls(response.tool_calls, tools)
+        new_messages.extend(tool_messages)
+
+        if render_final:
+            rendered = render_final(response.tool_calls, tool_messages)
+            if rendered:
+                new_messages.append(AIMessage(content=rendered))
+                return new_messages
+    else:
+        reason = f"I reached the limit of {max_steps} steps for this request."
+        remaining = deadline - time.monotonic()
+        if summarizer is not None and remaining > 0:
+            try:
+                summary = call_with_timeout(
+                    "Summarizer LLM call", remaining, summarizer.invoke,
+                    [SystemMessage(content=SUMMARIZER_PROMPT)] + messages + new_messages
+                )
+                new_messages.append(AIMessage(content=summary.content))
+                return new_messages
+            except Exception as e:
+                print(f"⚠️  Summarizer failed, returning partial answer: {e}")
+
+    print(f"⚠️  Agent loop stopped early: {reason}")
+    new_messages.append(AIMessage(content=build_partial_answer(new_messages, reason, render_partial)))
+    return new_messages
@@ -0,0 +1,290 @@
+"""
+Content-addressed store for large tool results.
+Flight, hotel and Tavily JSON is often byte-identical across sessions, and
+every checkpoint of a thread repeats its whole message history. Agents
+intern large ToolMessage contents here (sha256 → text, stored once and
+reference counted) and keep only a short reference in the graph state;
+the full text is rehydrated just before a prompt is built.
+"""
+
+import os
+import hashlib
+import threading
+from typing import Dict, List, Optional
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langchain_core.messages import BaseMessage, ToolMessage
+from config.settings import get_blob_store_settings
+
+# Key in ToolMessage.additional_kwargs pointing at the interned content
+BLOB_REF_KEY = 'blob_ref'
+
+
+class BlobStore:
+    """
+    Reference-counted, content-addressed text store.
+
+    Attributes:
+        path: Directory holding the blobs, or None to keep them in memory
+        min_bytes: Smallest content worth interning
+
+    Every interned message holds one reference; drop_thread releases them
+    when a conversation is dropped, and the blob goes with the last one.
+    Reference counts live in memory, so a disk store must not be shared
+    by several processes that release blobs independently (pool workers
+    each get their own subdirectory, see use_worker_store).
+    """
+
+    def __init__(self, path: Optional[str] = None, min_bytes: int = 1024):
+        self.path = path
+        self.min_bytes = min_bytes
+        self._blobs: Dict[str, str] = {}
+        self._refs: Dict[str, int] = {}
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        """Content address of a text."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def put(self, text: str) -> str:
+        """
+        Store a text (once) and take a reference to it.
+
+        Args:
+            text: Content to store
+
+        Returns:
+            The content key
+        """
+        key = self.key_for(text)
+        with self._lock:
+            if key not in self._refs:
+                if self.path:
+                    file = self._file(key)
+                    if not os.path.exists(file):
+                        os.makedirs(os.path.dirname(file), exist_ok=True)
+                        with open(file, 'w', encoding='utf-8') as f:
+                            f.write(text)
+                else:
+                    self._blobs[key] = text
+                self._refs[key] = 0
+                self._sizes[key] = len(text.encode('utf-8'))
+            self._refs[key] += 1
+        return key
+
+    def get(self, key: str) -> str:
+        """
+        Return the text stored under a key.
+
+        Raises:
+            KeyError: If the blob is not in the store
+        """
+        if not self.path:
+            return self._blobs[key]
+        try:
+            with open(self._file(key), encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def release(self, key: str):
+        """Drop one reference; the blob is deleted when none are left."""
+        with self._lock:
+            if key not in self._refs:
+                return
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return
+            del self._refs[key]
+            del self._sizes[key]
+            if self.path:
+                try:
+                    os.remove(self._file(key))
+                except FileNotFoundError:
+                    pass
+            else:
+                self._blobs.pop(key, None)
+
+    def stats(self) -> dict:
+        """Blob count, bytes stored, references, and bytes the references stand for."""
+        with self._lock:
+            return {
+                'blobs': len(self._refs),
+                'stored_bytes': sum(self._sizes.values()),
+                'references': sum(self._refs.values()),
+                'referenced_bytes': sum(self._sizes[key] * refs for key, refs in self._refs.items()),
+            }
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """The process-wide store configured by BLOB_STORE settings (None if off)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            settings = get_blob_store_settings()
+            if settings['backend'] == 'off':
+                return None
+            if settings['backend'] not in ('memory', 'disk'):
+                raise ValueError(f"Unknown BLOB_STORE '{settings['backend']}'. Expected memory, disk or off")
+            path = settings['path'] if settings['backend'] == 'disk' else None
+            _store = BlobStore(path, settings['min_bytes'])
+        return _store
+
+
+def set_blob_store(store: Optional[BlobStore]):
+    """Replace the process-wide store (None re-reads the settings on next use)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def use_worker_store(worker_id: int):
+    """
+    Give a pool worker a disk store of its own.
+
+    Each worker counts references only for its own conversations, so with
+    BLOB_STORE=disk it writes under BLOB_STORE_PATH/worker-<id>; a shared
+    directory would let one worker delete blobs another still points to.
+
+    Args:
+        worker_id: The worker's id in the pool
+    """
+    settings = get_blob_store_settings()
+    if settings['backend'] == 'disk':
+        set_blob_store(BlobStore(os.path.join(settings['path'], f"worker-{worker_id}"), settings['min_bytes']))
+
+
+def blob_ref(message: BaseMessage) -> Optional[str]:
+    """Key of an interned message's content, or None if it is inline."""
+    return (getattr(message, 'additional_kwargs', None) or {}).get(BLOB_REF_KEY)
+
+
+def intern_messages(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """
+    Replace large ToolMessage contents with references into the blob store.
+
+    Args:
+        messages: Messages about to be written to the graph state
+
+    Returns:
+        The same messages, with large tool results interned
+    """
+    store = get_blob_store()
+    if store is None:
+        return messages
+
+    interned = []
+    for message in messages:
+        content = message.content
+        if (isinstance(message, ToolMessage) and isinstance(content, str)
+                and not blob_ref(message) and len(content) >= store.min_bytes):
+            key = store.put(content)
+            message = message.model_copy(update={
+                'content': f"[interned tool result {key[:12]}, {len(content)} chars]",
+                'additional_kwargs': {**message.additional_kwargs, BLOB_REF_KEY: key},
+            })
+        interned.append(message)
+    return interned
+
+
+def rehydrate_messages(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """
+    Restore the full content of interned messages before building a prompt.
+
+    Args:
+        messages: Messages read from the graph state
+
+    Returns:
+        Messages with every interned tool result inlined again
+    """
+    if not any(blob_ref(message) for message in messages):
+        return messages
+
+    store = get_blob_store()
+    rehydrated = []
+    for message in messages:
+        key = blob_ref(message)
+        if key:
+            kwargs = {k: v for k, v in message.additional_kwargs.items() if k != BLOB_REF_KEY}
+            try:
+                content = store.get(key) if store else None
+            except KeyError:
+                content = None
+            if content is None:
+                content = "Tool result is no longer available."
+            message = message.model_copy(update={'content': content, 'additional_kwargs': kwargs})
+        rehydrated.append(message)
+    return rehydrated
+
+
+def release_messages(messages: List[BaseMessage]):
+    """Drop the store references held by interned messages."""
+    store = get_blob_store()
+    if store is None:
+        return
+    for message in messages:
+        key = blob_ref(message)
+        if key:
+            store.release(key)
+
+
+def drop_thread(checkpointer: BaseCheckpointSaver, thread_id: str):
+    """
+    Delete a conversation's checkpoints and release the blobs they reference.
+
+    Args:
+        checkpointer: The graph's checkpointer
+        thread_id: Conversation to drop
+    """
+    saved = checkpointer.get_tuple({"configurable": {"thread_id": thread_id}})
+    if saved is not None:
+        release_messages(saved.checkpoint["channel_values"].get("messages", []))
+    checkpointer.delete_thread(thread_id)
+
+
+def export_blobs(messages: List[BaseMessage], release: bool = False) -> Dict[str, str]:
+    """
+    Collect the blobs referenced by messages (e.g. to move a thread elsewhere).
+
+    Args:
+        messages: Messages from a checkpoint
+        release: Also drop this store's references to them
+
+    Returns:
+        Mapping of key to content
+    """
+    store = get_blob_store()
+    blobs = {}
+    if store is None:
+        return blobs
+    for message in messages:
+        key = blob_ref(message)
+        if key:
+            try:
+                blobs[key] = store.get(key)
+            except KeyError:
+                continue
+            if release:
+                store.release(key)
+    return blobs
+
+
+def import_blobs(messages: List[BaseMessage], blobs: Dict[str, str]):
+    """Store the blobs referenced by messages, taking one reference per message."""
+    store = get_blob_store()
+    if store is None:
+        return
+    for message in messages:
+        key = blob_ref(message)
+        if key and key in blobs:
+            store.put(blobs[key])
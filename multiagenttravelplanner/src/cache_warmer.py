@@ -0,0 +1,141 @@
+"""
+Background warmer for the search cache.
+Traffic is skewed toward a few hundred routes, cities and itinerary topics.
+The warmer periodically takes the most requested searches from recent
+usage and refreshes those that are missing or about to expire, within an
+hourly quota of upstream requests, on its own thread so requests never
+wait for it.
+"""
+
+import time
+import threading
+from datetime import date
+from typing import Optional
+from config.settings import get_search_cache_settings, get_today, get_tool_timeout_seconds
+from tools.upstream import call_with_timeout
+from src.search_cache import SearchCache
+
+# Request fields holding the travel date of a search
+DATE_FIELDS = ('outbound_date', 'check_in_date')
+
+
+class CacheWarmer:
+    """
+    Refreshes popular searches into a SearchCache ahead of expiry.
+
+    Attributes:
+        cache: The cache to warm
+        interval: Seconds between warming passes
+        top_n: Most requested searches considered per pass
+        refresh_ahead: Refresh entries expiring within this many seconds
+        quota_per_hour: Upstream requests this warmer may spend per hour (the
+                        quota is per process; see from_settings)
+    """
+
+    def __init__(self, cache: SearchCache, interval: float = 60.0, top_n: int = 200,
+                 refresh_ahead: float = 180.0, quota_per_hour: float = 100):
+        self.cache = cache
+        self.interval = interval
+        self.top_n = top_n
+        self.refresh_ahead = refresh_ahead
+        self.quota_per_hour = quota_per_hour
+        # Token bucket: the quota refills continuously, at most one hour's worth
+        self._tokens = float(quota_per_hour)
+        self._refilled_at = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshed = 0
+        self.failed = 0
+
+    @classmethod
+    def from_settings(cls, cache: SearchCache, share: float = 1.0) -> Optional['CacheWarmer']:
+        """
+        Create the warmer configured by CACHE_WARMER_* settings, or None if off.
+
+        Args:
+            cache: The cache to warm
+            share: Fraction of CACHE_WARMER_QUOTA_PER_HOUR this warmer may spend,
+                   when several processes run their own (see WorkerPool); None
+                   is returned for a share of 0
+        """
+        settings = get_search_cache_settings()
+        if not settings['warmer'] or share <= 0:
+            return None
+        return cls(cache, settings['interval'], settings['top_n'],
+                   settings['refresh_ahead'], settings['quota_per_hour'] * share)
+
+    def _take_token(self) -> bool:
+        """Spend one upstream request from the quota, if any is left."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.quota_per_hour),
+            self._tokens + (now - self._refilled_at) * self.quota_per_hour / 3600.0
+        )
+        self._refilled_at = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    @staticmethod
+    def _is_past(request: dict) -> bool:
+        """True for searches whose travel date has already passed."""
+        today = get_today()
+        for field in DATE_FIELDS:
+            value = request.get(field)
+            if value:
+                try:
+                    return date.fromisoformat(str(value)) < today
+                except ValueError:
+                    return False
+        return False
+
+    def run_once(self) -> int:
+        """
+        Run one warming pass.
+
+        Returns:
+            Number of searches refreshed
+        """
+        refreshed = 0
+        for key, _ in self.cache.popular(self.top_n):
+            expires_in = self.cache.expires_in(key)
+            if expires_in is not None and expires_in > self.refresh_ahead:
+                continue
+            usage = self.cache.usage(key)
+            if usage is None or self._is_past(usage.request):
+                continue
+            if not self._take_token():
+                break
+            try:
+                if call_with_timeout("Cache warmer refresh", get_tool_timeout_seconds(), self.cache.refresh, key):
+                    refreshed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️  Cache warmer could not refresh a {usage.kind} search: {e}")
+        self.refreshed += refreshed
+        return refreshed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                refreshed = self.run_once()
+                if refreshed:
+                    print(f"🔥 Cache warmer refreshed {refreshed} popular searches")
+            except Exception as e:
+                print(f"⚠️  Cache warmer pass failed: {e}")
+
+    def start(self):
+        """Start warming on a background daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+            self._thread.start()
+            print(f"🔥 Cache warmer started (every {self.interval:.0f}s, top {self.top_n}, "
+                  f"{self.quota_per_hour} requests/hour)")
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
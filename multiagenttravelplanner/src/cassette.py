@@ -0,0 +1,321 @@
+"""
+Record/replay cassette layer for OpenAI, SerpAPI and Tavily traffic.
+In record mode every upstream request/response pair made by the graph is
+captured into compact gzip JSONL, one file per process so that worker
+processes never append to the same file. In replay mode responses are
+served locally by request fingerprint, optionally with the recorded (or
+a fixed) latency injected, so a captured day of traffic can be replayed
+against new builds of the graph without calling the real services.
+"""
+
+import os
+import re
+import glob
+import gzip
+import json
+import time
+import atexit
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from config.settings import get_cassette_settings
+from tools import upstream
+
+CASSETTE_MODES = ('record', 'replay', 'auto')
+
+# Placeholder keys so clients can be constructed when replaying without credentials
+_REPLAY_PLACEHOLDER_KEYS = ('OPENAI_API_KEY', 'TAVILY_API_KEY', 'SERPAPI_API_KEY')
+
+
+# Prompt text derived from the current date, left out of LLM fingerprints so a
+# cassette still replays on later days: the agents' "CURRENT DATE: June 1, 2026"
+# line (ISO dates too) and example dates such as "(e.g., 2026-06-15)"
+_DATE = r'(?:\d{4}-\d{2}-\d{2}|[A-Z][a-z]+ \d{1,2}, \d{4})'
+_PROMPT_DATES = (
+    (re.compile(rf'^(CURRENT DATE:\s*){_DATE}[ \t]*$', re.MULTILINE), r'\1<today>'),
+    (re.compile(rf'(\(e\.g\.,?\s*){_DATE}\)'), r'\1<date>)'),
+)
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when no recorded response matches a request."""
+
+
+def fingerprint(kind: str, request: Any) -> str:
+    """
+    Stable fingerprint of an upstream request.
+
+    Args:
+        kind: 'llm', 'serpapi' or 'tavily'
+        request: JSON-serializable request description
+
+    Returns:
+        Hex SHA-256 of the canonical JSON form
+    """
+    canonical = json.dumps([kind, request], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _split_cassette_path(path: str):
+    """(root, extension) of a cassette path, treating '.jsonl.gz' as one extension."""
+    if path.endswith('.jsonl.gz'):
+        return path[:-len('.jsonl.gz')], '.jsonl.gz'
+    return os.path.splitext(path)
+
+
+def shard_path(path: str, pid: int) -> str:
+    """
+    Recording file of one process: 'cassettes/traffic.jsonl.gz' → 'cassettes/traffic.<pid>.jsonl.gz'.
+
+    Args:
+        path: The cassette path (CASSETTE_PATH)
+        pid: Process id of the recording process
+    """
+    root, ext = _split_cassette_path(path)
+    return f"{root}.{pid}{ext}"
+
+
+def cassette_files(path: str) -> List[str]:
+    """The cassette file itself (if present) and every per-process recording next to it."""
+    root, ext = _split_cassette_path(path)
+    shards = [
+        file for file in glob.glob(f"{glob.escape(root)}.*{glob.escape(ext)}")
+        if file[len(root) + 1:len(file) - len(ext)].isdigit()
+    ]
+    return ([path] if os.path.exists(path) else []) + sorted(shards)
+
+
+def _canonical_message(message: BaseMessage) -> dict:
+    """Message fields that matter for a fingerprint (run ids are random, so excluded)."""
+    content = message.content
+    if isinstance(content, str):
+        for pattern, placeholder in _PROMPT_DATES:
+            content = pattern.sub(placeholder, content)
+    canonical = {'type': message.type, 'content': content}
+    for tool_call in getattr(message, 'tool_calls', None) or []:
+        canonical.setdefault('tool_calls', []).append(
+            {'name': tool_call['name'], 'args': tool_call['args'], 'id': tool_call.get('id')}
+        )
+    if getattr(message, 'tool_call_id', None):
+        canonical['tool_call_id'] = message.tool_call_id
+    return canonical
+
+
+class Cassette:
+    """
+    On-disk store of upstream request/response pairs.
+
+    Attributes:
+        path: gzip JSONL cassette; each process records to its own file next
+              to it (see shard_path) and replay reads all of them
+        mode: 'record' (call upstream, save), 'replay' (serve recordings only)
+              or 'auto' (serve recordings, record misses)
+        latency: None to replay as fast as possible, 'recorded' to inject the
+                 recorded latency, or a fixed number of seconds per call
+        speedup: Divisor applied to recorded latency (e.g. 10 = 10x faster)
+    """
+
+    def __init__(self, path: str, mode: str = 'replay', latency=None, speedup: float = 1.0):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Expected one of: {', '.join(CASSETTE_MODES)}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.speedup = max(speedup, 1e-9)
+        self._entries: Dict[str, List[dict]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._writer = None
+        self.stats = defaultdict(int)
+
+        files = cassette_files(path)
+        if mode in ('replay', 'auto') and files:
+            self._load(files)
+        elif mode == 'replay':
+            raise FileNotFoundError(f"Cassette file not found: {path}")
+
+    @classmethod
+    def from_settings(cls) -> Optional['Cassette']:
+        """Create the cassette configured with CASSETTE_* settings, or None if off."""
+        settings = get_cassette_settings()
+        if settings['mode'] == 'off':
+            return None
+        return cls(settings['path'], settings['mode'], settings['latency'], settings['speedup'])
+
+    def _load(self, files: List[str]):
+        """Read all recordings from disk, merging the per-process files."""
+        for file in files:
+            with gzip.open(file, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry['fingerprint']].append(entry)
+        print(f"📼 Loaded {sum(len(v) for v in self._entries.values())} recorded calls "
+              f"from {len(files)} file(s) at {self.path}")
+
+    def _save(self, entry: dict):
+        """Append one recording to this process's file (and memory, for 'auto' mode)."""
+        with self._lock:
+            if self._writer is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._writer = gzip.open(shard_path(self.path, os.getpid()), 'at', encoding='utf-8')
+                atexit.register(self.close)
+            self._writer.write(json.dumps(entry, separators=(',', ':'), default=str) + '\n')
+            self._entries[entry['fingerprint']].append(entry)
+
+    def close(self):
+        """Flush and close the recording file."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _lookup(self, key: str) -> Optional[dict]:
+        """Next recording for a fingerprint (repeated requests cycle through recordings)."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            entry = entries[self._cursor[key] % len(entries)]
+            self._cursor[key] += 1
+            return entry
+
+    def _inject_latency(self, entry: dict):
+        """Sleep to simulate upstream latency in replay."""
+        if self.latency == 'recorded':
+            delay = entry.get('latency', 0.0) / self.speedup
+        elif isinstance(self.latency, (int, float)):
+            delay = self.latency
+        else:
+            return
+        if delay > 0:
+            time.sleep(delay)
+
+    def call(self, kind: str, request: Any, live_call):
+        """
+        Serve or record one upstream call.
+
+        Args:
+            kind: 'llm', 'serpapi' or 'tavily'
+            request: JSON-serializable request description used for the fingerprint
+            live_call: Zero-argument function making the real call; must return
+                       a JSON-serializable response
+
+        Returns:
+            The recorded or live response
+
+        Raises:
+            CassetteMiss: In replay mode when nothing was recorded for the request
+        """
+        key = fingerprint(kind, request)
+        if self.mode in ('replay', 'auto'):
+            entry = self._lookup(key)
+            if entry is not None:
+                self.stats[f'{kind}_hits'] += 1
+                self._inject_latency(entry)
+                return entry['response']
+            self.stats[f'{kind}_misses'] += 1
+            if self.mode == 'replay':
+                raise CassetteMiss(f"No recorded {kind} response for request {key[:12]}")
+
+        start = time.perf_counter()
+        response = live_call()
+        self._save({
+            'kind': kind,
+            'fingerprint': key,
+            'latency': round(time.perf_counter() - start, 4),
+            'response': response,
+        })
+        self.stats[f'{kind}_recorded'] += 1
+        return response
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Chat model wrapper that records or replays calls through a Cassette.
+
+    Attributes:
+        inner: The real chat model (e.g. ChatOpenAI)
+        cassette: Where calls are recorded or served from
+    """
+
+    inner: BaseChatModel
+    cassette: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return 'cassette'
+
+    def bind_tools(self, tools, **kwargs):
+        """Bind tools in OpenAI format so they are part of the fingerprint."""
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        request = {
+            'model': getattr(self.inner, 'model_name', type(self.inner).__name__),
+            'messages': [_canonical_message(m) for m in messages],
+            'stop': stop,
+            'kwargs': kwargs,
+        }
+
+        def live_call():
+            message = self.inner.invoke(messages, stop=stop, **kwargs)
+            return message_to_dict(message)
+
+        response = self.cassette.call('llm', request, live_call)
+        message = messages_from_dict([response])[0]
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def install_cassette(cassette: Cassette) -> None:
+    """
+    Route SerpAPI and Tavily traffic through a cassette.
+
+    Call this before creating the LLM clients; in replay mode it also sets
+    placeholder API keys so clients can be constructed without credentials.
+
+    Args:
+        cassette: The cassette to record into or replay from
+    """
+    if cassette.mode == 'replay':
+        # Recorded responses are served locally; clients only need a key to construct
+        for key in _REPLAY_PLACEHOLDER_KEYS:
+            os.environ.setdefault(key, 'cassette-replay')
+
+    serpapi_transport = upstream.get_transport('serpapi')
+    tavily_transport = upstream.get_transport('tavily')
+
+    def serpapi_via_cassette(params):
+        request = {k: v for k, v in params.items() if k != 'api_key'}
+        return cassette.call('serpapi', request, lambda: serpapi_transport(params))
+
+    def tavily_via_cassette(tool, query):
+        request = {'query': query, 'max_results': getattr(tool, 'max_results', None)}
+        return cassette.call('tavily', request, lambda: tavily_transport(tool, query))
+
+    upstream.set_transport('serpapi', serpapi_via_cassette)
+    upstream.set_transport('tavily', tavily_via_cassette)
+    print(f"📼 Cassette {cassette.mode} mode: {cassette.path}")
+
+
+def wrap_llms(cassette: Cassette, llms: Dict[str, BaseChatModel]) -> Dict[str, BaseChatModel]:
+    """
+    Route LLM traffic through a cassette.
+
+    Args:
+        cassette: The cassette to record into or replay from
+        llms: Mapping of role to chat model (from create_role_llms)
+
+    Returns:
+        Mapping of role to cassette-wrapped chat model
+    """
+    wrapped = {}
+    for role, llm in llms.items():
+        if id(llm) not in wrapped:
+            wrapped[id(llm)] = CassetteChatModel(inner=llm, cassette=cassette)
+    return {role: wrapped[id(llm)] for role, llm in llms.items()}
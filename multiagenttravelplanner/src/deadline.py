@@ -0,0 +1,78 @@
+"""
+Request-level latency budgets for the multi-agent travel planner.
+A deadline is attached to the run config when the graph is invoked and
+made visible to every node, so the router, agents, LLM calls and tools
+each receive only the budget that remains.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Optional
+from langchain_core.runnables import RunnableConfig
+from config.settings import get_request_budget_seconds
+from tools.upstream import request_deadline
+from src.profiler import profile_node
+
+# Key under config["configurable"] holding the absolute deadline (time.time())
+DEADLINE_KEY = "deadline"
+
+
+def with_deadline(config: dict, budget_seconds: Optional[float] = None) -> dict:
+    """
+    Return a copy of a run config with a request deadline attached.
+
+    Call this once per request, right before travel_planner.invoke().
+
+    Args:
+        config: Run config, e.g. {"configurable": {"thread_id": "abc"}}
+        budget_seconds: Latency budget (default: REQUEST_BUDGET_SECONDS)
+
+    Returns:
+        New config with configurable["deadline"] set
+    """
+    budget = budget_seconds if budget_seconds is not None else get_request_budget_seconds()
+    configurable = dict(config.get("configurable", {}))
+    configurable[DEADLINE_KEY] = time.time() + budget
+    return {**config, "configurable": configurable}
+
+
+@contextmanager
+def deadline_scope(config: Optional[RunnableConfig]):
+    """
+    Make the request deadline from config visible to upstream calls.
+
+    If the config carries no deadline (the graph was invoked without
+    with_deadline), a fresh default budget is used for this scope.
+
+    Args:
+        config: The run config passed to the node
+    """
+    deadline = ((config or {}).get("configurable") or {}).get(DEADLINE_KEY)
+    if deadline is None:
+        deadline = time.time() + get_request_budget_seconds()
+    token = request_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        request_deadline.reset(token)
+
+
+def deadline_node(func, *args):
+    """
+    Wrap a node function so it runs inside the request's deadline scope
+    (and is attributed to its own name when the turn is profiled).
+
+    Args:
+        func: Node function called as func(state, *args)
+        *args: Extra arguments (router function, llm, ...)
+
+    Returns:
+        A LangGraph node taking (state, config)
+    """
+    def node(state, config: RunnableConfig):
+        # Profiled turns attribute this node's samples to it (see src/profiler.py)
+        with deadline_scope(config), profile_node(func.__name__):
+            return func(state, *args)
+
+    node.__name__ = func.__name__
+    return node
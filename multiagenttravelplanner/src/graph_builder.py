@@ -6,14 +6,16 @@ all agents (router, flight, hotel, itinerary) with memory.
 
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import InMemorySaver
-from langchain_openai import ChatOpenAI
 from src.state import TravelPlannerState
 from src.router import create_router, router_node, route_to_agent
+from src.deadline import deadline_node
+from src.profiler import ProfiledGraph
+from src.models import resolve_role_llms
 from agents.itinerary_agent import itinerary_agent_node
 from agents.flight_agent import flight_agent_node
 from agents.hotel_agent import hotel_agent_node
 
-def build_travel_planner_graph(llm: ChatOpenAI):
+def build_travel_planner_graph(llms, router_batcher=None):
     """
     Build the complete travel planning multi-agent graph.
     
@@ -26,7 +28,11 @@ def build_travel_planner_graph(llm: ChatOpenAI):
     across multiple turns.
     
     Args:
-        llm: The language model instance to use for all agents
+        llms: Either one language model used by every node, or a mapping
+              of role (router, flight, hotel, itinerary, summarizer) to
+              model, as returned by src.models.create_role_llms
+        router_batcher: Optional RouterBatcher shared by threads invoking
+              this graph concurrently, so their routing is done in batches
         
     Returns:
         Compiled LangGraph application with checkpointing
@@ -34,32 +40,36 @@ def build_travel_planner_graph(llm: ChatOpenAI):
     
     print("🔨 Building multi-agent travel planner graph...")
     
+    # Pick the model client for each role
+    llms = resolve_role_llms(llms)
+    
     # Create the router function
-    router_func = create_router(llm)
+    router_func = create_router(llms['router'], router_batcher)
     
     # Initialize the StateGraph with our state schema
     workflow = StateGraph(TravelPlannerState)
     
     # Add the router node
+    # Each node runs inside the request's deadline scope (see src/deadline.py)
     workflow.add_node(
         "router",
-        lambda state: router_node(state, router_func)
+        deadline_node(router_node, router_func)
     )
     
-    # Add agent nodes - we need to pass the llm to each
+    # Add agent nodes - each gets its own model tier plus the summarizer
     workflow.add_node(
         "flight_agent",
-        lambda state: flight_agent_node(state, llm)
+        deadline_node(flight_agent_node, llms['flight'], llms['summarizer'])
     )
     
     workflow.add_node(
         "hotel_agent",
-        lambda state: hotel_agent_node(state, llm)
+        deadline_node(hotel_agent_node, llms['hotel'], llms['summarizer'])
     )
     
     workflow.add_node(
         "itinerary_agent",
-        lambda state: itinerary_agent_node(state, llm)
+        deadline_node(itinerary_agent_node, llms['itinerary'], llms['summarizer'])
     )
     
     # Set the entry point - always start with router
@@ -84,8 +94,8 @@ def build_travel_planner_graph(llm: ChatOpenAI):
     # Create in-memory checkpointer for conversation history
     checkpointer = InMemorySaver()
     
-    # Compile the graph with checkpointing
-    travel_planner = workflow.compile(checkpointer=checkpointer)
+    # Compile the graph with checkpointing; invoke/stream can be profiled on demand
+    travel_planner = ProfiledGraph(workflow.compile(checkpointer=checkpointer))
     
     print("✅ Travel planning graph built successfully!")
     
@@ -0,0 +1,234 @@
+"""
+Hedged LLM requests to cut tail latency.
+A hedged call that has not answered within an adaptive threshold (a
+recent latency quantile, e.g. p95, tracked per role) sends one duplicate
+request and returns whichever answer arrives first. Hedges are capped at
+a percentage of traffic by a token budget, so a slow provider does not
+get twice the load exactly when it is struggling.
+"""
+
+import time
+import atexit
+import threading
+import contextvars
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from config.settings import get_hedging_settings
+
+# Threads for primary and hedge requests (losing requests keep a thread
+# until the client's own timeout ends them)
+MAX_HEDGE_THREADS = 64
+
+
+class HedgeBudget:
+    """
+    Token budget limiting hedges to a fraction of calls.
+
+    Every call earns `fraction` of a token (up to `burst` tokens); a hedge
+    spends one.
+    """
+
+    def __init__(self, fraction: float, burst: float = 5.0):
+        self.fraction = fraction
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def earn(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.fraction)
+
+    def take(self) -> bool:
+        """Spend a token for one hedge, if any is left."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class Hedger:
+    """
+    Runs calls with an adaptive hedge and keeps per-role latency and hedge metrics.
+
+    Attributes:
+        quantile: Latency quantile used as the hedge threshold (0.95 = p95)
+        min_samples: Calls observed for a role before it is hedged
+        min_delay: Lower bound for the threshold, in seconds
+        window: Recent latencies kept per role
+        budget: HedgeBudget shared by all roles
+    """
+
+    def __init__(self, quantile: float = 0.95, budget_fraction: float = 0.05, min_samples: int = 20,
+                 min_delay: float = 0.1, window: int = 200):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self.budget = HedgeBudget(budget_fraction)
+        self._latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_HEDGE_THREADS, thread_name_prefix="llm-hedge")
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    @classmethod
+    def from_settings(cls) -> Optional['Hedger']:
+        """Create the hedger configured by LLM_HEDGE_* settings, or None if hedging is off."""
+        settings = get_hedging_settings()
+        if not settings['enabled']:
+            return None
+        hedger = cls(settings['quantile'], settings['budget_fraction'], settings['min_samples'],
+                     settings['min_delay'], settings['window'])
+        atexit.register(hedger.report)
+        print(f"🪁 LLM hedging enabled for {', '.join(settings['roles'])} "
+              f"(p{settings['quantile'] * 100:g} threshold, budget {settings['budget_fraction']:.0%} of calls)")
+        return hedger
+
+    def threshold(self, role: str) -> Optional[float]:
+        """Seconds to wait before hedging a role's call, or None while too few calls were seen."""
+        with self._lock:
+            latencies = sorted(self._latencies[role])
+        if len(latencies) < self.min_samples:
+            return None
+        index = min(len(latencies) - 1, int(self.quantile * len(latencies)))
+        return max(self.min_delay, latencies[index])
+
+    def _record(self, role: str, latency: float):
+        with self._lock:
+            self._latencies[role].append(latency)
+
+    def _submit(self, fn: Callable[[], Any]):
+        """Start fn on a hedge thread; returns (future, start time)."""
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, fn), time.monotonic()
+
+    def call(self, role: str, fn: Callable[[], Any]):
+        """
+        Run fn, sending one duplicate if it is slower than the role's threshold.
+
+        Args:
+            role: Model role whose latency history sets the threshold
+            fn: Zero-argument function making the request (called at most twice)
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The request's error, if every attempt failed
+        """
+        stats = self.stats[role]
+        stats['calls'] += 1
+        self.budget.earn()
+        threshold = self.threshold(role)
+        primary, started = self._submit(fn)
+
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self.budget.take():
+            if not done:
+                stats['hedges_denied'] += 1
+            result = primary.result()
+            self._record(role, time.monotonic() - started)
+            return result
+
+        stats['hedges'] += 1
+        hedge, _ = self._submit(fn)
+        attempts = {primary: 'primary_wins', hedge: 'hedge_wins'}
+        pending = set(attempts)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                stats[attempts[future]] += 1
+                # Record the latency from the first send: a winning hedge's own time
+                # would hide the slow primary and pull the threshold down
+                self._record(role, time.monotonic() - started)
+                # The other request cannot be interrupted mid-flight; its answer is discarded
+                for other in pending:
+                    other.cancel()
+                return future.result()
+        stats['errors'] += 1
+        raise error
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Hedge metrics per role.
+
+        Returns:
+            role -> calls, hedges, hedges_denied, hedge_wins, primary_wins,
+            hedge_rate (hedges / calls), hedge_win_rate (hedge_wins / hedges)
+            and threshold_ms (current hedge threshold, None while warming up)
+        """
+        metrics = {}
+        for role, stats in list(self.stats.items()):
+            threshold = self.threshold(role)
+            metrics[role] = {
+                **{name: stats.get(name, 0) for name in ('calls', 'hedges', 'hedges_denied', 'hedge_wins', 'primary_wins')},
+                'hedge_rate': round(stats['hedges'] / stats['calls'], 4) if stats['calls'] else 0.0,
+                'hedge_win_rate': round(stats['hedge_wins'] / stats['hedges'], 4) if stats['hedges'] else 0.0,
+                'threshold_ms': None if threshold is None else round(threshold * 1000, 1),
+            }
+        return metrics
+
+    def report(self):
+        """Print the hedge metrics of every role that made calls."""
+        for role, metrics in self.metrics().items():
+            print(f"🪁 Hedging {role}: {metrics['calls']} calls, {metrics['hedges']} hedged "
+                  f"({metrics['hedge_rate']:.1%}), hedge won {metrics['hedge_wins']}, "
+                  f"denied by budget {metrics['hedges_denied']}, threshold {metrics['threshold_ms']} ms")
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model wrapper whose calls are hedged by a Hedger.
+
+    Attributes:
+        inner: The real chat model (e.g. ChatOpenAI)
+        hedger: Shared Hedger
+        role: Role whose latency history sets the threshold
+    """
+
+    inner: BaseChatModel
+    hedger: Any
+    role: str
+
+    @property
+    def _llm_type(self) -> str:
+        return 'hedged'
+
+    def bind_tools(self, tools, **kwargs):
+        """Bind tools in OpenAI format; they are passed to the inner model on every call."""
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self.hedger.call(self.role, lambda: self.inner.invoke(messages, stop=stop, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def wrap_hedged(hedger: Hedger, llms: Dict[str, BaseChatModel], roles=None) -> Dict[str, BaseChatModel]:
+    """
+    Hedge the model calls of some roles.
+
+    Wrap the live clients before the cassette (wrap_llms), so replayed
+    calls are never hedged and recordings hold one entry per call.
+
+    Args:
+        hedger: The hedger to run calls through
+        llms: Mapping of role to chat model (from create_role_llms)
+        roles: Roles to hedge (default: LLM_HEDGE_ROLES)
+
+    Returns:
+        Mapping of role to chat model, hedged for the selected roles
+    """
+    roles = get_hedging_settings()['roles'] if roles is None else roles
+    return {
+        role: HedgedChatModel(inner=llm, hedger=hedger, role=role) if role in roles else llm
+        for role, llm in llms.items()
+    }
@@ -0,0 +1,79 @@
+"""
+Model clients for the multi-agent travel planner.
+This module creates one chat model client per role (router, flight,
+hotel, itinerary, summarizer) from the tiers configured in
+config/settings.py, so cheap steps do not pay flagship-model latency.
+"""
+
+from typing import Callable, Dict
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+from config.settings import MODEL_ROLES, get_model_config
+
+
+def create_llm(model_config: dict) -> ChatOpenAI:
+    """
+    Create a ChatOpenAI client from a role's model configuration.
+
+    Args:
+        model_config: Dict with model, temperature, max_tokens and timeout
+
+    Returns:
+        Configured ChatOpenAI instance
+    """
+    return ChatOpenAI(
+        model=model_config['model'],
+        temperature=model_config['temperature'],
+        max_tokens=model_config['max_tokens'],
+        timeout=model_config['timeout']
+    )
+
+
+def create_role_llms(factory: Callable[[dict], BaseChatModel] = create_llm) -> Dict[str, BaseChatModel]:
+    """
+    Create a model client for every role.
+
+    Roles with identical configuration share one client.
+
+    Args:
+        factory: Builds a chat model from a role's model configuration
+                 (benchmarks pass a fake-LLM factory here)
+
+    Returns:
+        Mapping of role name to chat model
+    """
+    clients = {}
+    llms = {}
+    for role in MODEL_ROLES:
+        model_config = get_model_config(role)
+        key = tuple(sorted(model_config.items()))
+        if key not in clients:
+            clients[key] = factory(model_config)
+        llms[role] = clients[key]
+        print(f"🤖 {role:<10} → {model_config['model']} "
+              f"(temperature={model_config['temperature']}, max_tokens={model_config['max_tokens']}, "
+              f"timeout={model_config['timeout']}s)")
+    return llms
+
+
+def resolve_role_llms(llms) -> Dict[str, BaseChatModel]:
+    """
+    Normalize the llms argument of build_travel_planner_graph.
+
+    Args:
+        llms: Either a single chat model used for every role, or a
+              mapping of role name to chat model
+
+    Returns:
+        Mapping with a chat model for every role
+
+    Raises:
+        ValueError: If a mapping is missing one of the roles
+    """
+    if not isinstance(llms, dict):
+        return {role: llms for role in MODEL_ROLES}
+
+    missing = [role for role in MODEL_ROLES if role not in llms]
+    if missing:
+        raise ValueError(f"Missing model clients for roles: {', '.join(missing)}")
+    return llms
@@ -0,0 +1,309 @@
+"""
+On-demand sampling profiler for graph turns.
+When a turn is profiled, a sampler thread records the Python stack of every
+thread working on it every few milliseconds. Each sample is attributed to
+the graph node being run (or "graph" for the framework work in between:
+state merging, checkpointing). Wall-clock and CPU profiles are written per
+turn as collapsed stacks that flamegraph.pl, speedscope and similar tools
+read directly.
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import threading
+import contextvars
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from config.settings import get_profile_settings
+from tools import upstream
+
+# Key under config["configurable"] that forces (True) or skips (False) profiling
+PROFILE_KEY = "profile"
+
+# Label for samples taken outside any node
+GRAPH_LABEL = "graph"
+
+# Deepest stack recorded per sample
+MAX_STACK_DEPTH = 200
+
+_active_session: contextvars.ContextVar = contextvars.ContextVar("profile_session", default=None)
+_current_node: contextvars.ContextVar = contextvars.ContextVar("profile_node", default=GRAPH_LABEL)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> str:
+    """Collapse a frame and its callers into 'root;...;leaf'."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _thread_cpu_clock(ident: int) -> Optional[int]:
+    """CPU-time clock of another thread, where the platform provides one."""
+    try:
+        return time.pthread_getcpuclockid(ident)
+    except (AttributeError, OSError, OverflowError):
+        return None
+
+
+class ProfileSession:
+    """
+    Samples the threads working on one turn.
+
+    Attributes:
+        name: Label used in the output file names
+        interval: Seconds between samples
+        wall: Collapsed stack -> number of samples (wall-clock time)
+        cpu: Collapsed stack -> CPU microseconds
+        node_wall: Node label -> sampled wall-clock seconds
+        node_cpu: Node label -> CPU seconds
+    """
+
+    def __init__(self, name: str, interval: float = 0.005):
+        self.name = name
+        self.interval = interval
+        self.wall: Counter = Counter()
+        self.cpu: Counter = Counter()
+        self.node_wall: Dict[str, float] = defaultdict(float)
+        self.node_cpu: Dict[str, float] = defaultdict(float)
+        self.samples = 0
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._threads: Dict[int, str] = {}
+        self._cpu_clocks: Dict[int, Tuple[Optional[int], float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def attach(self, label: str) -> Optional[str]:
+        """Attribute the current thread's samples to label; returns the previous label."""
+        ident = threading.get_ident()
+        with self._lock:
+            previous = self._threads.get(ident)
+            self._threads[ident] = label
+            if ident not in self._cpu_clocks:
+                clock = _thread_cpu_clock(ident)
+                self._cpu_clocks[ident] = (clock, time.clock_gettime(clock) if clock is not None else 0.0)
+        return previous
+
+    def detach(self, previous: Optional[str]):
+        """Undo attach(), restoring the previous label (or stop sampling the thread)."""
+        ident = threading.get_ident()
+        with self._lock:
+            if previous is None:
+                self._threads.pop(ident, None)
+                self._cpu_clocks.pop(ident, None)
+            else:
+                self._threads[ident] = previous
+
+    def _sample(self):
+        frames = sys._current_frames()
+        with self._lock:
+            threads = list(self._threads.items())
+        for ident, label in threads:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = f"{label};{collapse_stack(frame)}"
+            self.wall[stack] += 1
+            self.node_wall[label] += self.interval
+
+            clock, last = self._cpu_clocks.get(ident, (None, 0.0))
+            if clock is None:
+                continue
+            try:
+                now = time.clock_gettime(clock)
+            except OSError:
+                continue
+            with self._lock:
+                if ident in self._cpu_clocks:
+                    self._cpu_clocks[ident] = (clock, now)
+            used = now - last
+            if used > 0:
+                self.cpu[stack] += int(used * 1_000_000)
+                self.node_cpu[label] += used
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        """Start sampling on a background thread."""
+        self.started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.name}", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def write(self, directory: str) -> Dict[str, str]:
+        """
+        Write the wall-clock and CPU profiles as collapsed stacks.
+
+        Args:
+            directory: Output directory (created if missing)
+
+        Returns:
+            Mapping of profile type ('wall', 'cpu') to file path
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for kind, counts in (('wall', self.wall), ('cpu', self.cpu)):
+            if not counts:
+                continue
+            path = os.path.join(directory, f"{self.name}.{kind}.collapsed")
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in counts.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths[kind] = path
+        return paths
+
+    def summary(self) -> str:
+        """One line per node: sampled wall-clock and CPU seconds (summed over its threads)."""
+        lines = [f"⏱️  Profile {self.name}: {self.duration:.2f}s wall, {self.samples} samples "
+                 f"(per-node times add up across threads)"]
+        for label, seconds in sorted(self.node_wall.items(), key=lambda item: -item[1]):
+            lines.append(f"   {label:<18} wall {seconds:6.2f}s   cpu {self.node_cpu.get(label, 0.0):6.2f}s")
+        return "\n".join(lines)
+
+
+class _ThreadObserver:
+    """Attributes upstream worker threads to the node that started the call."""
+
+    def __init__(self, session: ProfileSession):
+        self.session = session
+
+    def enter(self):
+        return self.session.attach(_current_node.get())
+
+    def exit(self, previous):
+        self.session.detach(previous)
+
+
+@contextmanager
+def profile_node(label: str):
+    """
+    Attribute the current thread to a graph node while a turn is profiled.
+
+    A no-op when the current turn is not being profiled.
+
+    Args:
+        label: Node name
+    """
+    session = _active_session.get()
+    if session is None:
+        yield
+        return
+    token = _current_node.set(label)
+    previous = session.attach(label)
+    try:
+        yield
+    finally:
+        session.detach(previous)
+        _current_node.reset(token)
+
+
+def should_profile(config: Optional[dict]) -> bool:
+    """
+    Decide whether to profile a turn.
+
+    A per-request flag (config["configurable"]["profile"]) wins; otherwise
+    PROFILE, the trigger file and PROFILE_SAMPLE_RATE are checked.
+    """
+    requested = ((config or {}).get("configurable") or {}).get(PROFILE_KEY)
+    if requested is not None:
+        return bool(requested)
+    settings = get_profile_settings()
+    if settings['enabled']:
+        return True
+    sample_rate = settings['sample_rate']
+    if os.path.exists(settings['trigger_file']):
+        try:
+            with open(settings['trigger_file'], encoding='utf-8') as f:
+                sample_rate = float(f.read().strip() or 1.0)
+        except (OSError, ValueError):
+            sample_rate = 1.0
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+_turns = 0
+_turns_lock = threading.Lock()
+
+
+def _session_name(config: Optional[dict]) -> str:
+    global _turns
+    with _turns_lock:
+        _turns += 1
+        turn = _turns
+    thread_id = str(((config or {}).get("configurable") or {}).get("thread_id", "default"))
+    safe_thread_id = re.sub(r'[^A-Za-z0-9_.-]', '_', thread_id)[:40]
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{turn}-{safe_thread_id}"
+
+
+@contextmanager
+def profile_turn(config: Optional[dict]):
+    """
+    Profile one turn if should_profile(config) says so.
+
+    Yields:
+        The ProfileSession, or None when the turn is not profiled
+    """
+    if not should_profile(config):
+        yield None
+        return
+
+    settings = get_profile_settings()
+    session = ProfileSession(_session_name(config), settings['interval'])
+    session_token = _active_session.set(session)
+    observer_token = upstream.thread_observer.set(_ThreadObserver(session))
+    previous = session.attach(GRAPH_LABEL)
+    session.start()
+    try:
+        yield session
+    finally:
+        session.stop()
+        session.detach(previous)
+        upstream.thread_observer.reset(observer_token)
+        _active_session.reset(session_token)
+        paths = session.write(settings['dir'])
+        print(session.summary())
+        if paths:
+            print(f"   collapsed stacks: {', '.join(paths.values())}")
+
+
+class ProfiledGraph:
+    """
+    Compiled graph wrapper whose invoke/stream profile turns on demand.
+
+    Every other attribute (checkpointer, get_state, get_graph, ...) is
+    passed through to the wrapped graph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def invoke(self, input, config: Optional[dict] = None, **kwargs):
+        with profile_turn(config):
+            return self.graph.invoke(input, config, **kwargs)
+
+    def stream(self, input, config: Optional[dict] = None, **kwargs):
+        with profile_turn(config):
+            yield from self.graph.stream(input, config, **kwargs)
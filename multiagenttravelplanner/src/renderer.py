@@ -0,0 +1,183 @@
+"""
+Result renderer for the multi-agent travel planner.
+This module turns the structured JSON returned by the flight and hotel
+search tools into readable answers with plain templates, so that simple
+searches do not need a second LLM call just to format the results.
+"""
+
+import json
+import re
+from typing import List, Optional
+
+# Phrases that mean the user wants a judgment call (comparison, preference
+# filtering, recommendation) rather than a plain list of search results.
+JUDGMENT_PATTERNS = [
+    r"\bcompar", r"\bbest\b", r"\bcheapest\b", r"\bfastest\b", r"\bshortest\b",
+    r"\brecommend", r"\bshould\b", r"\bprefer", r"\bwhich\b", r"\bbetter\b",
+    r"\bworth\b", r"\bvs\.?\b", r"\bversus\b", r"\bdirect\b", r"\bnon-?stop\b",
+    r"\bonly\b", r"\bunder\b", r"\bbelow\b", r"\bless than\b", r"\bcheaper\b",
+    r"\bbudget\b", r"\bquiet\b", r"\bnear\b", r"\bclose to\b", r"\bfamily\b",
+    r"\bkids\b", r"\bwhy\b", r"\bexplain\b", r"\badvice\b", r"\btips?\b",
+]
+_JUDGMENT_RE = re.compile("|".join(JUDGMENT_PATTERNS), re.IGNORECASE)
+
+
+def needs_llm_synthesis(user_query: Optional[str]) -> bool:
+    """
+    Decide whether a request needs the LLM to reason over the results.
+
+    Args:
+        user_query: The user's latest message
+
+    Returns:
+        True if the query asks for comparison, filtering or advice,
+        False if a plain rendered list answers it
+    """
+    if not user_query:
+        return True
+    return bool(_JUDGMENT_RE.search(user_query))
+
+
+def _load_results(tool_result: str) -> Optional[List[dict]]:
+    """Parse a tool result, returning None for errors or unexpected shapes."""
+    try:
+        data = json.loads(tool_result)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, list) or not data:
+        return None
+    if not all(isinstance(item, dict) for item in data):
+        return None
+    return data
+
+
+def _format_minutes(minutes) -> str:
+    """Format a duration in minutes as '7h 05m'."""
+    if not isinstance(minutes, (int, float)):
+        return "-"
+    hours, mins = divmod(int(minutes), 60)
+    return f"{hours}h {mins:02d}m"
+
+
+def _format_price(price) -> str:
+    """Format a USD price, tolerating missing values."""
+    if isinstance(price, (int, float)):
+        return f"${price:,.0f}"
+    return "-"
+
+
+def _flight_row(index: int, option: dict) -> Optional[str]:
+    """Build one markdown table row for a flight option."""
+    legs = option.get("flights") or []
+    if not legs:
+        return None
+    first, last = legs[0], legs[-1]
+    airlines = " / ".join(dict.fromkeys(leg.get("airline", "?") for leg in legs))
+    numbers = ", ".join(leg.get("flight_number", "?") for leg in legs)
+    departure = first.get("departure_airport", {})
+    arrival = last.get("arrival_airport", {})
+    layovers = option.get("layovers") or []
+    stops = "Nonstop" if not layovers else (
+        f"{len(layovers)} stop{'s' if len(layovers) > 1 else ''} "
+        f"({', '.join(lay.get('id', '?') for lay in layovers)})"
+    )
+    return (
+        f"| {index} | {airlines} | {numbers} "
+        f"| {departure.get('id', '?')} {departure.get('time', '')} "
+        f"| {arrival.get('id', '?')} {arrival.get('time', '')} "
+        f"| {_format_minutes(option.get('total_duration'))} | {stops} "
+        f"| {first.get('travel_class', '-')} | {_format_price(option.get('price'))} |"
+    )
+
+
+def render_flight_results(tool_result: str, args: dict) -> Optional[str]:
+    """
+    Render search_flights output as an outbound/return flight table.
+
+    Args:
+        tool_result: JSON string returned by search_flights
+        args: The arguments the tool was called with
+
+    Returns:
+        Markdown answer, or None if the result is an error or unrecognized
+    """
+    options = _load_results(tool_result)
+    if options is None:
+        return None
+
+    rows = [row for row in (_flight_row(i, opt) for i, opt in enumerate(options, 1)) if row]
+    if not rows:
+        return None
+
+    origin = args.get("departure_airport", "?")
+    destination = args.get("arrival_airport", "?")
+    return_date = args.get("return_date")
+
+    lines = [
+        f"✈️ **Outbound flights: {origin} → {destination} on {args.get('outbound_date', '?')}**",
+        "",
+        "| # | Airline | Flight | Departs | Arrives | Duration | Stops | Class | Price |",
+        "|---|---------|--------|---------|---------|----------|-------|-------|-------|",
+        *rows,
+    ]
+    if return_date:
+        lines += [
+            "",
+            f"🔁 **Return flights: {destination} → {origin} on {return_date}**",
+            "",
+            "Prices above are round-trip totals. Pick an outbound option and "
+            "I can show the matching return flights.",
+        ]
+    return "\n".join(lines)
+
+
+def _hotel_entry(index: int, hotel: dict) -> Optional[str]:
+    """Build one numbered list entry for a hotel property."""
+    name = hotel.get("name")
+    if not name:
+        return None
+    header = f"{index}. **{name}**"
+    if hotel.get("hotel_class"):
+        header += f" — {hotel['hotel_class']}"
+    if hotel.get("overall_rating") is not None:
+        header += f" · ⭐ {hotel['overall_rating']}"
+        if isinstance(hotel.get("reviews"), int):
+            header += f" ({hotel['reviews']:,} reviews)"
+
+    lines = [header]
+    nightly = (hotel.get("rate_per_night") or {}).get("extracted_lowest")
+    total = (hotel.get("total_rate") or {}).get("extracted_lowest")
+    if nightly is not None or total is not None:
+        lines.append(f"   - Price: {_format_price(nightly)}/night · {_format_price(total)} total")
+    amenities = hotel.get("amenities") or []
+    if amenities:
+        lines.append(f"   - Amenities: {', '.join(amenities[:6])}")
+    if hotel.get("link"):
+        lines.append(f"   - Book: {hotel['link']}")
+    return "\n".join(lines)
+
+
+def render_hotel_results(tool_result: str, args: dict) -> Optional[str]:
+    """
+    Render search_hotels output as a numbered hotel list.
+
+    Args:
+        tool_result: JSON string returned by search_hotels
+        args: The arguments the tool was called with
+
+    Returns:
+        Markdown answer, or None if the result is an error or unrecognized
+    """
+    hotels = _load_results(tool_result)
+    if hotels is None:
+        return None
+
+    entries = [e for e in (_hotel_entry(i, h) for i, h in enumerate(hotels, 1)) if e]
+    if not entries:
+        return None
+
+    header = (
+        f"🏨 **Hotels in {args.get('location', '?')}: "
+        f"{args.get('check_in_date', '?')} → {args.get('check_out_date', '?')}**"
+    )
+    return "\n\n".join([header] + entries)
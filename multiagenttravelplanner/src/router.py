@@ -3,35 +3,29 @@ Router module for the multi-agent travel planner.
 The router analyzes user queries and determines which specialist agent
 should handle the request (flight, hotel, or itinerary).
 """
+from typing import Optional
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from src.state import TravelPlannerState
+from tools.upstream import call_with_timeout, call_timeout
 
+# Routing decisions and the agent node each one maps to
+AGENT_FOR_DECISION = {
+    "FLIGHT": "flight_agent",
+    "HOTEL": "hotel_agent",
+    "ITINERARY": "itinerary_agent"
+}
 
-def create_router(llm: ChatOpenAI):
-    """
-    Create a router that decides which agent should handle a query.
-
-    The router is an LLM-based classifier that analyzes the user's
-    question and routes it to the appropriate specialist agent.
-
-    Args:
-        llm: The language model to use for routing decisions
-
-    Returns:
-        A function that takes state and returns the next agent name
-    """
-
-    # Define the router's prompt
-    router_prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are a routing expert for a travel planning system.
+# Prompt pieces shared with the batched router (src/router_batcher.py)
+ROUTING_GUIDE = """You are a routing expert for a travel planning system.
 Analyze the user's query and decide which specialist agent should handle it:
 - FLIGHT: Flight bookings, airlines, air travel, flight search, tickets, airports, departures, arrivals, airline prices
 - HOTEL: Hotels, accommodations, stays, rooms, hotel bookings, lodging, resorts, hotel search, hotel prices
 - ITINERARY: Travel itineraries, trip planning, destinations, activities, attractions, sightseeing, travel advice, weather, culture, food, general travel questions
-Respond with ONLY one word: FLIGHT, HOTEL, or ITINERARY
-Examples:
+"""
+
+ROUTING_EXAMPLES = """Examples:
 "Book me a flight to Paris" → FLIGHT
 "Find hotels in Tokyo" → HOTEL
 "Plan my 5-day trip to Italy" → ITINERARY
@@ -40,12 +34,50 @@ Examples:
 "What are the best attractions in Rome?" → ITINERARY
 "I need airline tickets" → FLIGHT
 "Show me hotel options" → HOTEL
-"Create an itinerary for Japan" → ITINERARY"""),
+"Create an itinerary for Japan" → ITINERARY"""
+
+
+def create_router_chain(llm: ChatOpenAI):
+    """Prompt | llm | parser chain classifying one query into a one-word decision."""
+    router_prompt = ChatPromptTemplate.from_messages([
+        ("system", ROUTING_GUIDE + "Respond with ONLY one word: FLIGHT, HOTEL, or ITINERARY\n" + ROUTING_EXAMPLES),
         ("user", "Query: {query}")
     ])
+    return router_prompt | llm | StrOutputParser()
+
+
+def parse_decision(text: str) -> Optional[str]:
+    """Return FLIGHT, HOTEL or ITINERARY from a router reply, or None if it is none of them."""
+    decision = text.strip().upper().rstrip('.')
+    return decision if decision in AGENT_FOR_DECISION else None
+
+
+def create_router(llm: ChatOpenAI, batcher=None):
+    """
+    Create a router that decides which agent should handle a query.
+
+    The router is an LLM-based classifier that analyzes the user's
+    question and routes it to the appropriate specialist agent.
+
+    Args:
+        llm: The language model to use for routing decisions
+        batcher: Optional RouterBatcher (src/router_batcher.py); when given,
+                 queries from concurrent sessions are classified together
+
+    Returns:
+        A function that takes state and returns the next agent name
+    """
 
     # Create the router chain
-    router_chain = router_prompt | llm | StrOutputParser()
+    router_chain = create_router_chain(llm)
+
+    def classify(user_message: str) -> str:
+        if batcher is not None:
+            timeout = call_timeout()
+            return batcher.submit(user_message, timeout).result(timeout=timeout)
+        return call_with_timeout(
+            "Router LLM call", call_timeout(), router_chain.invoke, {"query": user_message}
+        )
 
     def route_query(state: TravelPlannerState):
         """
@@ -64,21 +96,16 @@ Examples:
 
         try:
             # Get LLM routing decision
-            decision = router_chain.invoke({"query": user_message}).strip().upper()
+            reply = classify(user_message)
 
             # Validate decision
-            if decision not in ["FLIGHT", "HOTEL", "ITINERARY"]:
-                print(f"⚠️  Invalid decision '{decision}', defaulting to ITINERARY")
+            decision = parse_decision(reply)
+            if decision is None:
+                print(f"⚠️  Invalid decision '{reply.strip()}', defaulting to ITINERARY")
                 decision = "ITINERARY"
 
             # Map decision to agent node names
-            agent_mapping = {
-                "FLIGHT": "flight_agent",
-                "HOTEL": "hotel_agent",
-                "ITINERARY": "itinerary_agent"
-            }
-
-            next_agent = agent_mapping.get(decision, "itinerary_agent")
+            next_agent = AGENT_FOR_DECISION[decision]
             print(f"🎯 Router decision: {decision} → {next_agent}")
 
             return next_agent
@@ -95,21 +122,29 @@ def router_node(state: TravelPlannerState, router_func):
     Router node for the LangGraph workflow.
 
     This is called as a node in the graph and updates the state
-    with routing information.
+    with routing information. If the request arrived with a route_hint
+    (server mode routes queries in batches before dispatching them),
+    that decision is used instead of calling the router.
 
     Args:
         state: Current state
         router_func: The routing function to use
 
     Returns:
-        Updated state with next_agent and user_query
+        Updated state with next_agent and user_query (route_hint cleared)
     """
     user_message = state["messages"][-1].content
-    next_agent = router_func(state)
+    hint = parse_decision(state.get("route_hint") or "")
+    if hint is not None:
+        next_agent = AGENT_FOR_DECISION[hint]
+        print(f"🎯 Router decision (batched): {hint} → {next_agent}")
+    else:
+        next_agent = router_func(state)
 
     return {
         "next_agent": next_agent,
-        "user_query": user_message
+        "user_query": user_message,
+        "route_hint": None
     }
 
 
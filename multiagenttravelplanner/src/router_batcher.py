@@ -0,0 +1,184 @@
+"""
+Micro-batched routing across concurrent sessions.
+Queries that reach the router within a short window are classified
+together in one LLM call with numbered outputs, and each decision is
+handed back to the caller waiting for it. If the batched reply cannot be
+parsed, every query in the batch is classified on its own instead.
+"""
+
+import re
+import time
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from config.settings import get_router_batch_settings, get_request_budget_seconds
+from tools.upstream import call_with_timeout
+from src.router import AGENT_FOR_DECISION, ROUTING_GUIDE, ROUTING_EXAMPLES, create_router_chain
+
+# Output tokens allowed per query in a batched reply ("12. ITINERARY" plus
+# newline is about five); the router tier's own max_tokens fits one word only
+BATCH_TOKENS_PER_QUERY = 8
+
+# One line of a batched reply: "3. HOTEL" (also "3) HOTEL", "3: HOTEL")
+_BATCH_LINE = re.compile(r'^\s*(\d+)\s*[.):\-]\s*\**\s*([A-Za-z]+)', re.MULTILINE)
+
+
+def format_batch(queries: List[str]) -> str:
+    """Number queries one per line for the batched prompt."""
+    return "\n".join(f"{number}. {' '.join(query.split())}" for number, query in enumerate(queries, 1))
+
+
+def parse_batch(text: str, count: int) -> Optional[List[str]]:
+    """
+    Read the numbered decisions of a batched router reply.
+
+    Args:
+        text: The model's reply
+        count: Number of queries in the batch
+
+    Returns:
+        One decision per query in order, or None unless every query got
+        exactly one valid decision
+    """
+    decisions = {}
+    for number, decision in _BATCH_LINE.findall(text):
+        number, decision = int(number), decision.upper()
+        if not 1 <= number <= count or decision not in AGENT_FOR_DECISION or number in decisions:
+            return None
+        decisions[number] = decision
+    if len(decisions) != count:
+        return None
+    return [decisions[number] for number in range(1, count + 1)]
+
+
+class RouterBatcher:
+    """
+    Collects router queries for a short window and classifies them in one call.
+
+    Attributes:
+        window: Seconds to wait for more queries after the first one arrives
+        max_batch: Most queries classified in one call
+        stats: Counters (queries, batches, llm_calls, fallbacks)
+
+    Example:
+        >>> batcher = RouterBatcher(llms['router'], window=0.01)
+        >>> batcher.submit("Find hotels in Tokyo").result()
+        'HOTEL'
+    """
+
+    def __init__(self, llm: BaseChatModel, window: float = 0.01, max_batch: int = 32):
+        self.window = window
+        self.max_batch = max_batch
+        self.single_chain = create_router_chain(llm)
+        batch_prompt = ChatPromptTemplate.from_messages([
+            ("system", ROUTING_GUIDE
+             + "You will receive several numbered queries from different users. Classify each one on its own.\n"
+             + "Respond with one line per query, in order, formatted as <number>. <FLIGHT, HOTEL, or ITINERARY>, "
+             + "and nothing else\n" + ROUTING_EXAMPLES),
+            ("user", "Queries:\n{queries}")
+        ])
+        batch_llm = llm.bind(max_tokens=BATCH_TOKENS_PER_QUERY * max_batch)
+        self.batch_chain = batch_prompt | batch_llm | StrOutputParser()
+        # Entries are (query, future, deadline as time.monotonic())
+        self._pending: List[Tuple[str, Future, float]] = []
+        self._first_arrival = 0.0
+        self._cond = threading.Condition()
+        self._fallback = ThreadPoolExecutor(max_workers=max_batch, thread_name_prefix="router-fallback")
+        self._thread = threading.Thread(target=self._run, name="router-batcher", daemon=True)
+        self._thread.start()
+        self.stats = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls, llm: BaseChatModel) -> Optional['RouterBatcher']:
+        """Create the batcher configured by ROUTER_BATCH_* settings, or None if disabled."""
+        settings = get_router_batch_settings()
+        if settings['window'] <= 0:
+            return None
+        return cls(llm, settings['window'], settings['max_batch'])
+
+    def submit(self, query: str, budget_seconds: Optional[float] = None) -> Future:
+        """
+        Queue a query for the next batch.
+
+        Args:
+            query: The user's query
+            budget_seconds: Time the caller can wait for the decision
+                            (default: REQUEST_BUDGET_SECONDS)
+
+        Returns:
+            Future resolving to the raw decision text (FLIGHT, HOTEL or ITINERARY)
+        """
+        future = Future()
+        budget = budget_seconds if budget_seconds is not None else get_request_budget_seconds()
+        with self._cond:
+            if not self._pending:
+                self._first_arrival = time.monotonic()
+            self._pending.append((query, future, time.monotonic() + budget))
+            self.stats['queries'] += 1
+            self._cond.notify()
+        return future
+
+    def _next_batch(self) -> List[Tuple[str, Future, float]]:
+        """Wait for a full batch or the end of the window, then take it."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            while len(self._pending) < self.max_batch:
+                remaining = self._first_arrival + self.window - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            # Queries left over start the next window now
+            self._first_arrival = time.monotonic()
+        return batch
+
+    def _run(self):
+        # One batch at a time, so decisions come back in arrival order;
+        # queries arriving meanwhile gather into the next batch
+        while True:
+            batch = self._next_batch()
+            try:
+                self._classify(batch)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _classify(self, batch: List[Tuple[str, Future, float]]):
+        """Classify a batch with one LLM call, falling back to one call per query."""
+        queries = [query for query, _, _ in batch]
+        self.stats['batches'] += 1
+        if len(batch) > 1:
+            self.stats['llm_calls'] += 1
+            # The call may run until the last caller in the batch gives up
+            timeout = max(deadline for _, _, deadline in batch) - time.monotonic()
+            try:
+                decisions = parse_batch(call_with_timeout(
+                    "Batched router LLM call", timeout, self.batch_chain.invoke, {"queries": format_batch(queries)}
+                ), len(batch))
+            except Exception as e:
+                print(f"⚠️  Batched routing failed ({e}), routing {len(batch)} queries one by one")
+                decisions = None
+            if decisions is not None:
+                for (_, future, _), decision in zip(batch, decisions):
+                    future.set_result(decision)
+                return
+            self.stats['fallbacks'] += 1
+            print(f"⚠️  Could not parse batched routing reply, routing {len(batch)} queries one by one")
+
+        self.stats['llm_calls'] += len(batch)
+        calls = [(future, self._fallback.submit(
+                    call_with_timeout, "Router LLM call", deadline - time.monotonic(),
+                    self.single_chain.invoke, {"query": query}))
+                 for query, future, deadline in batch]
+        for future, call in calls:
+            try:
+                future.set_result(call.result())
+            except Exception as e:
+                future.set_exception(e)
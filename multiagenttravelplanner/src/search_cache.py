@@ -0,0 +1,199 @@
+"""
+Time-to-live cache for SerpAPI and Tavily searches, with usage tracking.
+The cache sits on the upstream transports (like the cassette layer), so
+identical normalized searches within the TTL are served locally. It also
+counts how often each search was requested recently, which the background
+warmer (src/cache_warmer.py) uses to refresh popular entries before they
+expire.
+"""
+
+import time
+import threading
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from config.settings import get_search_cache_settings
+from tools import upstream
+from src.cassette import fingerprint
+
+# Searches tracked for popularity (least recently used beyond this are dropped)
+MAX_TRACKED_SEARCHES = 10000
+
+
+class CacheEntry:
+    """A cached response and when it expires."""
+
+    __slots__ = ('value', 'fetched_at', 'expires_at', 'warmed')
+
+    def __init__(self, value, ttl: float, warmed: bool = False):
+        self.value = value
+        self.fetched_at = time.time()
+        self.expires_at = self.fetched_at + ttl
+        self.warmed = warmed
+
+
+class SearchUsage:
+    """How often one search was requested, and how to repeat it."""
+
+    __slots__ = ('kind', 'request', 'fetch', 'times')
+
+    def __init__(self, kind: str, request: dict, fetch: Callable[[], Any]):
+        self.kind = kind
+        self.request = request
+        self.fetch = fetch
+        self.times: Deque[float] = deque()
+
+
+class SearchCache:
+    """
+    TTL cache of upstream search responses keyed by normalized request.
+
+    Attributes:
+        ttls: Lifetime in seconds per kind ('serpapi', 'tavily')
+        max_entries: Maximum cached responses (least recently used evicted)
+        window: Seconds of usage history counted for popularity
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 2048, window: float = 3600.0):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.window = window
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._usage: 'OrderedDict[str, SearchUsage]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls) -> Optional['SearchCache']:
+        """Create the cache configured by SEARCH_CACHE_* settings, or None if disabled."""
+        settings = get_search_cache_settings()
+        if settings['ttl'] <= 0:
+            return None
+        return cls(
+            {'serpapi': settings['ttl'], 'tavily': settings['tavily_ttl']},
+            settings['max_entries'], settings['window']
+        )
+
+    def _record_use(self, key: str, kind: str, request: dict, fetch: Callable[[], Any], now: float):
+        """Count one request for popularity."""
+        usage = self._usage.get(key)
+        if usage is None:
+            usage = self._usage[key] = SearchUsage(kind, request, fetch)
+            if len(self._usage) > MAX_TRACKED_SEARCHES:
+                self._usage.popitem(last=False)
+        else:
+            usage.fetch = fetch
+            self._usage.move_to_end(key)
+        usage.times.append(now)
+
+    def _store(self, key: str, kind: str, value, warmed: bool = False):
+        """Cache a response, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, self.ttls[kind], warmed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, kind: str, request: dict, fetch: Callable[[], Any]):
+        """
+        Serve a search from the cache or fetch and cache it.
+
+        Args:
+            kind: 'serpapi' or 'tavily'
+            request: Normalized request description (no credentials)
+            fetch: Zero-argument function making the upstream call
+
+        Returns:
+            The cached or fresh response
+        """
+        key = fingerprint(kind, request)
+        now = time.time()
+        with self._lock:
+            self._record_use(key, kind, request, fetch, now)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats[f'{kind}_hits'] += 1
+                if entry.warmed:
+                    self.stats[f'{kind}_warm_hits'] += 1
+                return entry.value
+            self.stats[f'{kind}_misses'] += 1
+
+        value = fetch()
+        # Empty responses are not worth keeping
+        if value:
+            self._store(key, kind, value)
+        return value
+
+    def popular(self, limit: int) -> List[Tuple[str, int]]:
+        """
+        Most requested searches within the usage window.
+
+        Returns:
+            (key, request count) pairs, most requested first
+        """
+        cutoff = time.time() - self.window
+        counts = []
+        with self._lock:
+            for key, usage in list(self._usage.items()):
+                while usage.times and usage.times[0] < cutoff:
+                    usage.times.popleft()
+                if usage.times:
+                    counts.append((key, len(usage.times)))
+                else:
+                    del self._usage[key]
+        counts.sort(key=lambda item: item[1], reverse=True)
+        return counts[:limit]
+
+    def usage(self, key: str) -> Optional[SearchUsage]:
+        """The recorded request for a key, if still tracked."""
+        with self._lock:
+            return self._usage.get(key)
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until a cached entry expires (negative if stale), or None if not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else entry.expires_at - time.time()
+
+    def refresh(self, key: str) -> bool:
+        """
+        Re-fetch a tracked search and cache the result (used by the warmer).
+
+        Returns:
+            True if a non-empty response was cached
+        """
+        usage = self.usage(key)
+        if usage is None:
+            return False
+        value = usage.fetch()
+        self.stats[f'{usage.kind}_refreshes'] += 1
+        if not value:
+            return False
+        self._store(key, usage.kind, value, warmed=True)
+        return True
+
+
+def install_search_cache(cache: SearchCache) -> None:
+    """
+    Route SerpAPI and Tavily traffic through a search cache.
+
+    Install it after the cassette (if any) so cache misses are still
+    recorded or replayed.
+
+    Args:
+        cache: The cache to serve searches from
+    """
+    serpapi_transport = upstream.get_transport('serpapi')
+    tavily_transport = upstream.get_transport('tavily')
+
+    def serpapi_via_cache(params):
+        request = {k: v for k, v in params.items() if k != 'api_key'}
+        return cache.get_or_fetch('serpapi', request, lambda: serpapi_transport(params))
+
+    def tavily_via_cache(tool, query):
+        request = {'query': query, 'max_results': getattr(tool, 'max_results', None)}
+        return cache.get_or_fetch('tavily', request, lambda: tavily_transport(tool, query))
+
+    upstream.set_transport('serpapi', serpapi_via_cache)
+    upstream.set_transport('tavily', tavily_via_cache)
+    print(f"🗄️  Search cache enabled (TTL {cache.ttls['serpapi']:.0f}s SerpAPI, {cache.ttls['tavily']:.0f}s Tavily)")
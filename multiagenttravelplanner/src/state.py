@@ -4,7 +4,7 @@ This module defines the state structure that is passed between agents
 in the LangGraph workflow.
 """
 
-from typing import TypedDict, Annotated, List, Optional
+from typing import TypedDict, Annotated, Dict, List, Optional
 import operator
 from langchain_core.messages import BaseMessage
 
@@ -22,6 +22,11 @@ class TravelPlannerState(TypedDict):
                  to the list rather than replacing it
         next_agent: The name of the next agent to route to
         user_query: The current user's query/question
+        last_search: Most recent search per kind ('flights', 'hotels') as
+                 {'args': tool arguments, 'records': parsed results}, so
+                 follow-ups can be answered with the query_results tool
+        route_hint: Routing decision (FLIGHT, HOTEL, ITINERARY) made before
+                 the graph ran, used by the router node instead of an LLM call
     """
 
     # Conversation history - automatically appended with operator.add
@@ -32,3 +37,9 @@ class TravelPlannerState(TypedDict):
 
     # Current user query
     user_query: Optional[str]
+
+    # Parsed results of the latest flight/hotel search, for local refinement
+    last_search: Optional[Dict[str, dict]]
+
+    # Decision from batched routing in server mode (consumed by the router node)
+    route_hint: Optional[str]
@@ -0,0 +1,509 @@
+"""
+Multi-process worker pool for serving the travel planner.
+Each worker process builds its own compiled graph with its own in-memory
+checkpointer. Requests are routed to workers by consistent hashing of
+thread_id, so a conversation's memory stays on one worker; when workers
+are added or removed, the latest checkpoint of every thread whose owner
+changes is migrated to its new worker. A worker process that dies fails
+its outstanding requests and is replaced by a fresh one (its conversations
+lose their memory). An optional AdmissionController
+(src/admission.py) bounds how many requests are sent to the workers at once,
+and an optional RouterBatcher (src/router_batcher.py) routes the queries of
+concurrent sessions in batches before they are dispatched.
+"""
+
+import sys
+import time
+import queue
+import bisect
+import hashlib
+import itertools
+import threading
+import multiprocessing as mp
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Set
+from langchain_core.messages import HumanMessage
+from config.settings import get_request_budget_seconds, get_worker_max_sessions
+from src.admission import AdmissionController
+from src.router_batcher import RouterBatcher
+
+# Virtual nodes per worker on the hash ring (smooths the key distribution)
+DEFAULT_REPLICAS = 128
+
+# Seconds between checks that every worker process is still alive
+LIVENESS_INTERVAL = 1.0
+
+# Fraction of CACHE_WARMER_QUOTA_PER_HOUR this worker's warmer may spend,
+# set in each worker process before its graph is built
+_warmer_share = 1.0
+
+
+class WorkerDied(RuntimeError):
+    """Raised for requests whose worker process exited before answering."""
+
+
+class HashRing:
+    """Consistent-hash ring mapping keys (thread ids) to worker ids."""
+
+    def __init__(self, nodes=(), replicas: int = DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self._hashes: List[int] = []
+        self._owners: Dict[int, int] = {}
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+    def add(self, node: int):
+        """Add a node and its virtual points to the ring."""
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            self._owners[point] = node
+            bisect.insort(self._hashes, point)
+
+    def remove(self, node: int):
+        """Remove a node and its virtual points from the ring."""
+        self._hashes = [point for point in self._hashes if self._owners[point] != node]
+        self._owners = {point: owner for point, owner in self._owners.items() if owner != node}
+
+    def get(self, key: str) -> int:
+        """Return the node owning a key."""
+        if not self._hashes:
+            raise RuntimeError("Hash ring is empty - no workers available")
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._owners[self._hashes[index]]
+
+    def copy(self) -> 'HashRing':
+        ring = HashRing(replicas=self.replicas)
+        ring._hashes = list(self._hashes)
+        ring._owners = dict(self._owners)
+        return ring
+
+
+def _build_worker_graph():
+    """Build a compiled graph inside a worker process."""
+    from config.settings import load_config
+    from src.graph_builder import build_travel_planner_graph
+    from src.models import create_role_llms
+    from src.cassette import Cassette, install_cassette, wrap_llms
+    from src.hedging import Hedger, wrap_hedged
+    from src.search_cache import SearchCache, install_search_cache
+    from src.cache_warmer import CacheWarmer
+    from tools.inventory import Inventory, install_inventory
+
+    load_config()
+    inventory = Inventory.from_settings()
+    if inventory:
+        install_inventory(inventory)
+    cassette = Cassette.from_settings()
+    if cassette:
+        install_cassette(cassette)
+    search_cache = SearchCache.from_settings()
+    if search_cache:
+        install_search_cache(search_cache)
+        # Every worker warms its own cache; together they keep to the hourly quota
+        warmer = CacheWarmer.from_settings(search_cache, share=_warmer_share)
+        if warmer:
+            warmer.start()
+    llms = create_role_llms()
+    hedger = Hedger.from_settings()
+    if hedger:
+        llms = wrap_hedged(hedger, llms)
+    if cassette:
+        llms = wrap_llms(cassette, llms)
+    return build_travel_planner_graph(llms)
+
+
+def _worker_main(worker_id: int, requests, responses, graph_factory, warmer_share: float = 1.0):
+    """
+    Worker process loop.
+
+    Messages on the request queue are tuples:
+    - ("invoke", request_id, thread_id, query, budget_seconds, route_hint)
+    - ("export", request_id, thread_ids): hand over and forget checkpoints
+      (with the blobs their interned tool results point to)
+    - ("import", request_id, checkpoints): adopt checkpoints from another worker
+    - ("stop",)
+
+    Beyond WORKER_MAX_SESSIONS, the least recently used conversation is
+    dropped together with the interned tool results it references.
+    """
+    from src.deadline import with_deadline
+    from src.blob_store import drop_thread, export_blobs, import_blobs, use_worker_store
+
+    # Node logs go to stderr; stdout belongs to the supervisor's responses
+    sys.stdout = sys.stderr
+    global _warmer_share
+    _warmer_share = warmer_share
+    use_worker_store(worker_id)
+
+    try:
+        travel_planner = graph_factory()
+    except BaseException as e:
+        responses.put(("ready", worker_id, f"{type(e).__name__}: {e}"))
+        return
+    checkpointer = travel_planner.checkpointer
+    max_sessions = get_worker_max_sessions()
+    sessions: 'OrderedDict[str, None]' = OrderedDict()
+
+    def touch(thread_id: str):
+        sessions[thread_id] = None
+        sessions.move_to_end(thread_id)
+        while max_sessions and len(sessions) > max_sessions:
+            drop_thread(checkpointer, sessions.popitem(last=False)[0])
+
+    responses.put(("ready", worker_id, None))
+
+    while True:
+        message = requests.get()
+        kind = message[0]
+        if kind == "stop":
+            break
+
+        request_id = message[1]
+        try:
+            if kind == "invoke":
+                _, _, thread_id, query, budget, route_hint = message
+                config = with_deadline({"configurable": {"thread_id": thread_id}}, budget)
+                touch(thread_id)
+                result = travel_planner.invoke(
+                    {"messages": [HumanMessage(content=query)], "route_hint": route_hint}, config
+                )
+                payload = {
+                    "thread_id": thread_id,
+                    "agent": result.get("next_agent"),
+                    "response": result["messages"][-1].content,
+                    "worker": worker_id,
+                }
+            elif kind == "export":
+                payload = {}
+                for thread_id in message[2]:
+                    sessions.pop(thread_id, None)
+                    saved = checkpointer.get_tuple({"configurable": {"thread_id": thread_id}})
+                    if saved is not None:
+                        # Interned tool results travel with the checkpoint
+                        messages = saved.checkpoint["channel_values"].get("messages", [])
+                        blobs = export_blobs(messages, release=True)
+                        payload[thread_id] = (saved.checkpoint, saved.metadata, blobs)
+                        checkpointer.delete_thread(thread_id)
+            elif kind == "import":
+                for thread_id, (checkpoint, metadata, blobs) in message[2].items():
+                    import_blobs(checkpoint["channel_values"].get("messages", []), blobs)
+                    checkpointer.put(
+                        {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}},
+                        checkpoint, metadata, checkpoint["channel_versions"]
+                    )
+                    touch(thread_id)
+                payload = len(message[2])
+            else:
+                raise ValueError(f"Unknown worker message '{kind}'")
+            responses.put((request_id, "ok", payload))
+        except Exception as e:
+            responses.put((request_id, "error", f"{type(e).__name__}: {e}"))
+
+
+def _copy_outcome(source: Future, target: Future):
+    """Resolve target with source's result or exception."""
+    if source.exception() is None:
+        target.set_result(source.result())
+    else:
+        target.set_exception(source.exception())
+
+
+class WorkerPool:
+    """
+    Supervisor for N worker processes with thread_id session affinity.
+
+    Example:
+        >>> pool = WorkerPool(4)
+        >>> pool.start()
+        >>> pool.submit("session-1", "Find hotels in Paris").result()["response"]
+        >>> pool.add_worker()      # rebalances sessions onto the new worker
+        >>> pool.shutdown()
+    """
+
+    def __init__(self, num_workers: int, graph_factory=_build_worker_graph, replicas: int = DEFAULT_REPLICAS,
+                 admission: Optional[AdmissionController] = None, router: Optional[RouterBatcher] = None):
+        self.num_workers = num_workers
+        self.graph_factory = graph_factory
+        self.admission = admission
+        self.router = router
+        self._ctx = mp.get_context("spawn")
+        self._responses = self._ctx.Queue()
+        self._workers: Dict[int, tuple] = {}
+        self._ring = HashRing(replicas=replicas)
+        self._threads: Dict[int, Set[str]] = {}
+        # request id -> (future, worker id)
+        self._futures: Dict[int, tuple] = {}
+        self._dead: Set[int] = set()
+        self._closed = False
+        self._ready: Dict[int, threading.Event] = {}
+        self._startup_errors: Dict[int, Optional[str]] = {}
+        self._warmer_shares: Dict[int, float] = {}
+        self._ids = itertools.count()
+        self._worker_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._routing = threading.RLock()
+        self._collector: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the worker processes and wait until each has built its graph."""
+        self._collector = threading.Thread(target=self._collect, name="worker-pool-collector", daemon=True)
+        self._collector.start()
+        for _ in range(self.num_workers):
+            worker_id = self._spawn()
+            self._ring.add(worker_id)
+        try:
+            for worker_id in list(self._workers):
+                self._wait_ready(worker_id)
+        except RuntimeError:
+            self.shutdown()
+            raise
+        print(f"✅ Worker pool ready with {len(self._workers)} workers", file=sys.stderr)
+
+    def _wait_ready(self, worker_id: int):
+        """Wait for a worker to build its graph; raise if it failed to start."""
+        self._ready[worker_id].wait()
+        error = self._startup_errors.get(worker_id)
+        if error:
+            raise RuntimeError(f"Worker {worker_id} failed to start: {error}")
+
+    def _spawn(self) -> int:
+        worker_id = next(self._worker_ids)
+        requests = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, requests, self._responses, self.graph_factory,
+                  self._claim_warmer_share(worker_id)),
+            name=f"travel-planner-worker-{worker_id}",
+            daemon=True
+        )
+        self._ready[worker_id] = threading.Event()
+        process.start()
+        self._workers[worker_id] = (process, requests)
+        self._threads[worker_id] = set()
+        return worker_id
+
+    def _claim_warmer_share(self, worker_id: int) -> float:
+        """
+        Reserve a new worker's fraction of the cache warmer quota.
+
+        Each worker gets 1/num_workers of the quota, or what is left of it when
+        workers beyond num_workers are running, so the pool never spends more
+        than CACHE_WARMER_QUOTA_PER_HOUR. Shares of stopped workers are freed.
+        """
+        left = 1.0 - sum(self._warmer_shares.values())
+        share = min(1.0 / max(1, self.num_workers), left if left > 1e-9 else 0.0)
+        self._warmer_shares[worker_id] = share
+        return share
+
+    def _collect(self):
+        """Resolve futures as worker responses arrive, and watch for dead workers."""
+        checked_at = time.monotonic()
+        while True:
+            try:
+                message = self._responses.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                message = None
+            if time.monotonic() - checked_at >= LIVENESS_INTERVAL:
+                self._check_workers()
+                checked_at = time.monotonic()
+            if message is None:
+                continue
+            request_id, status, payload = message
+            if request_id is None:
+                break
+            if request_id == "ready":
+                # Startup notice: status is the worker id, payload an error or None
+                self._startup_errors[status] = payload
+                self._ready[status].set()
+                continue
+            with self._lock:
+                future, _ = self._futures.pop(request_id, (None, None))
+            if future is None:
+                continue
+            if status == "ok":
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _check_workers(self):
+        """Fail the requests of workers that exited, and replace those workers."""
+        for worker_id, (process, _) in list(self._workers.items()):
+            if process.is_alive() or worker_id in self._dead:
+                continue
+            self._dead.add(worker_id)
+            error = f"Worker {worker_id} exited unexpectedly (exit code {process.exitcode})"
+            self._fail_requests(worker_id, error)
+            if not self._ready[worker_id].is_set():
+                # Died while starting: start() / add_worker() report it
+                self._startup_errors[worker_id] = error
+                self._ready[worker_id].set()
+                continue
+            print(f"💥 {error}; starting a replacement", file=sys.stderr)
+            threading.Thread(target=self._replace_worker, args=(worker_id,),
+                             name=f"worker-pool-replace-{worker_id}", daemon=True).start()
+
+    def _fail_requests(self, worker_id: int, error: str):
+        """Fail every outstanding request sent to a worker."""
+        with self._lock:
+            failed = [request_id for request_id, (_, owner) in self._futures.items() if owner == worker_id]
+            futures = [self._futures.pop(request_id)[0] for request_id in failed]
+        for future in futures:
+            future.set_exception(WorkerDied(error))
+
+    def _replace_worker(self, worker_id: int):
+        """Take a dead worker off the ring and start a new one in its place."""
+        with self._routing:
+            if worker_id not in self._workers:
+                return
+            new_ring = self._ring.copy()
+            new_ring.remove(worker_id)
+            self._ring = new_ring
+            self._workers.pop(worker_id)[0].join(timeout=30)
+            self._threads.pop(worker_id, None)
+            self._warmer_shares.pop(worker_id, None)
+            if self._closed or not self._workers:
+                return
+        try:
+            self.add_worker()
+        except Exception as e:
+            print(f"⚠️  Could not replace worker {worker_id}: {e}", file=sys.stderr)
+
+    def _send(self, worker_id: int, kind: str, *args) -> Future:
+        future = Future()
+        request_id = next(self._ids)
+        process, requests = self._workers[worker_id]
+        with self._lock:
+            self._futures[request_id] = (future, worker_id)
+        requests.put((kind, request_id, *args))
+        if not process.is_alive():
+            # Exited before the collector noticed; nothing will answer this request
+            with self._lock:
+                pending = self._futures.pop(request_id, None)
+            if pending is not None:
+                future.set_exception(WorkerDied(f"Worker {worker_id} is not running"))
+        return future
+
+    def worker_for(self, thread_id: str) -> int:
+        """Worker currently owning a thread."""
+        with self._routing:
+            return self._ring.get(thread_id)
+
+    def submit(self, thread_id: str, query: str, budget_seconds: Optional[float] = None,
+               tenant: str = "default") -> Future:
+        """
+        Send a query to the worker owning its thread (through admission control, if set).
+
+        Args:
+            thread_id: Conversation/session id
+            query: The user's message
+            budget_seconds: Request latency budget (default: REQUEST_BUDGET_SECONDS)
+            tenant: Tenant the request counts against for admission limits
+
+        Returns:
+            Future resolving to {"thread_id", "agent", "response", "worker"}; fails with
+            AdmissionRejected if the request was shed
+        """
+        if self.admission is None:
+            return self._dispatch(thread_id, query, budget_seconds)
+        return self.admission.submit(
+            tenant, thread_id, lambda remaining: self._dispatch(thread_id, query, remaining), budget_seconds
+        )
+
+    def _dispatch(self, thread_id: str, query: str, budget_seconds: Optional[float]) -> Future:
+        """Route the query (in a batch, if a router is set) and send it to its worker."""
+        if self.router is None:
+            return self._send_invoke(thread_id, query, budget_seconds, None)
+
+        budget = budget_seconds if budget_seconds is not None else get_request_budget_seconds()
+        started_at = time.monotonic()
+        result = Future()
+
+        def routed(decision: Future):
+            # Without a decision the worker's own router classifies the query
+            route_hint = decision.result() if decision.exception() is None else None
+            try:
+                sent = self._send_invoke(thread_id, query, max(0.0, budget - (time.monotonic() - started_at)),
+                                         route_hint)
+            except Exception as e:
+                result.set_exception(e)
+                return
+            sent.add_done_callback(lambda done: _copy_outcome(done, result))
+
+        self.router.submit(query, budget).add_done_callback(routed)
+        return result
+
+    def _send_invoke(self, thread_id: str, query: str, budget_seconds: Optional[float],
+                     route_hint: Optional[str]) -> Future:
+        with self._routing:
+            worker_id = self._ring.get(thread_id)
+            self._threads[worker_id].add(thread_id)
+            return self._send(worker_id, "invoke", thread_id, query, budget_seconds, route_hint)
+
+    def _rebalance(self, new_ring: HashRing):
+        """Move checkpoints of every thread whose owner changes, then switch rings."""
+        moves: Dict[int, Dict[int, List[str]]] = {}
+        for old_worker, thread_ids in self._threads.items():
+            for thread_id in thread_ids:
+                new_worker = new_ring.get(thread_id)
+                if new_worker != old_worker:
+                    moves.setdefault(old_worker, {}).setdefault(new_worker, []).append(thread_id)
+
+        moved = 0
+        for old_worker, targets in moves.items():
+            for new_worker, thread_ids in targets.items():
+                # Queued behind in-flight requests on the old worker, so the
+                # exported checkpoint includes every turn already submitted
+                checkpoints = self._send(old_worker, "export", thread_ids).result()
+                self._send(new_worker, "import", checkpoints).result()
+                self._threads[old_worker].difference_update(thread_ids)
+                self._threads[new_worker].update(thread_ids)
+                moved += len(thread_ids)
+        self._ring = new_ring
+        print(f"🔁 Rebalanced worker pool: moved {moved} sessions", file=sys.stderr)
+
+    def add_worker(self) -> int:
+        """Start one more worker and move its share of sessions onto it."""
+        worker_id = self._spawn()
+        try:
+            self._wait_ready(worker_id)
+        except RuntimeError:
+            self._workers.pop(worker_id)[0].join(timeout=30)
+            self._threads.pop(worker_id, None)
+            self._warmer_shares.pop(worker_id, None)
+            raise
+        with self._routing:
+            new_ring = self._ring.copy()
+            new_ring.add(worker_id)
+            self._rebalance(new_ring)
+        return worker_id
+
+    def remove_worker(self, worker_id: int):
+        """Move a worker's sessions to the remaining workers and stop it."""
+        with self._routing:
+            if len(self._workers) <= 1:
+                raise RuntimeError("Cannot remove the last worker")
+            new_ring = self._ring.copy()
+            new_ring.remove(worker_id)
+            self._rebalance(new_ring)
+            process, requests = self._workers.pop(worker_id)
+            self._threads.pop(worker_id, None)
+            self._warmer_shares.pop(worker_id, None)
+        requests.put(("stop",))
+        process.join(timeout=30)
+
+    def shutdown(self):
+        """Stop all workers."""
+        with self._routing:
+            self._closed = True
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for _, requests in workers:
+            requests.put(("stop",))
+        for process, _ in workers:
+            process.join(timeout=30)
+        self._responses.put((None, None, None))
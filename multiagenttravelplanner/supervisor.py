@@ -0,0 +1,91 @@
+"""
+Supervisor entry point: serve the travel planner from N worker processes.
+
+Reads one request per line from stdin (or a file) as JSON
+{"thread_id": "...", "query": "...", "tenant": "..."} and writes one JSON
+response per line to stdout. Requests for the same thread_id always go to
+the same worker, so conversation memory stays local to that worker.
+Admission control (ADMISSION_* settings) sheds requests the workers cannot
+start in time; those get {"error": ..., "retry_after": seconds}. Queries
+arriving together are routed in one batched LLM call (ROUTER_BATCH_* settings)
+before being sent to their workers.
+
+Usage:
+    python supervisor.py --workers 4 < requests.jsonl
+    python supervisor.py --workers 4 requests.jsonl
+"""
+
+import os
+import sys
+import json
+import argparse
+from config.settings import load_config, get_model_config
+from src.models import create_llm
+from src.cassette import Cassette, wrap_llms
+from src.hedging import Hedger, wrap_hedged
+from src.admission import AdmissionController, AdmissionRejected
+from src.router_batcher import RouterBatcher
+from src.worker_pool import WorkerPool
+
+
+def iter_requests(stream):
+    """Yield (thread_id, query, tenant) tuples from JSON lines."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            request = json.loads(line)
+            yield request.get("thread_id", "default"), request["query"], request.get("tenant", "default")
+
+
+def build_router_batcher():
+    """Router batcher for the supervisor process, or None if batching is disabled."""
+    llms = {'router': create_llm(get_model_config('router'))}
+    hedger = Hedger.from_settings()
+    if hedger:
+        llms = wrap_hedged(hedger, llms)
+    cassette = Cassette.from_settings()
+    if cassette:
+        llms = wrap_llms(cassette, llms)
+    return RouterBatcher.from_settings(llms['router'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the travel planner from multiple worker processes.")
+    parser.add_argument("requests", nargs="?", help="JSON lines file (default: stdin)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    args = parser.parse_args()
+
+    # Logs go to stderr; stdout carries only the JSON responses
+    responses = sys.stdout
+    sys.stdout = sys.stderr
+
+    load_config()
+    admission = AdmissionController.from_settings(args.workers)
+    router = build_router_batcher()
+    pool = WorkerPool(args.workers, admission=admission, router=router)
+    pool.start()
+    try:
+        stream = open(args.requests, encoding="utf-8") if args.requests else sys.stdin
+        with stream:
+            futures = [
+                (thread_id, pool.submit(thread_id, query, tenant=tenant))
+                for thread_id, query, tenant in iter_requests(stream)
+            ]
+        for thread_id, future in futures:
+            try:
+                print(json.dumps(future.result(), ensure_ascii=False), file=responses, flush=True)
+            except AdmissionRejected as e:
+                print(json.dumps({"thread_id": thread_id, "error": str(e), "retry_after": e.retry_after}),
+                      file=responses, flush=True)
+            except Exception as e:
+                print(json.dumps({"thread_id": thread_id, "error": str(e)}), file=responses, flush=True)
+        if admission:
+            print(f"🚦 Admission: {dict(admission.stats)}", file=sys.stderr)
+        if router:
+            print(f"🧭 Batched routing: {dict(router.stats)}", file=sys.stderr)
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Shared setup for the unit tests.
+Run from the project root: python -m pytest -q
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TAVILY_API_KEY', 'test-placeholder')
+
+# src imports the agents package, which imports src modules in turn;
+# importing src first resolves the cycle for tests importing agents directly
+import src  # noqa: E402,F401
@@ -0,0 +1,91 @@
+"""Tests for the content-addressed blob store (src/blob_store.py)."""
+
+import pytest
+from langchain_core.messages import HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, END
+from src.state import TravelPlannerState
+from src.blob_store import (
+    BlobStore, blob_ref, drop_thread, get_blob_store, intern_messages, rehydrate_messages,
+    set_blob_store, use_worker_store,
+)
+
+PAYLOAD = '{"results": "' + "x" * 2000 + '"}'
+
+
+@pytest.fixture
+def store():
+    store = BlobStore(min_bytes=1024)
+    set_blob_store(store)
+    yield store
+    set_blob_store(None)
+
+
+def test_blob_is_stored_once_and_freed_with_its_last_reference(store):
+    key = store.put(PAYLOAD)
+    assert store.put(PAYLOAD) == key
+    assert store.stats() == {'blobs': 1, 'stored_bytes': len(PAYLOAD), 'references': 2,
+                             'referenced_bytes': 2 * len(PAYLOAD)}
+    store.release(key)
+    assert store.get(key) == PAYLOAD
+    store.release(key)
+    with pytest.raises(KeyError):
+        store.get(key)
+    assert store.stats()['blobs'] == 0
+
+
+def test_intern_and_rehydrate_round_trip(store):
+    small = ToolMessage(content="short", tool_call_id="a")
+    large = ToolMessage(content=PAYLOAD, tool_call_id="b")
+    interned = intern_messages([small, large])
+    assert blob_ref(interned[0]) is None
+    assert blob_ref(interned[1]) and len(interned[1].content) < 100
+    assert [m.content for m in rehydrate_messages(interned)] == ["short", PAYLOAD]
+
+
+def _graph():
+    def agent(state):
+        return {"messages": intern_messages([ToolMessage(content=PAYLOAD, tool_call_id="call")])}
+
+    workflow = StateGraph(TravelPlannerState)
+    workflow.add_node("agent", agent)
+    workflow.set_entry_point("agent")
+    workflow.add_edge("agent", END)
+    return workflow.compile(checkpointer=InMemorySaver())
+
+
+def test_drop_thread_releases_blobs_only_when_no_thread_uses_them(store):
+    graph = _graph()
+    for thread_id in ("a", "b"):
+        graph.invoke({"messages": [HumanMessage(content="hi")]}, {"configurable": {"thread_id": thread_id}})
+    assert store.stats()['references'] == 2
+
+    drop_thread(graph.checkpointer, "a")
+    assert store.stats() == {'blobs': 1, 'stored_bytes': len(PAYLOAD), 'references': 1,
+                             'referenced_bytes': len(PAYLOAD)}
+    assert graph.checkpointer.get_tuple({"configurable": {"thread_id": "a"}}) is None
+
+    drop_thread(graph.checkpointer, "b")
+    assert store.stats()['blobs'] == 0
+    # Dropping an unknown thread is a no-op
+    drop_thread(graph.checkpointer, "missing")
+
+
+def test_workers_sharing_a_disk_path_keep_their_own_blobs(monkeypatch, tmp_path):
+    monkeypatch.setenv('BLOB_STORE', 'disk')
+    monkeypatch.setenv('BLOB_STORE_PATH', str(tmp_path))
+    try:
+        use_worker_store(0)
+        first = get_blob_store()
+        use_worker_store(1)
+        second = get_blob_store()
+    finally:
+        set_blob_store(None)
+    key = first.put(PAYLOAD)
+    assert second.put(PAYLOAD) == key
+
+    # One worker dropping its last reference must not delete the other's copy
+    first.release(key)
+    with pytest.raises(KeyError):
+        first.get(key)
+    assert second.get(key) == PAYLOAD
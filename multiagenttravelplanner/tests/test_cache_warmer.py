@@ -0,0 +1,33 @@
+"""Tests for the cache warmer's upstream quota (src/cache_warmer.py)."""
+
+import pytest
+from src.cache_warmer import CacheWarmer
+from src.search_cache import SearchCache
+from src.worker_pool import WorkerPool
+
+
+def test_warmer_spends_its_share_of_the_quota(monkeypatch):
+    monkeypatch.setenv('CACHE_WARMER', 'true')
+    monkeypatch.setenv('CACHE_WARMER_QUOTA_PER_HOUR', '100')
+    cache = SearchCache({})
+    assert CacheWarmer.from_settings(cache).quota_per_hour == 100
+    assert CacheWarmer.from_settings(cache, share=0.25).quota_per_hour == 25
+    assert CacheWarmer.from_settings(cache, share=0.0) is None
+
+
+def test_pool_shares_never_exceed_the_quota():
+    pool = WorkerPool(3)
+    shares = [pool._claim_warmer_share(worker_id) for worker_id in range(3)]
+    assert shares == [pytest.approx(1 / 3)] * 3
+    # Workers added beyond the configured size get what is left: nothing
+    assert pool._claim_warmer_share(3) == 0.0
+    assert sum(pool._warmer_shares.values()) <= 1.0
+    # A stopped worker's share goes to the next worker started
+    pool._warmer_shares.pop(0)
+    assert pool._claim_warmer_share(4) == pytest.approx(1 / 3)
+    assert sum(pool._warmer_shares.values()) == pytest.approx(1.0)
+
+
+def test_bucket_spends_at_most_the_quota():
+    warmer = CacheWarmer(SearchCache({}), quota_per_hour=2.5)
+    assert sum(warmer._take_token() for _ in range(10)) == 2
@@ -0,0 +1,71 @@
+"""Tests for the record/replay cassette (src/cassette.py)."""
+
+import os
+import multiprocessing as mp
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from src.cassette import Cassette, _canonical_message, cassette_files, fingerprint, shard_path
+
+
+def record_calls(path: str, worker: int, count: int):
+    """Record count calls from one process (run in child processes)."""
+    cassette = Cassette(path, 'record')
+    for i in range(count):
+        # Incompressible payloads make gzip write while other processes do
+        cassette.call('tavily', {'query': f"{worker}-{i}"}, lambda: {'results': [os.urandom(512).hex()]})
+    cassette.close()
+
+
+def test_shard_path_keeps_the_extension():
+    assert shard_path('cassettes/traffic.jsonl.gz', 42) == 'cassettes/traffic.42.jsonl.gz'
+    assert shard_path('run.v1.0/calls.gz', 7) == 'run.v1.0/calls.7.gz'
+
+
+def test_cassette_files_lists_the_cassette_and_process_recordings(tmp_path):
+    path = str(tmp_path / 'traffic.jsonl.gz')
+    for name in ('traffic.jsonl.gz', 'traffic.12.jsonl.gz', 'traffic.3.jsonl.gz', 'traffic.old.jsonl.gz'):
+        (tmp_path / name).write_bytes(b'')
+    assert [os.path.basename(f) for f in cassette_files(path)] == [
+        'traffic.jsonl.gz', 'traffic.12.jsonl.gz', 'traffic.3.jsonl.gz'
+    ]
+
+
+def test_concurrent_processes_record_without_corrupting_the_cassette(tmp_path):
+    path = str(tmp_path / 'traffic.jsonl.gz')
+    ctx = mp.get_context('spawn')
+    processes = [ctx.Process(target=record_calls, args=(path, worker, 300)) for worker in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    replay = Cassette(path, 'replay')
+    for worker in range(3):
+        for i in range(300):
+            assert len(replay.call('tavily', {'query': f"{worker}-{i}"}, None)['results'][0]) == 1024
+    assert replay.stats['tavily_hits'] == 900
+
+
+@pytest.mark.parametrize('agent', ['flight', 'hotel'])
+def test_agent_prompt_fingerprint_does_not_change_with_the_date(monkeypatch, agent):
+    # Imported here: the recording processes above load this module without src
+    from agents.flight_agent import create_flight_agent
+    from agents.hotel_agent import create_hotel_agent
+    from benchmarks.fake_llm import FakeChatModel
+    create_agent = {'flight': create_flight_agent, 'hotel': create_hotel_agent}[agent]
+
+    def key(today):
+        monkeypatch.setenv('TRAVEL_PLANNER_TODAY', today)
+        prompt = create_agent(FakeChatModel()).first
+        messages = prompt.format_messages(messages=[HumanMessage(content="Trip to Rome next friday")])
+        return fingerprint('llm', [_canonical_message(m) for m in messages])
+
+    assert key('2026-06-01') == key('2026-06-02') == key('2026-12-31')
+
+
+def test_dates_outside_the_prompt_header_still_count():
+    assert _canonical_message(HumanMessage(content="Hotels on 2026-06-01")) != \
+        _canonical_message(HumanMessage(content="Hotels on 2026-06-02"))
+    assert _canonical_message(SystemMessage(content="Arrive by June 1, 2026")) != \
+        _canonical_message(SystemMessage(content="Arrive by June 2, 2026"))
@@ -0,0 +1,44 @@
+"""Tests for hedged LLM requests (src/hedging.py)."""
+
+import time
+from src.hedging import HedgeBudget, Hedger
+
+
+def test_budget_earns_a_fraction_per_call_up_to_the_burst():
+    budget = HedgeBudget(0.5, burst=2.0)
+    assert budget.take() and budget.take()
+    assert not budget.take()
+    budget.earn()
+    assert not budget.take()
+    budget.earn()
+    assert budget.take()
+    for _ in range(10):
+        budget.earn()
+    assert budget.take() and budget.take()
+    assert not budget.take()
+
+
+def test_no_hedge_before_min_samples():
+    hedger = Hedger(min_samples=3, min_delay=0.01)
+    assert hedger.call('router', lambda: 'ok') == 'ok'
+    assert hedger.threshold('router') is None
+    assert hedger.metrics()['router']['threshold_ms'] is None
+
+
+def test_winning_hedge_records_latency_from_the_first_send():
+    hedger = Hedger(quantile=0.5, budget_fraction=1.0, min_samples=1, min_delay=0.05)
+    hedger._record('router', 0.05)
+    calls = []
+
+    def slow_first():
+        calls.append(1)
+        time.sleep(0.3 if len(calls) == 1 else 0.0)
+        return len(calls)
+
+    assert hedger.call('router', slow_first) == 2
+    metrics = hedger.metrics()['router']
+    assert metrics['hedges'] == 1 and metrics['hedge_wins'] == 1
+    assert metrics['hedge_rate'] == 1.0 and metrics['hedge_win_rate'] == 1.0
+    # The hedge answered at once, but the caller waited for the threshold first
+    assert hedger._latencies['router'][-1] >= 0.05
+    assert hedger.threshold('router') >= 0.05
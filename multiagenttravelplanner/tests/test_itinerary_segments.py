@@ -0,0 +1,80 @@
+"""Tests for multi-city itinerary planning (agents/itinerary_segments.py)."""
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from agents.itinerary_segments import (
+    HISTORY_MESSAGE_CHARS, assemble_itinerary, conversation_history, looks_multi_city,
+    parse_segments, parse_transfers, plan_multi_city,
+)
+
+
+def test_looks_multi_city_needs_two_distinct_cities():
+    assert looks_multi_city("Plan 12 days across Tokyo, Kyoto and Osaka")
+    assert looks_multi_city("a week in rome then florence")
+    assert not looks_multi_city("3 days in Paris, with museums and food")
+    assert not looks_multi_city("Add two more days in Kyoto")
+    assert not looks_multi_city("Plan a trip to Rome, Italy")
+    # Aliases of one city count once
+    assert not looks_multi_city("NYC and New York food tour")
+    # Whole words only, and no cities that are also common words
+    assert not looks_multi_city("Paris, romantic and nicely paced")
+    assert not looks_multi_city("Have a nice time in Paris, split evenly")
+
+
+def test_parse_segments_numbers_days_across_the_route():
+    assert parse_segments("Tokyo: 5\nKyoto: 4\nOsaka: 3", 6) == [
+        {'city': 'Tokyo', 'days': 5, 'first_day': 1, 'last_day': 5},
+        {'city': 'Kyoto', 'days': 4, 'first_day': 6, 'last_day': 9},
+        {'city': 'Osaka', 'days': 3, 'first_day': 10, 'last_day': 12},
+    ]
+
+
+def test_parse_segments_accepts_list_and_one_line_formats():
+    assert [s['city'] for s in parse_segments("1. **Rome**: 4 days\n2. **Florence**: 3 days", 6)] == ['Rome', 'Florence']
+    assert [s['days'] for s in parse_segments("Tokyo: 5 / Kyoto: 4 / Osaka: 3", 6)] == [5, 4, 3]
+
+
+def test_parse_segments_rejects_single_city_and_too_many_segments():
+    assert parse_segments("NONE", 6) is None
+    assert parse_segments("Paris: 5", 6) is None
+    assert parse_segments("Rome: 0\nFlorence: 3", 6) is None
+    assert parse_segments("\n".join(f"City{i}: 2" for i in range(4)), 3) is None
+
+
+def test_parse_transfers_reads_headings():
+    text = "**OVERVIEW**\nA relaxed route.\n\n### TRANSFER 1\nShinkansen, 2h15.\nTRANSFER 2:\nLocal train, 15 min."
+    assert parse_transfers(text, 2) == ("A relaxed route.", ["Shinkansen, 2h15.", "Local train, 15 min."])
+
+
+def test_parse_transfers_without_headings_keeps_text_as_overview():
+    assert parse_transfers("Take the train between cities.", 2) == ("Take the train between cities.", [None, None])
+    assert parse_transfers("OVERVIEW\nShort.\nTRANSFER 5\nOut of range.", 1) == ("Short.", [None])
+
+
+def test_conversation_history_keeps_clipped_turns_without_tool_traffic():
+    messages = [
+        HumanMessage(content="Plan Tokyo and Kyoto"),
+        AIMessage(content="", tool_calls=[{'name': 'TavilySearch', 'args': {'query': 'x'}, 'id': 'call_1'}]),
+        ToolMessage(content="results", tool_call_id='call_1'),
+        AIMessage(content="x" * (HISTORY_MESSAGE_CHARS + 10)),
+        HumanMessage(content="Now swap Kyoto for Osaka"),
+    ]
+    history = conversation_history(messages)
+    assert [type(m) for m in history] == [HumanMessage, AIMessage]
+    assert history[1].content.endswith("(truncated)")
+    assert len(history[1].content) < HISTORY_MESSAGE_CHARS + 20
+
+
+def test_assemble_itinerary_puts_transfers_between_segments():
+    segments = parse_segments("Rome: 2\nFlorence: 2", 6)
+    text = assemble_itinerary(segments, ["Rome plan", "Florence plan"], "Overview", [None])
+    assert text.index("Rome plan") < text.index("Rome → Florence (day 3)") < text.index("Florence plan")
+    assert "Overview" in text
+
+
+def test_plan_multi_city_skips_split_call_for_single_city_requests():
+    class NoCalls:
+        def invoke(self, *args, **kwargs):
+            raise AssertionError("split call made")
+
+    messages = [HumanMessage(content="3 days in Paris, with museums and food")]
+    assert plan_multi_city(messages, NoCalls(), NoCalls(), 6) is None
@@ -0,0 +1,72 @@
+"""Tests for batched routing (src/router_batcher.py)."""
+
+import re
+from concurrent.futures import wait
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from config.settings import get_model_config, get_router_batch_settings
+from src.router_batcher import RouterBatcher, format_batch, parse_batch
+
+# Word, punctuation and newline tokens, close to what the API counts
+_TOKEN = re.compile(r"\w+|[^\w\s]|\n")
+
+
+class NumberedRouterModel(BaseChatModel):
+    """Answers routing prompts, cut off at max_tokens like the API does."""
+
+    max_tokens: int
+
+    @property
+    def _llm_type(self) -> str:
+        return 'numbered-router'
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = str(messages[-1].content)
+        queries = re.findall(r'^(\d+)\. (.*)$', prompt, re.MULTILINE)
+        if queries:
+            reply = "\n".join(f"{n}. {'FLIGHT' if 'flight' in q else 'HOTEL'}" for n, q in queries)
+        else:
+            reply = 'FLIGHT' if 'flight' in prompt else 'HOTEL'
+        tokens = _TOKEN.findall(reply)[:kwargs.get('max_tokens', self.max_tokens)]
+        text = re.sub(r' ?\n ?', '\n', ' '.join(tokens)).replace(' . ', '. ')
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+def test_parse_batch_reads_numbered_decisions():
+    assert parse_batch("1. FLIGHT\n2) hotel\n3: **ITINERARY**", 3) == ['FLIGHT', 'HOTEL', 'ITINERARY']
+    assert parse_batch("2. HOTEL\n1. FLIGHT", 2) == ['FLIGHT', 'HOTEL']
+
+
+def test_parse_batch_rejects_incomplete_or_invalid_replies():
+    assert parse_batch("1. FLIGHT", 2) is None
+    assert parse_batch("1. FLIGHT\n2. TRAIN", 2) is None
+    assert parse_batch("1. FLIGHT\n1. HOTEL", 2) is None
+    assert parse_batch("1. FLIGHT\n3. HOTEL", 2) is None
+    assert parse_batch("1. FLIGHT\n2.", 2) is None
+
+
+def test_format_batch_numbers_queries_on_one_line_each():
+    assert format_batch(["Find\nflights", "hotels  in Rome"]) == "1. Find flights\n2. hotels in Rome"
+
+
+def test_full_batch_parses_with_default_settings():
+    settings = get_router_batch_settings()
+    llm = NumberedRouterModel(max_tokens=get_model_config('router')['max_tokens'])
+    batcher = RouterBatcher(llm, window=1.0, max_batch=settings['max_batch'])
+    queries = [f"{'flight' if i % 2 else 'hotel'} query {i}" for i in range(settings['max_batch'])]
+
+    futures = [batcher.submit(query) for query in queries]
+    wait(futures, timeout=10)
+
+    assert [future.result() for future in futures] == ['FLIGHT' if i % 2 else 'HOTEL' for i in range(len(queries))]
+    assert batcher.stats['llm_calls'] == 1
+    assert batcher.stats['fallbacks'] == 0
+
+
+def test_expired_batch_fails_instead_of_waiting():
+    llm = NumberedRouterModel(max_tokens=5)
+    batcher = RouterBatcher(llm, window=0.05, max_batch=4)
+    futures = [batcher.submit("flight", budget_seconds=0.0), batcher.submit("hotel", budget_seconds=0.0)]
+    wait(futures, timeout=5)
+    assert all(future.exception() is not None for future in futures)
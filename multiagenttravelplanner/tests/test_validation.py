@@ -0,0 +1,76 @@
+"""Tests for flight and hotel argument validation (tools/validation.py)."""
+
+from datetime import date
+import pytest
+from tools.validation import (
+    ToolArgumentError, _integer, _number, normalize_travel_date, parse_date, validate_flight_args,
+)
+
+TODAY = date(2026, 10, 19)
+
+
+@pytest.mark.parametrize('value, expected', [(3, 3), ('3', 3), (3.0, 3), ('9', 9)])
+def test_integer_accepts_whole_numbers(value, expected):
+    assert _integer(1, 9)(value) == expected
+
+
+@pytest.mark.parametrize('value, message', [
+    ('inf', "'inf' is not a number"),
+    (float('-inf'), "'-inf' is not a number"),
+    ('nan', "'nan' is not a number"),
+    ('two', "'two' is not a number"),
+    (2.5, "2.5 is not a whole number"),
+    (10, "10 is outside 1-9"),
+    (True, "expected a whole number, got True"),
+])
+def test_integer_rejects(value, message):
+    with pytest.raises(ValueError, match=message):
+        _integer(1, 9)(value)
+
+
+@pytest.mark.parametrize('value', ['inf', 'nan', '$Infinity'])
+def test_number_rejects_non_finite(value):
+    with pytest.raises(ValueError, match='is not a number'):
+        _number(1)(value)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2026-11-02', date(2026, 11, 2)),
+    ('Feb 15', date(2027, 2, 15)),
+    ('15 February 2027', date(2027, 2, 15)),
+    ('12/24', date(2026, 12, 24)),
+    ('tomorrow', date(2026, 10, 20)),
+    ('in 2 weeks', date(2026, 11, 2)),
+    ('next friday', date(2026, 10, 23)),
+])
+def test_parse_date(value, expected):
+    assert parse_date(value, TODAY) == expected
+
+
+@pytest.mark.parametrize('value, message', [
+    ('2026-02-30', 'is not a real date'),
+    ('soon', 'is not a date'),
+    ('in 99999999999 days', 'is not a date'),
+])
+def test_parse_date_rejects(value, message):
+    with pytest.raises(ValueError, match=message):
+        parse_date(value, TODAY)
+
+
+def test_travel_date_must_be_within_the_booking_window():
+    assert normalize_travel_date('Nov 2', TODAY) == '2026-11-02'
+    with pytest.raises(ValueError, match='is in the past'):
+        normalize_travel_date('2026-10-18', TODAY)
+    with pytest.raises(ValueError, match='days ahead'):
+        normalize_travel_date('2028-01-01', TODAY)
+
+
+@pytest.mark.parametrize('value', ['inf', 'nan', float('inf')])
+def test_flight_args_report_non_finite_numbers(monkeypatch, value):
+    monkeypatch.setenv('TRAVEL_PLANNER_TODAY', TODAY.isoformat())
+    with pytest.raises(ToolArgumentError) as error:
+        validate_flight_args({
+            'departure_airport': 'JFK', 'arrival_airport': 'LHR',
+            'outbound_date': '2026-11-02', 'adults': value,
+        })
+    assert error.value.errors == {'adults': f"'{value}' is not a number"}
@@ -0,0 +1,46 @@
+"""Tests for the multi-process worker pool (src/worker_pool.py)."""
+
+import os
+import time
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from src.admission import AdmissionController
+from src.worker_pool import WorkerDied, WorkerPool
+
+
+class CrashingGraph:
+    """Graph stand-in whose worker process exits on the query 'crash'."""
+
+    def __init__(self):
+        self.checkpointer = InMemorySaver()
+
+    def invoke(self, state, config):
+        if state["messages"][-1].content == "crash":
+            os._exit(3)
+        return {"next_agent": "itinerary_agent", "messages": [AIMessage(content="ok")]}
+
+
+def crashing_graph():
+    return CrashingGraph()
+
+
+def test_dead_worker_fails_its_requests_and_is_replaced():
+    admission = AdmissionController(max_concurrent=2)
+    pool = WorkerPool(2, graph_factory=crashing_graph, admission=admission)
+    pool.start()
+    try:
+        dead = pool.worker_for("t")
+        with pytest.raises(WorkerDied, match="exit code 3"):
+            pool.submit("t", "crash").result(timeout=30)
+        # The request's admission slot is freed
+        assert admission.running == 0
+
+        deadline = time.monotonic() + 60
+        while (dead in pool._workers or len(pool._workers) < 2) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert dead not in pool._workers and len(pool._workers) == 2
+        answer = pool.submit("t", "hello").result(timeout=30)
+        assert answer["response"] == "ok" and answer["worker"] != dead
+    finally:
+        pool.shutdown()
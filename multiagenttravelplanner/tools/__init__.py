@@ -1,5 +1,26 @@
 """Tools package for the multi-agent travel planner."""
-from .itinerary_search import create_itinerary_tool
-from .flight_search import search_flights
-from .hotel_search import search_hotels
-__all__ = ['create_itinerary_tool', 'search_flights', 'search_hotels']
\ No newline at end of file
+from .itinerary_search import create_itinerary_tool, search_itinerary, create_search_executors
+from .flight_search import search_flights, search_flights_with_records
+from .hotel_search import search_hotels, search_hotels_with_records
+from .records import flight_records, hotel_records
+from .ranking import rank_records
+from .validation import validate_flight_args, validate_hotel_args, ToolArgumentError
+from .result_query import query_records, create_flight_query_tool, create_hotel_query_tool
+__all__ = [
+    'create_itinerary_tool',
+    'search_itinerary',
+    'create_search_executors',
+    'search_flights',
+    'search_flights_with_records',
+    'search_hotels',
+    'search_hotels_with_records',
+    'flight_records',
+    'hotel_records',
+    'rank_records',
+    'validate_flight_args',
+    'validate_hotel_args',
+    'ToolArgumentError',
+    'query_records',
+    'create_flight_query_tool',
+    'create_hotel_query_tool',
+]
\ No newline at end of file
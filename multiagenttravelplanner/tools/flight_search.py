@@ -5,13 +5,20 @@ This tool searches for flights between airports on specified dates.
 
 import os
 import json
-import serpapi
 from dotenv import load_dotenv
+from typing import List, Tuple
+from tools.upstream import serpapi_search, UpstreamTimeout
+from config.settings import get_search_top_k
+from tools.records import flight_options, flight_records
+from tools.ranking import rank_records
+from tools.validation import validate_flight_args, invalid_arguments_result, ToolArgumentError
 
 # Ensure .env is loaded
 load_dotenv()
 
-def search_flights(departure_airport: str, arrival_airport: str, outbound_date: str, return_date: str = None, adults: int = 1, children: int = 0) -> str:
+def search_flights(departure_airport: str, arrival_airport: str, outbound_date: str, return_date: str = None, adults: int = 1, children: int = 0,
+                   max_price: float = None, max_stops: int = None, max_duration_minutes: int = None,
+                   depart_after_hour: int = None, depart_before_hour: int = None, priority: str = 'balanced') -> str:
     """
     Search for flights using Google Flights engine via SERP API.
     
@@ -20,18 +27,55 @@ def search_flights(departure_airport: str, arrival_airport: str, outbound_date:
         arrival_airport: Arrival airport code (e.g., 'LON', 'NRT', 'DXB')
         outbound_date: Departure date in YYYY-MM-DD format (e.g., '2025-11-30')
         return_date: Optional return date in YYYY-MM-DD format (for round trips)
+            Relative dates like 'Feb 15' or 'next friday' are resolved against today
         adults: Number of adult passengers (default: 1)
         children: Number of child passengers (default: 0)
+        max_price: Optional maximum price in USD
+        max_stops: Optional maximum number of stops (0 for nonstop only)
+        max_duration_minutes: Optional maximum total travel time in minutes
+        depart_after_hour: Optional earliest departure hour (0-23)
+        depart_before_hour: Optional latest departure hour, exclusive (0-23)
+        priority: How to rank the options: 'balanced' (default), 'cheapest' or 'fastest'
     
     Returns:
-        JSON string containing flight search results
+        JSON string containing the best-ranked flight options that meet the constraints
         
     Example:
-        >>> results = search_flights('JFK', 'LHR', '2025-12-01', '2025-12-10', adults=2)
+        >>> results = search_flights('JFK', 'LHR', '2025-12-01', '2025-12-10', adults=2, max_stops=0)
     """
-    # Ensure proper integer types (in case they're passed as strings)
-    adults = int(float(adults)) if adults else 1
-    children = int(float(children)) if children else 0
+    return search_flights_with_records(
+        departure_airport, arrival_airport, outbound_date, return_date, adults, children,
+        max_price, max_stops, max_duration_minutes, depart_after_hour, depart_before_hour, priority
+    )[0]
+
+
+def search_flights_with_records(departure_airport: str, arrival_airport: str, outbound_date: str, return_date: str = None, adults: int = 1, children: int = 0,
+                                max_price: float = None, max_stops: int = None, max_duration_minutes: int = None,
+                                depart_after_hour: int = None, depart_before_hour: int = None,
+                                priority: str = 'balanced') -> Tuple[str, List[dict]]:
+    """
+    Run search_flights and also return every option parsed into flat records.
+
+    Returns:
+        (JSON string for the model, records from tools.records.flight_records)
+    """
+    # Validate and normalize the model's arguments before spending a request
+    try:
+        args = validate_flight_args({
+            'departure_airport': departure_airport, 'arrival_airport': arrival_airport,
+            'outbound_date': outbound_date, 'return_date': return_date,
+            'adults': adults, 'children': children,
+            'max_price': max_price, 'max_stops': max_stops, 'max_duration_minutes': max_duration_minutes,
+            'depart_after_hour': depart_after_hour, 'depart_before_hour': depart_before_hour,
+            'priority': priority,
+        })
+    except ToolArgumentError as e:
+        print(f"[DEBUG] Rejected flight search locally: {e}")
+        return invalid_arguments_result(e), []
+    departure_airport, arrival_airport = args['departure_airport'], args['arrival_airport']
+    outbound_date, return_date = args['outbound_date'], args['return_date']
+    adults = args['adults'] or 1
+    children = args['children'] or 0
     
     # Build search parameters
     params = {
@@ -55,36 +99,56 @@ def search_flights(departure_airport: str, arrival_airport: str, outbound_date:
     try:
         # Execute the search
         print(f"[DEBUG] Searching flights: {departure_airport} → {arrival_airport}, {outbound_date}")
-        search = serpapi.search(params)
+        data = serpapi_search(params)
         
         # Check if we have data
-        if not hasattr(search, 'data') or not search.data:
+        if not data:
             return json.dumps({
                 "error": "No data returned from SerpAPI",
                 "params_used": {k: v for k, v in params.items() if k != 'api_key'}
-            }, indent=2)
+            }, indent=2), []
         
-        # Try to get best flights first
-        results = search.data.get('best_flights', [])
+        # Every option - best flights first, then the others
+        results = flight_options(data)
         
-        # If no best flights, try other flights
-        if not results:
-            results = search.data.get('other_flights', [])
-        
-        # If still no results, return what we got
+        # If no results, return what we got
         if not results:
             return json.dumps({
                 "error": "No flights found",
-                "available_keys": list(search.data.keys()),
+                "available_keys": list(data.keys()),
+                "params_used": {k: v for k, v in params.items() if k != 'api_key'}
+            }, indent=2), []
+        
+        # Rank every option under the user's constraints and keep the best k
+        records = flight_records(data)
+        constraints = {
+            name: args[name]
+            for name in ('max_price', 'max_stops', 'max_duration_minutes', 'depart_after_hour', 'depart_before_hour')
+        }
+        ranked = rank_records(records, 'flights', constraints, args['priority'] or 'balanced', get_search_top_k())
+        print(f"[DEBUG] Found {len(results)} flight options, {len(ranked)} shown after ranking")
+        if not ranked:
+            return json.dumps({
+                "error": "No flights match the requested constraints",
+                "total_results": len(results),
+                "constraints": {k: v for k, v in constraints.items() if v is not None},
                 "params_used": {k: v for k, v in params.items() if k != 'api_key'}
-            }, indent=2)
+            }, indent=2), records
         
         # Return formatted JSON results
-        print(f"[DEBUG] Found {len(results)} flight options")
-        return json.dumps(results[:5], indent=2)  # Limit to top 5
+        return json.dumps([results[records[i]['id'] - 1] for i in ranked], indent=2), records
+        
+    except UpstreamTimeout as e:
+        # Structured result so the agent can explain the timeout to the user
+        return json.dumps({
+            "error": f"Flight search timed out: {str(e)}",
+            "timed_out": True,
+            "timeout_seconds": round(e.timeout, 1),
+            "params_used": {k: v for k, v in params.items() if k != 'api_key'}
+        }, indent=2), []
         
     except Exception as e:
         return json.dumps({
             "error": f"Flight search failed: {str(e)}",
             "params_used": {k: v for k, v in params.items() if k != 'api_key'}
-        }, indent=2)
\ No newline at end of file
+        }, indent=2), []
\ No newline at end of file
@@ -5,13 +5,19 @@ This tool searches for hotels in a specified location with given dates.
 
 import os
 import json
-import serpapi
 from dotenv import load_dotenv
+from typing import List, Tuple
+from tools.upstream import serpapi_search, UpstreamTimeout
+from config.settings import get_search_top_k
+from tools.records import hotel_records
+from tools.ranking import rank_records
+from tools.validation import validate_hotel_args, invalid_arguments_result, ToolArgumentError
 
 # Ensure .env is loaded
 load_dotenv()
 
-def search_hotels(location: str, check_in_date: str, check_out_date: str, adults: int = 1, children: int = 0, rooms: int = 1, hotel_class: str = None, sort_by: int = 8) -> str:
+def search_hotels(location: str, check_in_date: str, check_out_date: str, adults: int = 1, children: int = 0, rooms: int = 1, hotel_class: str = None, sort_by: int = 8,
+                  max_price: float = None, min_rating: float = None, amenity: str = None, priority: str = 'balanced') -> str:
     """
     Search for hotels using Google Hotels engine via SERP API.
     
@@ -19,24 +25,55 @@ def search_hotels(location: str, check_in_date: str, check_out_date: str, adults
         location: Location to search for hotels (e.g., 'New York', 'Paris', 'Tokyo')
         check_in_date: Check-in date in YYYY-MM-DD format
         check_out_date: Check-out date in YYYY-MM-DD format
+            Relative dates like 'Feb 15' or 'next friday' are resolved against today
         adults: Number of adults (default: 1)
         children: Number of children (default: 0)
         rooms: Number of rooms needed (default: 1)
         hotel_class: Optional hotel star rating filter (e.g., '3,4,5' for 3-5 star hotels)
         sort_by: Sort order parameter (default: 8 for highest rating)
+        max_price: Optional maximum price per night in USD
+        min_rating: Optional minimum guest rating (out of 5)
+        amenity: Optional amenity every hotel must have (e.g., 'pool', 'free wi-fi')
+        priority: How to rank the hotels: 'balanced' (default), 'cheapest' or 'top_rated'
     
     Returns:
-        JSON string containing hotel search results (top 5 properties)
+        JSON string containing the best-ranked properties that meet the constraints
         
     Example:
         >>> results = search_hotels('Paris', '2025-12-01', '2025-12-05', adults=2, hotel_class='4,5')
     """
-    
-    # Ensure proper integer types
-    adults = int(float(adults)) if adults else 1
-    children = int(float(children)) if children else 0
-    rooms = int(float(rooms)) if rooms else 1
-    sort_by = int(float(sort_by)) if sort_by else 8
+    return search_hotels_with_records(
+        location, check_in_date, check_out_date, adults, children, rooms, hotel_class, sort_by,
+        max_price, min_rating, amenity, priority
+    )[0]
+
+
+def search_hotels_with_records(location: str, check_in_date: str, check_out_date: str, adults: int = 1, children: int = 0, rooms: int = 1, hotel_class: str = None, sort_by: int = 8,
+                               max_price: float = None, min_rating: float = None, amenity: str = None,
+                               priority: str = 'balanced') -> Tuple[str, List[dict]]:
+    """
+    Run search_hotels and also return every option parsed into flat records.
+
+    Returns:
+        (JSON string for the model, records from tools.records.hotel_records)
+    """
+    # Validate and normalize the model's arguments before spending a request
+    try:
+        args = validate_hotel_args({
+            'location': location, 'check_in_date': check_in_date, 'check_out_date': check_out_date,
+            'adults': adults, 'children': children, 'rooms': rooms,
+            'hotel_class': hotel_class, 'sort_by': sort_by,
+            'max_price': max_price, 'min_rating': min_rating, 'amenity': amenity, 'priority': priority,
+        })
+    except ToolArgumentError as e:
+        print(f"[DEBUG] Rejected hotel search locally: {e}")
+        return invalid_arguments_result(e), []
+    location, check_in_date, check_out_date = args['location'], args['check_in_date'], args['check_out_date']
+    adults = args['adults'] or 1
+    children = args['children'] or 0
+    rooms = args['rooms'] or 1
+    hotel_class = args['hotel_class']
+    sort_by = args['sort_by'] or 8
     
     # Build search parameters
     params = {
@@ -61,28 +98,49 @@ def search_hotels(location: str, check_in_date: str, check_out_date: str, adults
     try:
         # Execute the search
         print(f"[DEBUG] Searching hotels: {location}, {check_in_date} to {check_out_date}")
-        search = serpapi.search(params)
+        data = serpapi_search(params)
         
         # Check if we have data
-        if not hasattr(search, 'data') or not search.data:
+        if not data:
             return json.dumps({
                 "error": "No data returned from SerpAPI",
                 "params_used": {k: v for k, v in params.items() if k != 'api_key'}
-            }, indent=2)
+            }, indent=2), []
         
-        # Get hotel results (top 5 properties)
-        results = search.data.get('properties', [])
+        # Get every hotel result
+        results = data.get('properties', [])
         
         if not results:
             return json.dumps({
                 "error": "No hotels found",
-                "available_keys": list(search.data.keys()),
+                "available_keys": list(data.keys()),
+                "params_used": {k: v for k, v in params.items() if k != 'api_key'}
+            }, indent=2), []
+        
+        # Rank every property under the user's constraints and keep the best k
+        records = hotel_records(data)
+        constraints = {name: args[name] for name in ('max_price', 'min_rating', 'amenity')}
+        ranked = rank_records(records, 'hotels', constraints, args['priority'] or 'balanced', get_search_top_k())
+        print(f"[DEBUG] Found {len(results)} hotel options, {len(ranked)} shown after ranking")
+        if not ranked:
+            return json.dumps({
+                "error": "No hotels match the requested constraints",
+                "total_results": len(results),
+                "constraints": {k: v for k, v in constraints.items() if v is not None},
                 "params_used": {k: v for k, v in params.items() if k != 'api_key'}
-            }, indent=2)
+            }, indent=2), records
         
         # Return formatted JSON results
-        print(f"[DEBUG] Found {len(results)} hotel options")
-        return json.dumps(results[:5], indent=2)
+        return json.dumps([results[records[i]['id'] - 1] for i in ranked], indent=2), records
+        
+    except UpstreamTimeout as e:
+        # Structured result so the agent can explain the timeout to the user
+        return json.dumps({
+            "error": f"Hotel search timed out: {str(e)}",
+            "timed_out": True,
+            "timeout_seconds": round(e.timeout, 1),
+            "params_used": {k: v for k, v in params.items() if k != 'api_key'}
+        }, indent=2), []
         
     except Exception as e:
-        return f"Hotel search failed: {str(e)}"
\ No newline at end of file
+        return f"Hotel search failed: {str(e)}", []
\ No newline at end of file
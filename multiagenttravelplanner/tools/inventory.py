@@ -0,0 +1,482 @@
+"""
+Local synthetic flight and hotel inventory, used as the search backend for load tests.
+A deterministic flight schedule (daily departures between every pair of
+known airports, nonstop and one-stop) and a hotel dataset with nightly
+rates are generated into SQLite, indexed by route/date and city/date.
+Searches are answered from it with Google Flights / Google Hotels shaped
+responses, so search_flights and search_hotels run unchanged without
+calling SerpAPI.
+"""
+
+import os
+import math
+import random
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from config.settings import get_search_backend_settings, get_today
+from tools import upstream
+from tools.validation import CITY_AIRPORTS
+
+# code: (city, airport name, latitude, longitude)
+AIRPORTS = {
+    'JFK': ('New York', 'John F. Kennedy International Airport', 40.64, -73.78),
+    'LGA': ('New York', 'LaGuardia Airport', 40.78, -73.87),
+    'EWR': ('New York', 'Newark Liberty International Airport', 40.69, -74.17),
+    'LHR': ('London', 'Heathrow Airport', 51.47, -0.45),
+    'LGW': ('London', 'Gatwick Airport', 51.15, -0.19),
+    'CDG': ('Paris', 'Paris Charles de Gaulle Airport', 49.01, 2.55),
+    'ORY': ('Paris', 'Paris Orly Airport', 48.73, 2.37),
+    'NRT': ('Tokyo', 'Narita International Airport', 35.77, 140.39),
+    'HND': ('Tokyo', 'Haneda Airport', 35.55, 139.78),
+    'LAX': ('Los Angeles', 'Los Angeles International Airport', 33.94, -118.41),
+    'SFO': ('San Francisco', 'San Francisco International Airport', 37.62, -122.38),
+    'SEA': ('Seattle', 'Seattle-Tacoma International Airport', 47.45, -122.31),
+    'ORD': ('Chicago', "O'Hare International Airport", 41.98, -87.90),
+    'MDW': ('Chicago', 'Chicago Midway International Airport', 41.79, -87.75),
+    'IAD': ('Washington', 'Washington Dulles International Airport', 38.95, -77.46),
+    'DCA': ('Washington', 'Ronald Reagan Washington National Airport', 38.85, -77.04),
+    'BOS': ('Boston', 'Logan International Airport', 42.36, -71.01),
+    'MIA': ('Miami', 'Miami International Airport', 25.80, -80.29),
+    'DEL': ('Delhi', 'Indira Gandhi International Airport', 28.56, 77.10),
+    'BOM': ('Mumbai', 'Chhatrapati Shivaji Maharaj International Airport', 19.09, 72.87),
+    'BLR': ('Bangalore', 'Kempegowda International Airport', 13.20, 77.71),
+    'DXB': ('Dubai', 'Dubai International Airport', 25.25, 55.36),
+    'SIN': ('Singapore', 'Singapore Changi Airport', 1.36, 103.99),
+    'HKG': ('Hong Kong', 'Hong Kong International Airport', 22.31, 113.92),
+    'BKK': ('Bangkok', 'Suvarnabhumi Airport', 13.69, 100.75),
+    'SYD': ('Sydney', 'Sydney Kingsford Smith Airport', -33.95, 151.18),
+    'FCO': ('Rome', 'Leonardo da Vinci-Fiumicino Airport', 41.80, 12.25),
+    'MAD': ('Madrid', 'Adolfo Suárez Madrid-Barajas Airport', 40.47, -3.57),
+    'BCN': ('Barcelona', 'Josep Tarradellas Barcelona-El Prat Airport', 41.30, 2.08),
+    'AMS': ('Amsterdam', 'Amsterdam Airport Schiphol', 52.31, 4.77),
+    'FRA': ('Frankfurt', 'Frankfurt Airport', 50.04, 8.56),
+    'IST': ('Istanbul', 'Istanbul Airport', 41.26, 28.74),
+    'YYZ': ('Toronto', 'Toronto Pearson International Airport', 43.68, -79.63),
+}
+
+# Connection airports for one-stop itineraries
+HUBS = ('DXB', 'IST', 'FRA', 'AMS', 'LHR', 'ORD', 'SIN', 'HKG', 'CDG', 'JFK')
+
+AIRLINES = {
+    'AA': 'American', 'DL': 'Delta', 'UA': 'United', 'B6': 'JetBlue', 'AS': 'Alaska',
+    'AC': 'Air Canada', 'BA': 'British Airways', 'VS': 'Virgin Atlantic', 'AF': 'Air France',
+    'KL': 'KLM', 'LH': 'Lufthansa', 'IB': 'Iberia', 'AZ': 'ITA Airways', 'TK': 'Turkish Airlines',
+    'EK': 'Emirates', 'QR': 'Qatar Airways', 'AI': 'Air India', '6E': 'IndiGo',
+    'SQ': 'Singapore Airlines', 'CX': 'Cathay Pacific', 'TG': 'Thai Airways', 'NH': 'ANA',
+    'JL': 'Japan Airlines', 'QF': 'Qantas',
+}
+
+AIRPLANES = ('Airbus A320', 'Airbus A321neo', 'Boeing 737', 'Boeing 787', 'Airbus A350', 'Boeing 777')
+
+HOTEL_NAME_PARTS = (
+    ('Grand', 'Royal', 'Park', 'City', 'Harbor', 'Central', 'Garden', 'Riverside', 'Plaza', 'Metro',
+     'Heritage', 'Skyline', 'Old Town', 'Station', 'Marina', 'Boulevard'),
+    ('Hotel', 'Inn', 'Suites', 'Residences', 'Lodge', 'Palace', 'House', 'Hostel'),
+)
+
+AMENITIES = (
+    'Free Wi-Fi', 'Pool', 'Fitness centre', 'Spa', 'Restaurant', 'Bar', 'Airport shuttle',
+    'Free breakfast', 'Parking', 'Pet-friendly', 'Air conditioning', 'Room service', 'Kitchen',
+    'Business centre',
+)
+
+# Nightly base price range per hotel class
+HOTEL_CLASS_PRICES = {2: (60, 110), 3: (90, 180), 4: (160, 320), 5: (300, 700)}
+
+# Airports closer than this are the same metro area; no flights between them
+MIN_ROUTE_KM = 150
+
+# Hotel cities: airport list -> first alias naming it ('JFK,LGA,EWR' -> 'new york')
+HOTEL_CITIES: Dict[str, str] = {}
+for _alias, _codes in CITY_AIRPORTS.items():
+    HOTEL_CITIES.setdefault(_codes, _alias)
+_ALIASES_LONGEST_FIRST = sorted(CITY_AIRPORTS, key=len, reverse=True)
+
+# Options returned as best_flights (the rest are other_flights)
+BEST_FLIGHTS = 3
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE flights (
+    origin TEXT, destination TEXT, date TEXT, departure_minute INTEGER,
+    airline TEXT, flight_number TEXT, airplane TEXT, leg_minutes INTEGER,
+    layover TEXT, layover_minutes INTEGER, connection_minutes INTEGER,
+    connection_airline TEXT, connection_flight_number TEXT, price INTEGER
+);
+CREATE TABLE hotels (
+    id INTEGER PRIMARY KEY, city TEXT, name TEXT, hotel_class INTEGER,
+    rating REAL, reviews INTEGER, amenities TEXT
+);
+CREATE TABLE hotel_rates (hotel_id INTEGER, city TEXT, date TEXT, price INTEGER);
+"""
+
+INDEXES = """
+CREATE INDEX flights_route_date ON flights (origin, destination, date);
+CREATE INDEX hotel_rates_city_date ON hotel_rates (city, date);
+"""
+
+
+def _distance_km(a: str, b: str) -> float:
+    """Great-circle distance between two airports."""
+    _, _, lat1, lon1 = AIRPORTS[a]
+    _, _, lat2, lon2 = AIRPORTS[b]
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+
+def _flight_minutes(a: str, b: str) -> int:
+    """Block time of a nonstop flight, rounded to 5 minutes."""
+    return int(round((_distance_km(a, b) / 820 * 60 + 35) / 5) * 5)
+
+
+def _demand(day: date) -> float:
+    """Price multiplier by day of week (Friday and Sunday peaks)."""
+    return (1.0, 0.95, 0.95, 1.0, 1.15, 1.05, 1.12)[day.weekday()]
+
+
+def _city_key(location: str) -> Optional[str]:
+    """Inventory city for a hotel search location ('hotels in Paris, France' -> 'paris')."""
+    text = f" {' '.join(location.lower().replace(',', ' ').split())} "
+    for alias in _ALIASES_LONGEST_FIRST:
+        if f' {alias} ' in text:
+            return HOTEL_CITIES[CITY_AIRPORTS[alias]]
+    return None
+
+
+def _clock(day: date, minute: int) -> str:
+    """SerpAPI time text for minutes after midnight of a day (may roll over)."""
+    moment = datetime(day.year, day.month, day.day) + timedelta(minutes=minute)
+    return moment.strftime('%Y-%m-%d %H:%M')
+
+
+class Inventory:
+    """
+    SQLite-backed synthetic inventory answering SerpAPI flight and hotel searches.
+
+    Attributes:
+        path: SQLite database file
+        start: First date with generated inventory; searches for other dates
+               reuse the schedule of the same day in the generated window
+        days: Number of generated days
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        meta = dict(self._connection().execute("SELECT key, value FROM meta"))
+        self.start = date.fromisoformat(meta['start'])
+        self.days = int(meta['days'])
+        self.stats = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls) -> Optional['Inventory']:
+        """
+        Open the inventory configured by SEARCH_BACKEND / INVENTORY_* settings,
+        generating it first if the file does not exist. None when the backend is SerpAPI.
+        """
+        settings = get_search_backend_settings()
+        if settings['backend'] != 'inventory':
+            return None
+        if not os.path.exists(settings['path']):
+            generate_inventory(settings['path'], get_today(), settings['days'],
+                               settings['hotels_per_city'], settings['seed'])
+        return cls(settings['path'])
+
+    def _connection(self) -> sqlite3.Connection:
+        """Read-only connection for the calling thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.connection = connection
+        return connection
+
+    def _inventory_date(self, requested: date) -> str:
+        """Generated date whose schedule serves a requested date."""
+        return (self.start + timedelta(days=(requested - self.start).days % self.days)).isoformat()
+
+    def search(self, params: dict) -> dict:
+        """
+        Answer a SerpAPI request (google_flights or google_hotels engine).
+
+        Args:
+            params: SerpAPI query parameters as built by the search tools
+
+        Returns:
+            Response data shaped like SerpAPI's
+
+        Raises:
+            ValueError: For an engine the inventory does not serve
+        """
+        engine = params.get('engine')
+        self.stats[engine] += 1
+        if engine == 'google_flights':
+            return self.search_flights(params)
+        if engine == 'google_hotels':
+            return self.search_hotels(params)
+        raise ValueError(f"Inventory backend cannot serve engine '{engine}'")
+
+    def search_flights(self, params: dict) -> dict:
+        """Google Flights shaped response for departure_id/arrival_id/outbound_date."""
+        origins = [code.strip().upper() for code in str(params.get('departure_id', '')).split(',') if code.strip()]
+        destinations = [code.strip().upper() for code in str(params.get('arrival_id', '')).split(',') if code.strip()]
+        day = date.fromisoformat(str(params['outbound_date']))
+        passengers = int(params.get('adults') or 1) + 0.75 * int(params.get('children') or 0)
+        round_trip = bool(params.get('return_date'))
+
+        rows = self._connection().execute(
+            f"SELECT origin, destination, departure_minute, airline, flight_number, airplane, leg_minutes, "
+            f"layover, layover_minutes, connection_minutes, connection_airline, connection_flight_number, price "
+            f"FROM flights WHERE origin IN ({','.join('?' * len(origins))}) "
+            f"AND destination IN ({','.join('?' * len(destinations))}) AND date = ?",
+            (*origins, *destinations, self._inventory_date(day))
+        ).fetchall()
+
+        options = [self._flight_option(row, day, passengers, round_trip) for row in rows]
+        if not options:
+            return {'search_metadata': {'status': 'Success', 'backend': 'inventory'}, 'search_parameters': params}
+        cheapest = min(option['price'] for option in options)
+        fastest = min(option['total_duration'] for option in options)
+        options.sort(key=lambda option: option['price'] / cheapest + option['total_duration'] / fastest)
+        best = options[:BEST_FLIGHTS]
+        other = sorted(options[BEST_FLIGHTS:], key=lambda option: option['flights'][0]['departure_airport']['time'])
+        return {
+            'search_metadata': {'status': 'Success', 'backend': 'inventory'},
+            'search_parameters': {k: v for k, v in params.items() if k != 'api_key'},
+            'best_flights': best,
+            'other_flights': other,
+        }
+
+    @staticmethod
+    def _flight_leg(origin: str, destination: str, day: date, departure: int, minutes: int,
+                    airline: str, flight_number: str, airplane: str) -> dict:
+        return {
+            'departure_airport': {'name': AIRPORTS[origin][1], 'id': origin, 'time': _clock(day, departure)},
+            'arrival_airport': {'name': AIRPORTS[destination][1], 'id': destination,
+                                'time': _clock(day, departure + minutes)},
+            'duration': minutes,
+            'airplane': airplane,
+            'airline': AIRLINES[airline],
+            'travel_class': 'Economy',
+            'flight_number': flight_number,
+        }
+
+    def _flight_option(self, row, day: date, passengers: float, round_trip: bool) -> dict:
+        (origin, destination, departure, airline, flight_number, airplane, leg_minutes,
+         layover, layover_minutes, connection_minutes, connection_airline, connection_flight_number, price) = row
+        if layover:
+            legs = [
+                self._flight_leg(origin, layover, day, departure, leg_minutes, airline, flight_number, airplane),
+                self._flight_leg(layover, destination, day, departure + leg_minutes + layover_minutes,
+                                 connection_minutes, connection_airline, connection_flight_number, airplane),
+            ]
+            layovers = [{'duration': layover_minutes, 'name': AIRPORTS[layover][1], 'id': layover}]
+            total = leg_minutes + layover_minutes + connection_minutes
+        else:
+            legs = [self._flight_leg(origin, destination, day, departure, leg_minutes, airline, flight_number, airplane)]
+            layovers = []
+            total = leg_minutes
+        return {
+            'flights': legs,
+            'layovers': layovers,
+            'total_duration': total,
+            'price': int(round(price * passengers * (1.85 if round_trip else 1.0))),
+            'type': 'Round trip' if round_trip else 'One way',
+        }
+
+    def search_hotels(self, params: dict) -> dict:
+        """Google Hotels shaped response for q/check_in_date/check_out_date."""
+        check_in = date.fromisoformat(str(params['check_in_date']))
+        check_out = date.fromisoformat(str(params['check_out_date']))
+        nights = max(1, (check_out - check_in).days)
+        rooms = int(params.get('rooms') or 1)
+        city = _city_key(str(params.get('q', '')))
+        metadata = {'status': 'Success', 'backend': 'inventory'}
+        search_parameters = {k: v for k, v in params.items() if k != 'api_key'}
+        if city is None:
+            return {'search_metadata': metadata, 'search_parameters': search_parameters}
+
+        dates = [self._inventory_date(check_in + timedelta(days=night)) for night in range(nights)]
+        connection = self._connection()
+        totals = defaultdict(int)
+        for night_date in set(dates):
+            repeats = dates.count(night_date)
+            for hotel_id, price in connection.execute(
+                "SELECT hotel_id, price FROM hotel_rates WHERE city = ? AND date = ?", (city, night_date)
+            ):
+                totals[hotel_id] += price * repeats
+
+        wanted_classes = {int(star) for star in str(params['hotel_class']).split(',')} if params.get('hotel_class') else None
+        properties = []
+        for hotel_id, name, hotel_class, rating, reviews, amenities in connection.execute(
+            "SELECT id, name, hotel_class, rating, reviews, amenities FROM hotels WHERE city = ?", (city,)
+        ):
+            if hotel_id not in totals or (wanted_classes and hotel_class not in wanted_classes):
+                continue
+            nightly = int(round(totals[hotel_id] / nights))
+            total = totals[hotel_id] * rooms
+            properties.append({
+                'type': 'hotel',
+                'name': name,
+                'link': f"https://inventory.local/hotels/{hotel_id}",
+                'check_in_time': '3:00 PM',
+                'check_out_time': '11:00 AM',
+                'rate_per_night': {'lowest': f"${nightly}", 'extracted_lowest': nightly},
+                'total_rate': {'lowest': f"${total}", 'extracted_lowest': total},
+                'hotel_class': f"{hotel_class}-star hotel",
+                'extracted_hotel_class': hotel_class,
+                'overall_rating': rating,
+                'reviews': reviews,
+                'amenities': amenities.split('|'),
+            })
+
+        sort_by = int(params.get('sort_by') or 0)
+        if sort_by == 3:
+            properties.sort(key=lambda hotel: hotel['rate_per_night']['extracted_lowest'])
+        elif sort_by == 8:
+            properties.sort(key=lambda hotel: (-hotel['overall_rating'], -hotel['reviews']))
+        elif sort_by == 13:
+            properties.sort(key=lambda hotel: -hotel['reviews'])
+        else:
+            properties.sort(key=lambda hotel: -hotel['overall_rating'] * math.log1p(hotel['reviews']))
+        return {'search_metadata': metadata, 'search_parameters': search_parameters, 'properties': properties}
+
+
+def generate_inventory(path: str, start: date, days: int = 90, hotels_per_city: int = 40, seed: int = 7) -> str:
+    """
+    Generate a synthetic inventory database.
+
+    The same arguments always produce the same inventory. The file is
+    written next to path and moved into place when complete, so readers
+    never see a partial database.
+
+    Args:
+        path: SQLite file to create (replaced if it exists)
+        start: First date of the schedule (usually today)
+        days: Number of days of flights and hotel rates
+        hotels_per_city: Hotels generated per city
+        seed: Random seed
+
+    Returns:
+        The path written
+    """
+    rng = random.Random(seed)
+    print(f"🏗️  Generating synthetic inventory ({days} days from {start}) into {path}...")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    partial = f"{path}.{os.getpid()}.partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    connection = sqlite3.connect(partial)
+    connection.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+    connection.executemany("INSERT INTO meta VALUES (?, ?)",
+                           [('start', start.isoformat()), ('days', str(days)), ('seed', str(seed))])
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+
+    flight_rows = 0
+    for origin in AIRPORTS:
+        for destination in AIRPORTS:
+            if origin == destination or _distance_km(origin, destination) < MIN_ROUTE_KM:
+                continue
+            schedule = _route_schedule(rng, origin, destination)
+            rows = []
+            for day in dates:
+                demand = _demand(day)
+                day_text = day.isoformat()
+                for flight in schedule:
+                    price = int(flight['price'] * demand * rng.uniform(0.9, 1.15))
+                    rows.append((origin, destination, day_text, flight['departure'], flight['airline'],
+                                 flight['flight_number'], flight['airplane'], flight['leg_minutes'],
+                                 flight['layover'], flight['layover_minutes'], flight['connection_minutes'],
+                                 flight['connection_airline'], flight['connection_flight_number'], price))
+            connection.executemany("INSERT INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            flight_rows += len(rows)
+
+    hotel_id = 0
+    rate_rows = 0
+    for city in sorted(set(HOTEL_CITIES.values())):
+        combinations = [f"{prefix} {city.title()} {suffix}"
+                        for prefix in HOTEL_NAME_PARTS[0] for suffix in HOTEL_NAME_PARTS[1]]
+        names = rng.sample(combinations, min(hotels_per_city, len(combinations)))
+        names += [f"{rng.choice(combinations)} {number}" for number in range(len(names) + 1, hotels_per_city + 1)]
+        for name in names:
+            hotel_id += 1
+            hotel_class = rng.choices((2, 3, 4, 5), weights=(2, 4, 4, 2))[0]
+            rating = round(min(5.0, max(2.5, rng.gauss(3.4 + 0.25 * hotel_class, 0.35))), 1)
+            reviews = int(rng.lognormvariate(6.5, 1.0))
+            amenities = rng.sample(AMENITIES, rng.randint(3, 3 + hotel_class * 2))
+            connection.execute("INSERT INTO hotels VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               (hotel_id, city, name, hotel_class, rating, reviews, '|'.join(amenities)))
+            base = rng.uniform(*HOTEL_CLASS_PRICES[hotel_class])
+            rates = [(hotel_id, city, day.isoformat(), int(base * _demand(day) * rng.uniform(0.85, 1.2)))
+                     for day in dates]
+            connection.executemany("INSERT INTO hotel_rates VALUES (?, ?, ?, ?)", rates)
+            rate_rows += len(rates)
+
+    connection.executescript(INDEXES + "ANALYZE;")
+    connection.commit()
+    connection.close()
+    os.replace(partial, path)
+    print(f"✅ Inventory ready: {flight_rows:,} flights, {hotel_id:,} hotels, {rate_rows:,} nightly rates")
+    return path
+
+
+def _route_schedule(rng: random.Random, origin: str, destination: str) -> List[dict]:
+    """Daily departures of one route: a few nonstops (if in range) and one-stop connections."""
+    distance = _distance_km(origin, destination)
+    carriers = rng.sample(sorted(AIRLINES), 3)
+    base_price = 60 + distance * 0.085
+    schedule = []
+    if distance < 12000:
+        for _ in range(rng.randint(1, 4)):
+            airline = rng.choice(carriers)
+            schedule.append({
+                'departure': rng.randrange(6 * 12, 23 * 12) * 5,
+                'airline': airline,
+                'flight_number': f"{airline} {rng.randint(10, 2999)}",
+                'airplane': rng.choice(AIRPLANES[3:] if distance > 4000 else AIRPLANES[:3]),
+                'leg_minutes': _flight_minutes(origin, destination),
+                'layover': None, 'layover_minutes': None, 'connection_minutes': None,
+                'connection_airline': None, 'connection_flight_number': None,
+                'price': base_price * rng.uniform(1.0, 1.3),
+            })
+    hubs = [hub for hub in HUBS if hub not in (origin, destination)
+            and _distance_km(origin, hub) >= MIN_ROUTE_KM and _distance_km(hub, destination) >= MIN_ROUTE_KM
+            and _distance_km(origin, hub) + _distance_km(hub, destination) < distance * 1.6 + 2000]
+    for hub in rng.sample(hubs, min(len(hubs), rng.randint(2, 5))):
+        airline = rng.choice(carriers)
+        connection_airline = rng.choice(carriers)
+        schedule.append({
+            'departure': rng.randrange(0, 24 * 12) * 5,
+            'airline': airline,
+            'flight_number': f"{airline} {rng.randint(10, 2999)}",
+            'airplane': rng.choice(AIRPLANES),
+            'leg_minutes': _flight_minutes(origin, hub),
+            'layover': hub,
+            'layover_minutes': rng.randrange(12, 60) * 5,
+            'connection_minutes': _flight_minutes(hub, destination),
+            'connection_airline': connection_airline,
+            'connection_flight_number': f"{connection_airline} {rng.randint(10, 2999)}",
+            'price': base_price * rng.uniform(0.7, 1.05),
+        })
+    return schedule
+
+
+def install_inventory(inventory: Inventory) -> None:
+    """
+    Serve SerpAPI flight and hotel searches from a local inventory.
+
+    Install it before the cassette and search cache, which wrap whatever
+    transport is current.
+
+    Args:
+        inventory: The inventory to search
+    """
+    upstream.set_transport('serpapi', inventory.search)
+    print(f"🗃️  Search backend: local inventory {inventory.path} "
+          f"({inventory.days} days from {inventory.start})")
@@ -5,8 +5,10 @@ destinations, attractions, and travel-related topics.
 """
 
 import os
+import json
 from langchain_tavily import TavilySearch
 from dotenv import load_dotenv
+from tools.upstream import tavily_search, UpstreamTimeout
 
 # Ensure .env is loaded
 load_dotenv()
@@ -22,4 +24,47 @@ def create_itinerary_tool():
         Requires TAVILY_API_KEY to be set in environment variables
     """
     tool = TavilySearch(max_results=5)
-    return tool
\ No newline at end of file
+    return tool
+
+def search_itinerary(tool, query: str) -> str:
+    """
+    Run a Tavily search within the request budget.
+    
+    Args:
+        tool: TavilySearch instance from create_itinerary_tool()
+        query: What to search for
+        
+    Returns:
+        JSON string with the search results, or a structured
+        "timed out" result the agent can explain to the user
+    """
+    try:
+        return json.dumps(tavily_search(tool, query), indent=2)
+    except UpstreamTimeout as e:
+        return json.dumps({
+            "error": f"Web search timed out: {str(e)}",
+            "timed_out": True,
+            "timeout_seconds": round(e.timeout, 1),
+            "query": query
+        }, indent=2)
+
+
+def create_search_executors(tool) -> dict:
+    """
+    Map every name the model may use for the Tavily tool to search_itinerary.
+
+    Args:
+        tool: TavilySearch instance from create_itinerary_tool()
+
+    Returns:
+        Mapping of tool name to executor, for src.agent_loop.run_agent_loop
+    """
+    def run_search(args):
+        # Execute the search and hand the model readable JSON
+        return search_itinerary(tool, args['query'])
+
+    # Accept multiple tool name variations
+    return {
+        name: run_search
+        for name in ['tavily_search_results_json', 'TavilySearch', 'tavily_search', tool.name]
+    }
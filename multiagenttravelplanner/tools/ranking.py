@@ -0,0 +1,149 @@
+"""
+Vectorized ranking of flight and hotel search results.
+Every option SerpAPI returns is loaded into columnar NumPy arrays (price,
+duration, stops, departure hour, rating, class); the user's constraints
+become boolean masks and their priorities a weighted score, so only the
+best k options are shown to the model regardless of how many came back.
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from tools.result_query import FLIGHT_FILTERS, HOTEL_FILTERS, matches_filter
+
+# Numeric columns loaded per kind (missing values become NaN)
+COLUMNS = {
+    'flights': ('price', 'total_duration', 'stops', 'departure_hour'),
+    'hotels': ('price', 'rating', 'hotel_class', 'reviews'),
+}
+
+FILTERS = {
+    'flights': FLIGHT_FILTERS,
+    'hotels': HOTEL_FILTERS,
+}
+
+# Score weights per priority. Negative weights mean lower is better.
+WEIGHT_PROFILES: Dict[str, Dict[str, Dict[str, float]]] = {
+    'flights': {
+        'balanced': {'price': -0.5, 'total_duration': -0.3, 'stops': -0.2},
+        'cheapest': {'price': -1.0},
+        'fastest': {'total_duration': -0.8, 'stops': -0.2},
+    },
+    'hotels': {
+        'balanced': {'price': -0.4, 'rating': 0.4, 'hotel_class': 0.1, 'reviews': 0.1},
+        'cheapest': {'price': -1.0},
+        'top_rated': {'rating': 0.7, 'reviews': 0.3},
+    },
+}
+
+_NUMERIC_OPERATORS = {
+    '<=': np.less_equal,
+    '<': np.less,
+    '>=': np.greater_equal,
+}
+
+
+def to_columns(records: List[dict], fields) -> Dict[str, np.ndarray]:
+    """
+    Load record fields into float arrays.
+
+    Args:
+        records: Records from tools.records
+        fields: Field names to load
+
+    Returns:
+        Mapping of field name to array (NaN where a record has no value)
+    """
+    return {
+        field: np.array(
+            [np.nan if record.get(field) is None else record[field] for record in records],
+            dtype=float
+        )
+        for field in fields
+    }
+
+
+def constraint_mask(records: List[dict], columns: Dict[str, np.ndarray], kind: str,
+                    constraints: Dict[str, object]) -> np.ndarray:
+    """
+    Boolean mask of the records meeting every constraint.
+
+    Numeric constraints are evaluated on the columns; text constraints
+    (airline, amenity, ...) fall back to a per-record check. Records with
+    a missing value never meet a constraint on that field.
+    """
+    filters = FILTERS[kind]
+    mask = np.ones(len(records), dtype=bool)
+    for name, wanted in constraints.items():
+        if wanted is None:
+            continue
+        field, operator = filters[name]
+        if operator in _NUMERIC_OPERATORS and field in columns:
+            with np.errstate(invalid='ignore'):
+                mask &= _NUMERIC_OPERATORS[operator](columns[field], float(wanted))
+        else:
+            mask &= np.fromiter(
+                (matches_filter(record.get(field), operator, wanted) for record in records),
+                dtype=bool, count=len(records)
+            )
+    return mask
+
+
+def score_columns(columns: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+    """
+    Weighted score per row, from columns min-max scaled to [0, 1].
+
+    A missing value scores as the worst value of its column.
+    """
+    size = len(next(iter(columns.values()))) if columns else 0
+    scores = np.zeros(size)
+    for field, weight in weights.items():
+        column = columns[field]
+        if size == 0 or np.isnan(column).all():
+            continue
+        low, high = np.nanmin(column), np.nanmax(column)
+        scaled = (column - low) / (high - low) if high > low else np.zeros(size)
+        goodness = scaled if weight > 0 else 1.0 - scaled
+        scores += abs(weight) * np.nan_to_num(goodness, nan=0.0)
+    return scores
+
+
+def rank_records(records: List[dict], kind: str, constraints: Optional[Dict[str, object]] = None,
+                 priority: str = 'balanced', k: int = 5) -> List[int]:
+    """
+    Pick the best k records that meet the user's constraints.
+
+    Args:
+        records: Records from tools.records (flight_records or hotel_records)
+        kind: 'flights' or 'hotels'
+        constraints: Filter values keyed like FLIGHT_FILTERS / HOTEL_FILTERS;
+                     None values are ignored
+        priority: Weight profile name from WEIGHT_PROFILES
+        k: Number of records to return
+
+    Returns:
+        Indices into records, best first (empty if nothing matches)
+
+    Raises:
+        ValueError: If the priority is not a known profile
+    """
+    profiles = WEIGHT_PROFILES[kind]
+    if priority not in profiles:
+        raise ValueError(f"Unknown priority '{priority}'. Expected one of: {', '.join(profiles)}")
+    if not records:
+        return []
+
+    columns = to_columns(records, COLUMNS[kind])
+    candidates = np.flatnonzero(constraint_mask(records, columns, kind, constraints or {}))
+    if candidates.size == 0:
+        return []
+
+    scores = score_columns({field: column[candidates] for field, column in columns.items()}, profiles[priority])
+    k = min(k, candidates.size)
+    if k < candidates.size:
+        # Select the top k in linear time, then order just those
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(candidates.size)
+    # Highest score first; ties keep SerpAPI's order
+    order = top[np.lexsort((candidates[top], -scores[top]))]
+    return candidates[order].tolist()
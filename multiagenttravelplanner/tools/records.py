@@ -0,0 +1,98 @@
+"""
+Flat result records parsed from SerpAPI flight and hotel responses.
+Records keep only the fields users filter and sort on, so the last
+search can be stored in the graph state and queried locally.
+"""
+
+from typing import List, Optional
+
+
+def _departure_hour(time_text) -> Optional[int]:
+    """Hour of day from a SerpAPI time like '2026-02-15 08:35'."""
+    try:
+        return int(str(time_text).split()[-1].split(':')[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def _number(value) -> Optional[float]:
+    """A numeric field, or None if missing or malformed."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).replace('$', '').replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def flight_options(data: dict) -> List[dict]:
+    """Every option of a Google Flights response: best_flights, then other_flights."""
+    return list(data.get('best_flights') or []) + list(data.get('other_flights') or [])
+
+
+def flight_records(data: dict) -> List[dict]:
+    """
+    Parse every option of a Google Flights response.
+
+    Args:
+        data: SerpAPI response (best_flights and other_flights)
+
+    Returns:
+        One record per option; 'id' is the 1-based position in flight_options(data)
+    """
+    best_count = len(data.get('best_flights') or [])
+    records = []
+    for position, option in enumerate(flight_options(data)):
+        legs = option.get('flights') or []
+        if not legs:
+            continue
+        departure = legs[0].get('departure_airport') or {}
+        arrival = legs[-1].get('arrival_airport') or {}
+        layovers = option.get('layovers') or []
+        records.append({
+            'id': position + 1,
+            'airline': " / ".join(dict.fromkeys(leg.get('airline', '?') for leg in legs)),
+            'flight_numbers': ", ".join(leg.get('flight_number', '?') for leg in legs),
+            'departure_airport': departure.get('id'),
+            'departure_time': departure.get('time'),
+            'departure_hour': _departure_hour(departure.get('time')),
+            'arrival_airport': arrival.get('id'),
+            'arrival_time': arrival.get('time'),
+            'total_duration': _number(option.get('total_duration')),
+            'stops': len(layovers),
+            'layovers': [layover.get('id') for layover in layovers],
+            'travel_class': legs[0].get('travel_class'),
+            'price': _number(option.get('price')),
+            'best': position < best_count,
+        })
+    return records
+
+
+def hotel_records(data: dict) -> List[dict]:
+    """
+    Parse every property of a Google Hotels response.
+
+    Args:
+        data: SerpAPI response (properties)
+
+    Returns:
+        One record per property; 'id' is the 1-based position in data['properties']
+    """
+    records = []
+    for position, hotel in enumerate(data.get('properties') or []):
+        if not hotel.get('name'):
+            continue
+        records.append({
+            'id': position + 1,
+            'name': hotel['name'],
+            'hotel_class': _number(hotel.get('extracted_hotel_class')),
+            'rating': _number(hotel.get('overall_rating')),
+            'reviews': _number(hotel.get('reviews')),
+            'price': _number((hotel.get('rate_per_night') or {}).get('extracted_lowest')),
+            'total_price': _number((hotel.get('total_rate') or {}).get('extracted_lowest')),
+            'amenities': hotel.get('amenities') or [],
+            'link': hotel.get('link'),
+        })
+    return records
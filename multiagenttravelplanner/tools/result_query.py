@@ -0,0 +1,184 @@
+"""
+Local query tool over the records of the last flight or hotel search.
+Follow-ups like "only direct flights" or "cheapest 4-star" are answered by
+filtering, sorting and taking the top results of the stored search,
+without another SerpAPI call.
+"""
+
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+from langchain_core.tools import tool
+
+# Filter argument -> (record field, operator)
+FLIGHT_FILTERS: Dict[str, Tuple[str, str]] = {
+    'max_price': ('price', '<='),
+    'max_stops': ('stops', '<='),
+    'max_duration_minutes': ('total_duration', '<='),
+    'depart_after_hour': ('departure_hour', '>='),
+    'depart_before_hour': ('departure_hour', '<'),
+    'airline': ('airline', 'contains'),
+    'travel_class': ('travel_class', 'contains'),
+}
+
+HOTEL_FILTERS: Dict[str, Tuple[str, str]] = {
+    'max_price': ('price', '<='),
+    'min_rating': ('rating', '>='),
+    'min_class': ('hotel_class', '>='),
+    'min_reviews': ('reviews', '>='),
+    'amenity': ('amenities', 'contains'),
+    'name': ('name', 'contains'),
+}
+
+FLIGHT_SORT_FIELDS = ('price', 'total_duration', 'stops', 'departure_hour')
+HOTEL_SORT_FIELDS = ('price', 'rating', 'hotel_class', 'reviews', 'total_price')
+
+# A getter returning the stored search ({'args': ..., 'records': [...]}) or None
+SearchGetter = Callable[[], Optional[dict]]
+
+
+def matches_filter(value, operator: str, wanted) -> bool:
+    """Apply one filter to a record value; missing values never match."""
+    if value is None:
+        return False
+    if operator == 'contains':
+        values = value if isinstance(value, list) else [value]
+        return any(str(wanted).lower() in str(item).lower() for item in values)
+    if operator == '<=':
+        return value <= wanted
+    if operator == '<':
+        return value < wanted
+    return value >= wanted
+
+
+def query_records(records: List[dict], filters: Dict[str, Tuple[str, str]], criteria: dict,
+                  sort_by: str, descending: bool = False) -> List[dict]:
+    """
+    Filter and sort a list of result records.
+
+    Args:
+        records: Records from tools.records
+        filters: Mapping of criterion name to (record field, operator)
+        criteria: Criterion values; None means "not filtered"
+        sort_by: Record field to sort on (missing values sort last)
+        descending: Sort highest first
+
+    Returns:
+        Every matching record, best first
+    """
+    active = [(filters[name], wanted) for name, wanted in criteria.items() if wanted is not None]
+    matched = [
+        record for record in records
+        if all(matches_filter(record.get(field), operator, wanted) for (field, operator), wanted in active)
+    ]
+    present = [record for record in matched if record.get(sort_by) is not None]
+    missing = [record for record in matched if record.get(sort_by) is None]
+    present.sort(key=lambda record: record[sort_by], reverse=descending)
+    return present + missing
+
+
+def _run_query(kind: str, search: Optional[dict], filters, sort_fields, criteria: dict,
+               sort_by: str, descending: bool, limit: int) -> str:
+    """Shared body of the flight and hotel query tools."""
+    if not search or not search.get('records'):
+        return json.dumps({
+            "error": f"No previous {kind} search to refine - call search_{kind} first"
+        })
+    if sort_by not in sort_fields:
+        return json.dumps({
+            "error": f"Cannot sort by '{sort_by}'. Expected one of: {', '.join(sort_fields)}"
+        })
+    matched = query_records(search['records'], filters, criteria, sort_by, descending)
+    return json.dumps({
+        "search": search.get('args', {}),
+        "total_results": len(search['records']),
+        "matching_results": len(matched),
+        "results": matched[:max(1, limit)],
+    }, indent=2)
+
+
+def create_flight_query_tool(get_search: SearchGetter):
+    """
+    Create the query_results tool for the flight agent.
+
+    Args:
+        get_search: Returns the last flight search stored in the state
+
+    Returns:
+        A LangChain tool named query_results
+    """
+
+    @tool("query_results")
+    def query_results(max_price: Optional[float] = None, max_stops: Optional[int] = None,
+                      max_duration_minutes: Optional[int] = None,
+                      depart_after_hour: Optional[int] = None, depart_before_hour: Optional[int] = None,
+                      airline: Optional[str] = None, travel_class: Optional[str] = None,
+                      sort_by: str = 'price', descending: bool = False, limit: int = 5) -> str:
+        """
+        Filter and sort the flights from the previous search_flights call without searching again.
+        Use this for follow-ups that refine earlier results (e.g. "only direct flights" is max_stops=0,
+        "cheapest" is sort_by='price', "morning departures" is depart_before_hour=12).
+
+        Args:
+            max_price: Maximum price in USD
+            max_stops: Maximum number of stops (0 for nonstop)
+            max_duration_minutes: Maximum total travel time in minutes
+            depart_after_hour: Earliest departure hour (0-23)
+            depart_before_hour: Departure must be before this hour (0-23)
+            airline: Airline name to match
+            travel_class: Cabin class to match (e.g. 'Economy', 'Business')
+            sort_by: One of price, total_duration, stops, departure_hour
+            descending: Sort highest first
+            limit: Number of flights to return
+        """
+        criteria = {
+            'max_price': max_price, 'max_stops': max_stops,
+            'max_duration_minutes': max_duration_minutes,
+            'depart_after_hour': depart_after_hour, 'depart_before_hour': depart_before_hour,
+            'airline': airline, 'travel_class': travel_class,
+        }
+        return _run_query('flights', get_search(), FLIGHT_FILTERS, FLIGHT_SORT_FIELDS,
+                          criteria, sort_by, descending, limit)
+
+    return query_results
+
+
+def create_hotel_query_tool(get_search: SearchGetter):
+    """
+    Create the query_results tool for the hotel agent.
+
+    Args:
+        get_search: Returns the last hotel search stored in the state
+
+    Returns:
+        A LangChain tool named query_results
+    """
+
+    @tool("query_results")
+    def query_results(max_price: Optional[float] = None, min_rating: Optional[float] = None,
+                      min_class: Optional[int] = None, min_reviews: Optional[int] = None,
+                      amenity: Optional[str] = None, name: Optional[str] = None,
+                      sort_by: str = 'rating', descending: bool = True, limit: int = 5) -> str:
+        """
+        Filter and sort the hotels from the previous search_hotels call without searching again.
+        Use this for follow-ups that refine earlier results (e.g. "cheapest 4-star" is min_class=4 with
+        sort_by='price' and descending=False, "with a pool" is amenity='pool').
+
+        Args:
+            max_price: Maximum price per night in USD
+            min_rating: Minimum guest rating (out of 5)
+            min_class: Minimum hotel star class
+            min_reviews: Minimum number of reviews
+            amenity: Amenity to require (e.g. 'pool', 'free wi-fi')
+            name: Text to match in the hotel name
+            sort_by: One of price, rating, hotel_class, reviews, total_price
+            descending: Sort highest first
+            limit: Number of hotels to return
+        """
+        criteria = {
+            'max_price': max_price, 'min_rating': min_rating, 'min_class': min_class,
+            'min_reviews': min_reviews, 'amenity': amenity, 'name': name,
+        }
+        return _run_query('hotels', get_search(), HOTEL_FILTERS, HOTEL_SORT_FIELDS,
+                          criteria, sort_by, descending, limit)
+
+    return query_results
@@ -0,0 +1,184 @@
+"""
+Shared plumbing for calls to external services (SerpAPI, Tavily, OpenAI).
+Every upstream call runs with a timeout taken from the remaining request
+budget, so a slow service cannot stall a worker past its deadline.
+"""
+
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional
+import serpapi
+from config.settings import get_tool_timeout_seconds
+
+# Absolute deadline (time.time() seconds) of the request being processed.
+# Set by src.deadline.deadline_scope around each graph node.
+request_deadline: contextvars.ContextVar = contextvars.ContextVar("request_deadline", default=None)
+
+# Optional observer told when an upstream call starts and ends on a worker
+# thread, so per-request tooling (src/profiler.py) can follow the request
+# there. It must provide enter() -> token and exit(token).
+thread_observer: contextvars.ContextVar = contextvars.ContextVar("thread_observer", default=None)
+
+# Calls that time out keep running in the background until the remote side
+# gives up, so the pool is sized generously to avoid starving new calls.
+_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="upstream")
+
+
+class UpstreamTimeout(TimeoutError):
+    """Raised when an upstream call does not finish within its budget."""
+
+    def __init__(self, operation: str, timeout: float):
+        super().__init__(f"{operation} timed out after {timeout:.1f}s")
+        self.operation = operation
+        self.timeout = timeout
+
+
+def remaining_seconds() -> Optional[float]:
+    """
+    Seconds left before the current request's deadline.
+
+    Returns:
+        Remaining budget (may be negative), or None if no deadline is set
+    """
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def call_timeout(cap: Optional[float] = None) -> Optional[float]:
+    """
+    Timeout for the next upstream call: the remaining budget, bounded by cap.
+
+    Args:
+        cap: Per-call maximum in seconds (None for no cap)
+
+    Returns:
+        Timeout in seconds (never negative), or None for no limit
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return cap
+    remaining = max(0.0, remaining)
+    return remaining if cap is None else min(remaining, cap)
+
+
+def _observed(fn, *args, **kwargs):
+    """Run fn on a worker thread, reporting to the request's thread observer."""
+    observer = thread_observer.get()
+    if observer is None:
+        return fn(*args, **kwargs)
+    token = observer.enter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        observer.exit(token)
+
+
+def call_with_timeout(operation: str, timeout: Optional[float], fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs), giving up after timeout seconds.
+
+    Args:
+        operation: Human-readable name used in the timeout error
+        timeout: Seconds to wait (None waits indefinitely)
+        fn: The callable to run
+
+    Returns:
+        Whatever fn returns
+
+    Raises:
+        UpstreamTimeout: If fn does not finish in time
+    """
+    if timeout is None:
+        return fn(*args, **kwargs)
+    if timeout <= 0:
+        raise UpstreamTimeout(operation, 0.0)
+
+    # Run in the caller's context so nested calls see the same deadline
+    context = contextvars.copy_context()
+    future = _executor.submit(context.run, _observed, fn, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise UpstreamTimeout(operation, timeout)
+
+
+def _serpapi_transport(params: dict) -> dict:
+    """Call SerpAPI and return the response data (empty if none)."""
+    search = serpapi.search(params)
+    return getattr(search, 'data', None) or {}
+
+
+def _tavily_transport(tool, query: str):
+    """Call Tavily through the LangChain tool."""
+    return tool.invoke(query)
+
+
+# Functions that actually talk to each service. Swapped out by the
+# record/replay cassette layer (src/cassette.py) and similar wrappers.
+_transports = {
+    'serpapi': _serpapi_transport,
+    'tavily': _tavily_transport,
+}
+
+
+def get_transport(name: str):
+    """Return the current transport function for a service ('serpapi' or 'tavily')."""
+    return _transports[name]
+
+
+def set_transport(name: str, transport):
+    """
+    Replace the transport function for a service.
+
+    Args:
+        name: 'serpapi' (called as transport(params) -> dict) or
+              'tavily' (called as transport(tool, query))
+        transport: The new transport function
+
+    Returns:
+        The previous transport, so callers can restore it
+    """
+    if name not in _transports:
+        raise KeyError(f"Unknown transport '{name}'. Expected one of: {', '.join(_transports)}")
+    previous = _transports[name]
+    _transports[name] = transport
+    return previous
+
+
+def serpapi_search(params: dict) -> dict:
+    """
+    Run a SerpAPI search within the request budget.
+
+    Args:
+        params: SerpAPI query parameters (including api_key)
+
+    Returns:
+        The response data dict (empty if SerpAPI returned nothing)
+
+    Raises:
+        UpstreamTimeout: If the search does not finish in time
+    """
+    timeout = call_timeout(get_tool_timeout_seconds())
+    return call_with_timeout(f"SerpAPI {params.get('engine', 'search')}", timeout, _transports['serpapi'], params)
+
+
+def tavily_search(tool, query: str):
+    """
+    Run a Tavily search within the request budget.
+
+    Args:
+        tool: TavilySearch tool instance
+        query: Search query
+
+    Returns:
+        The raw Tavily response
+
+    Raises:
+        UpstreamTimeout: If the search does not finish in time
+    """
+    timeout = call_timeout(get_tool_timeout_seconds())
+    return call_with_timeout("Tavily search", timeout, _transports['tavily'], tool, query)
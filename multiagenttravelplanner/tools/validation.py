@@ -0,0 +1,374 @@
+"""
+Validation and normalization of flight and hotel tool arguments.
+Arguments come straight from the model, so dates like "Feb 15", city
+names instead of airport codes, or "4-5 star" hotel classes are normalized
+here, and anything still invalid is rejected locally with a precise
+message before it can cost a SerpAPI request.
+"""
+
+import re
+import json
+import math
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional, Tuple
+from config.settings import get_today
+from tools.ranking import WEIGHT_PROFILES
+
+# How far ahead Google Flights / Hotels accept dates
+MAX_DAYS_AHEAD = 365
+
+# Longest hotel stay accepted in one search
+MAX_NIGHTS = 30
+
+# City names the model may pass instead of airport codes
+CITY_AIRPORTS = {
+    'new york': 'JFK,LGA,EWR',
+    'nyc': 'JFK,LGA,EWR',
+    'london': 'LHR,LGW',
+    'paris': 'CDG,ORY',
+    'tokyo': 'NRT,HND',
+    'los angeles': 'LAX',
+    'san francisco': 'SFO',
+    'seattle': 'SEA',
+    'chicago': 'ORD,MDW',
+    'washington': 'IAD,DCA',
+    'boston': 'BOS',
+    'miami': 'MIA',
+    'delhi': 'DEL',
+    'new delhi': 'DEL',
+    'mumbai': 'BOM',
+    'bangalore': 'BLR',
+    'dubai': 'DXB',
+    'singapore': 'SIN',
+    'hong kong': 'HKG',
+    'bangkok': 'BKK',
+    'sydney': 'SYD',
+    'rome': 'FCO',
+    'madrid': 'MAD',
+    'barcelona': 'BCN',
+    'amsterdam': 'AMS',
+    'frankfurt': 'FRA',
+    'istanbul': 'IST',
+    'toronto': 'YYZ',
+}
+
+MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'),
+        ('may',), ('jun', 'june'), ('jul', 'july'), ('aug', 'august'),
+        ('sep', 'sept', 'september'), ('oct', 'october'), ('nov', 'november'), ('dec', 'december'),
+    ], 1)
+    for name in names
+}
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+# Google Hotels sort_by values
+HOTEL_SORT_OPTIONS = {
+    3: ('price', 'lowest price', 'cheapest'),
+    8: ('rating', 'highest rating'),
+    13: ('reviews', 'most reviewed'),
+}
+
+FLIGHT_PRIORITIES = tuple(WEIGHT_PROFILES['flights'])
+HOTEL_PRIORITIES = tuple(WEIGHT_PROFILES['hotels'])
+
+_MONTH_RE = '|'.join(sorted(MONTHS, key=len, reverse=True))
+_MONTH_DAY_RE = re.compile(rf'^({_MONTH_RE})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s+(\d{{4}}))?$')
+_DAY_MONTH_RE = re.compile(rf'^(\d{{1,2}})(?:st|nd|rd|th)?\s+({_MONTH_RE})\.?(?:,?\s+(\d{{4}}))?$')
+_ISO_RE = re.compile(r'^(\d{4})[-/](\d{1,2})[-/](\d{1,2})$')
+_SLASH_RE = re.compile(r'^(\d{1,2})/(\d{1,2})(?:/(\d{4}))?$')
+_IN_DAYS_RE = re.compile(r'^in\s+(\d{1,3})\s+(day|week)s?$')
+
+
+class ToolArgumentError(ValueError):
+    """Raised when tool arguments are invalid; errors maps argument name to problem."""
+
+    def __init__(self, tool: str, errors: Dict[str, str]):
+        super().__init__(f"Invalid arguments for {tool}: " + "; ".join(f"{k}: {v}" for k, v in errors.items()))
+        self.tool = tool
+        self.errors = errors
+
+
+def _build_date(year: int, month: int, day: int, today: date, explicit_year: bool) -> date:
+    """Date from parts; a date without a year is the next one on or after today."""
+    try:
+        result = date(year, month, day)
+    except ValueError:
+        raise ValueError(f"{year:04d}-{month:02d}-{day:02d} is not a real date")
+    if not explicit_year and result < today:
+        result = date(year + 1, month, day)
+    return result
+
+
+def parse_date(value, today: Optional[date] = None) -> date:
+    """
+    Parse an absolute or relative date.
+
+    Accepts YYYY-MM-DD, "Feb 15", "15 February 2026", "2/15", "today",
+    "tomorrow", "in 3 days", "in 2 weeks" and "next friday". Dates without
+    a year resolve to their next occurrence on or after today.
+
+    Raises:
+        ValueError: If the value is not a recognizable date
+    """
+    today = today or get_today()
+    if isinstance(value, date):
+        return value
+    text = re.sub(r'\s+', ' ', str(value).strip().lower())
+
+    if text == 'today':
+        return today
+    if text == 'tomorrow':
+        return today + timedelta(days=1)
+    match = _IN_DAYS_RE.match(text)
+    if match:
+        count = int(match.group(1)) * (7 if match.group(2) == 'week' else 1)
+        return today + timedelta(days=count)
+    weekday = text.replace('next ', '', 1)
+    if weekday in WEEKDAYS:
+        return today + timedelta(days=(WEEKDAYS.index(weekday) - today.weekday() - 1) % 7 + 1)
+
+    match = _ISO_RE.match(text)
+    if match:
+        return _build_date(int(match.group(1)), int(match.group(2)), int(match.group(3)), today, True)
+    match = _MONTH_DAY_RE.match(text)
+    if match:
+        month, day, year = MONTHS[match.group(1)], int(match.group(2)), match.group(3)
+        return _build_date(int(year or today.year), month, day, today, bool(year))
+    match = _DAY_MONTH_RE.match(text)
+    if match:
+        day, month, year = int(match.group(1)), MONTHS[match.group(2)], match.group(3)
+        return _build_date(int(year or today.year), month, day, today, bool(year))
+    match = _SLASH_RE.match(text)
+    if match:
+        month, day, year = int(match.group(1)), int(match.group(2)), match.group(3)
+        return _build_date(int(year or today.year), month, day, today, bool(year))
+
+    raise ValueError(f"'{value}' is not a date; use YYYY-MM-DD")
+
+
+def normalize_travel_date(value, today: Optional[date] = None) -> str:
+    """Parse a travel date and check it is neither past nor too far ahead; returns YYYY-MM-DD."""
+    today = today or get_today()
+    result = parse_date(value, today)
+    if result < today:
+        raise ValueError(f"{result.isoformat()} is in the past (today is {today.isoformat()})")
+    if result > today + timedelta(days=MAX_DAYS_AHEAD):
+        raise ValueError(f"{result.isoformat()} is more than {MAX_DAYS_AHEAD} days ahead")
+    return result.isoformat()
+
+
+def normalize_airport(value) -> str:
+    """Airport code(s) in upper case, mapping known city names to their airports."""
+    text = str(value).strip()
+    city = CITY_AIRPORTS.get(text.lower())
+    if city:
+        return city
+    codes = [code.strip().upper() for code in text.split(',')]
+    if codes and all(re.fullmatch(r'[A-Z]{3}', code) for code in codes):
+        return ','.join(codes)
+    raise ValueError(f"'{value}' is not an airport; use a 3-letter IATA code such as JFK")
+
+
+def normalize_hotel_class(value) -> str:
+    """Hotel classes as Google Hotels expects them ('3,4,5'), from '4', '4-5', '4+', '4 star' or a list."""
+    if isinstance(value, (list, tuple)):
+        text = ','.join(str(item) for item in value)
+    else:
+        text = str(value)
+    text = re.sub(r'[\s-]*stars?', '', text.strip().lower()).replace(' ', '')
+    classes = set()
+    for part in filter(None, text.split(',')):
+        if re.fullmatch(r'\d\+', part):
+            classes.update(range(int(part[0]), 6))
+        elif re.fullmatch(r'\d-\d', part):
+            low, high = sorted((int(part[0]), int(part[2])))
+            classes.update(range(low, high + 1))
+        elif re.fullmatch(r'\d(\.0)?', part):
+            classes.add(int(part[0]))
+        else:
+            raise ValueError(f"'{value}' is not a hotel class; use star ratings like '4,5'")
+    if not classes or not classes <= {2, 3, 4, 5}:
+        raise ValueError(f"'{value}' is not a hotel class; star ratings must be between 2 and 5")
+    return ','.join(str(star) for star in sorted(classes))
+
+
+def normalize_hotel_sort(value) -> int:
+    """Google Hotels sort_by code from a code (3, 8, 13) or a name ('price', 'rating', 'reviews')."""
+    text = str(value).strip().lower()
+    for code, names in HOTEL_SORT_OPTIONS.items():
+        if text == str(code) or text in names:
+            return code
+    raise ValueError(f"'{value}' is not a sort order; use 3 (lowest price), 8 (highest rating) or 13 (most reviewed)")
+
+
+def _integer(low: int, high: int) -> Callable:
+    """Normalizer for a whole number in [low, high]."""
+    def normalize(value) -> int:
+        if isinstance(value, bool):
+            raise ValueError(f"expected a whole number, got {value}")
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{value}' is not a number")
+        if not math.isfinite(number):
+            raise ValueError(f"'{value}' is not a number")
+        if number != int(number):
+            raise ValueError(f"{value} is not a whole number")
+        if not low <= number <= high:
+            raise ValueError(f"{int(number)} is outside {low}-{high}")
+        return int(number)
+    return normalize
+
+
+def _number(low: float, high: Optional[float] = None) -> Callable:
+    """Normalizer for a number in [low, high]."""
+    def normalize(value) -> float:
+        try:
+            number = float(str(value).replace('$', '').replace(',', ''))
+        except (TypeError, ValueError):
+            raise ValueError(f"'{value}' is not a number")
+        if not math.isfinite(number):
+            raise ValueError(f"'{value}' is not a number")
+        if number < low or (high is not None and number > high):
+            raise ValueError(f"{value} is outside {low}-{high}" if high is not None else f"{value} is below {low}")
+        return number
+    return normalize
+
+
+def _choice(options) -> Callable:
+    """Normalizer for one of a fixed set of words."""
+    def normalize(value) -> str:
+        text = str(value).strip().lower()
+        if text not in options:
+            raise ValueError(f"'{value}' is not one of: {', '.join(options)}")
+        return text
+    return normalize
+
+
+def _text(value) -> str:
+    """Normalizer for non-empty text."""
+    text = str(value).strip()
+    if not text:
+        raise ValueError("must not be empty")
+    return text
+
+
+# Argument name -> (normalizer, required)
+Schema = Dict[str, Tuple[Callable, bool]]
+
+FLIGHT_SCHEMA: Schema = {
+    'departure_airport': (normalize_airport, True),
+    'arrival_airport': (normalize_airport, True),
+    'outbound_date': (normalize_travel_date, True),
+    'return_date': (normalize_travel_date, False),
+    'adults': (_integer(1, 9), False),
+    'children': (_integer(0, 8), False),
+    'max_price': (_number(1), False),
+    'max_stops': (_integer(0, 3), False),
+    'max_duration_minutes': (_integer(30, 4320), False),
+    'depart_after_hour': (_integer(0, 23), False),
+    'depart_before_hour': (_integer(1, 24), False),
+    'priority': (_choice(FLIGHT_PRIORITIES), False),
+}
+
+HOTEL_SCHEMA: Schema = {
+    'location': (_text, True),
+    'check_in_date': (normalize_travel_date, True),
+    'check_out_date': (normalize_travel_date, True),
+    'adults': (_integer(1, 20), False),
+    'children': (_integer(0, 20), False),
+    'rooms': (_integer(1, 9), False),
+    'hotel_class': (normalize_hotel_class, False),
+    'sort_by': (normalize_hotel_sort, False),
+    'max_price': (_number(1), False),
+    'min_rating': (_number(0, 5), False),
+    'amenity': (_text, False),
+    'priority': (_choice(HOTEL_PRIORITIES), False),
+}
+
+
+def _validate(schema: Schema, args: dict) -> Tuple[dict, Dict[str, str]]:
+    """Normalize every argument; returns (normalized args, errors)."""
+    normalized, errors = {}, {}
+    for name, (normalize, required) in schema.items():
+        value = args.get(name)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if required:
+                errors[name] = "is required"
+            normalized[name] = None
+            continue
+        try:
+            normalized[name] = normalize(value)
+        except ValueError as e:
+            errors[name] = str(e)
+    return normalized, errors
+
+
+def validate_flight_args(args: dict) -> dict:
+    """
+    Validate and normalize search_flights arguments.
+
+    Args:
+        args: Arguments as given by the model
+
+    Returns:
+        Normalized arguments (ISO dates, upper-case airport codes, integers)
+
+    Raises:
+        ToolArgumentError: If any argument is invalid
+    """
+    normalized, errors = _validate(FLIGHT_SCHEMA, args)
+    departure, arrival = normalized.get('departure_airport'), normalized.get('arrival_airport')
+    if departure and departure == arrival:
+        errors['arrival_airport'] = "must differ from departure_airport"
+    outbound, inbound = normalized.get('outbound_date'), normalized.get('return_date')
+    if outbound and inbound and inbound < outbound:
+        errors['return_date'] = f"{inbound} is before outbound_date {outbound}"
+    after, before = normalized.get('depart_after_hour'), normalized.get('depart_before_hour')
+    if after is not None and before is not None and before <= after:
+        errors['depart_before_hour'] = f"must be later than depart_after_hour ({after})"
+    if errors:
+        raise ToolArgumentError('search_flights', errors)
+    return normalized
+
+
+def validate_hotel_args(args: dict) -> dict:
+    """
+    Validate and normalize search_hotels arguments.
+
+    Args:
+        args: Arguments as given by the model
+
+    Returns:
+        Normalized arguments (ISO dates, integers, '3,4,5' hotel classes)
+
+    Raises:
+        ToolArgumentError: If any argument is invalid
+    """
+    normalized, errors = _validate(HOTEL_SCHEMA, args)
+    check_in, check_out = normalized.get('check_in_date'), normalized.get('check_out_date')
+    if check_in and check_out:
+        nights = (date.fromisoformat(check_out) - date.fromisoformat(check_in)).days
+        if nights <= 0:
+            errors['check_out_date'] = f"{check_out} must be after check_in_date {check_in}"
+        elif nights > MAX_NIGHTS:
+            errors['check_out_date'] = f"stays are limited to {MAX_NIGHTS} nights ({nights} requested)"
+    rooms, adults = normalized.get('rooms'), normalized.get('adults')
+    if rooms and adults and rooms > adults:
+        errors['rooms'] = f"{rooms} rooms need at least {rooms} adults"
+    if errors:
+        raise ToolArgumentError('search_hotels', errors)
+    return normalized
+
+
+def invalid_arguments_result(error: ToolArgumentError) -> str:
+    """JSON tool result telling the model which arguments to fix (no search was made)."""
+    return json.dumps({
+        "error": str(error),
+        "invalid_arguments": error.errors,
+        "today": get_today().isoformat(),
+        "searched": False,
+    }, indent=2)